@@ -0,0 +1,136 @@
+"""
+BRIDGE WINDOWS: Open/closed intervals per bridge.
+Snapshots carry bridge state per sample ({"RETHE": "OPEN"}); answering "when was
+Rethe open today" or "minutes of road closure between t1 and t2" from them means
+a scan. BridgeIntervals merges the samples once into sorted, disjoint OPEN
+intervals per bridge (+ prefix sums of their lengths), so overlap, total closure
+and next-opening queries are binary searches.
+(OPEN = raised for shipping = closed to road traffic.)
+"""
+import numpy as np
+
+GAP_FACTOR = 3.0  # A sample's state holds until the next sample, at most 3x the usual spacing
+
+
+class BridgeIntervals:
+    """
+    Per bridge: starts / ends (float64, sorted, disjoint) of OPEN intervals [start, end).
+    Built from sample times + states (from_states / from_store / from_timeline).
+    """
+    def __init__(self, intervals, window):
+        self.window = window  # (first sample, end of last sample's hold)
+        self.bridges = {}
+        for name, (starts, ends) in intervals.items():
+            starts = np.asarray(starts, dtype=np.float64)
+            ends = np.asarray(ends, dtype=np.float64)
+            self.bridges[name] = (starts, ends, np.concatenate(([0.0], np.cumsum(ends - starts))))
+
+    # --- BUILD ---
+    @classmethod
+    def from_states(cls, ts, states):
+        """Sample times (ascending) + {bridge: OPEN flag per sample} -> merged intervals."""
+        ts = np.asarray(ts, dtype=np.float64)
+        if not len(ts):
+            return cls({name: ((), ()) for name in states}, (0.0, 0.0))
+        spacing = np.diff(ts)
+        max_hold = GAP_FACTOR * float(np.median(spacing)) if len(spacing) else 0.0
+        # Each sample holds until the next one (capped across recording gaps); the last for one spacing
+        hold_end = np.append(np.minimum(ts[1:], ts[:-1] + max_hold), ts[-1] + max_hold / GAP_FACTOR)
+        joined = hold_end[:-1] >= ts[1:]  # Sample j and j + 1 touch
+
+        intervals = {}
+        for name, flags in states.items():
+            flags = np.asarray(flags, dtype=bool)
+            cont = flags[:-1] & flags[1:] & joined  # Run continues from j to j + 1
+            first = flags & ~np.concatenate(([False], cont))
+            last = flags & ~np.concatenate((cont, [False]))
+            intervals[name] = (ts[first], hold_end[last])
+        return cls(intervals, (float(ts[0]), float(hold_end[-1])))
+
+    @classmethod
+    def from_store(cls, store):
+        """HistoryStore timeline columns (no snapshot dicts)."""
+        if "OPEN" not in store.strings:
+            return cls.from_states(store.snap_ts, {name: np.zeros(len(store), dtype=bool) for name in store.bridges})
+        open_id = store.strings.index("OPEN")
+        return cls.from_states(store.snap_ts, {name: np.asarray(store.snap_bridges[name]) == open_id
+                                               for name in store.bridges})
+
+    @classmethod
+    def from_timeline(cls, timeline):
+        """[{"ts", "bridges": {name: state}}] (pivot timeline, forecast timeline)."""
+        names = sorted({name for entry in timeline for name in entry.get("bridges", {})})
+        return cls.from_states(
+            [entry["ts"] for entry in timeline],
+            {name: [entry.get("bridges", {}).get(name) == "OPEN" for entry in timeline] for name in names}
+        )
+
+    def shifted(self, dt):
+        """Same intervals dt seconds later (the forecast mirrors history: Future(t) = History(t - 24h))."""
+        return BridgeIntervals({name: (s + dt, e + dt) for name, (s, e, _) in self.bridges.items()},
+                               (self.window[0] + dt, self.window[1] + dt))
+
+    # --- QUERIES ---
+    def intervals(self, bridge, start=None, end=None):
+        """OPEN intervals overlapping [start, end], clipped to it: [(start, end)]."""
+        starts, ends, _ = self.bridges[bridge]
+        start = self.window[0] if start is None else start
+        end = self.window[1] if end is None else end
+        i = int(np.searchsorted(ends, start, side="right"))
+        k = int(np.searchsorted(starts, end, side="left"))
+        return [(max(s, start), min(e, end)) for s, e in zip(starts[i:k].tolist(), ends[i:k].tolist())]
+
+    def open_seconds(self, bridge, start, end):
+        """Total OPEN (road-closed) time inside [start, end]."""
+        starts, ends, cum = self.bridges[bridge]
+        i = int(np.searchsorted(ends, start, side="right"))
+        k = int(np.searchsorted(starts, end, side="left"))
+        if k <= i:
+            return 0.0
+        total = cum[k] - cum[i]
+        total -= max(0.0, start - starts[i])
+        total -= max(0.0, ends[k - 1] - end)
+        return float(total)
+
+    def is_open(self, bridge, t):
+        starts, ends, _ = self.bridges[bridge]
+        j = int(np.searchsorted(starts, t, side="right")) - 1
+        return bool(j >= 0 and t < ends[j])
+
+    def state_at(self, t):
+        """{bridge: "OPEN" / "CLOSED"} at t (the snapshot shape)."""
+        return {name: "OPEN" if self.is_open(name, t) else "CLOSED" for name in self.bridges}
+
+    def states_at(self, times):
+        """state_at for many times at once: [{bridge: "OPEN" / "CLOSED"}] (one searchsorted per bridge)."""
+        times = np.asarray(times, dtype=np.float64)
+        columns = {}
+        for name, (starts, ends, _) in self.bridges.items():
+            j = np.searchsorted(starts, times, side="right") - 1
+            is_open = (j >= 0) & (times < ends[np.maximum(j, 0)]) if len(starts) else np.zeros(len(times), dtype=bool)
+            columns[name] = np.where(is_open, "OPEN", "CLOSED").tolist()
+        return [dict(zip(columns, states)) for states in zip(*columns.values())] if columns else [{} for _ in times]
+
+    def next_opening(self, bridge, t):
+        """First OPEN interval starting at or after t: (start, end), or None."""
+        starts, ends, _ = self.bridges[bridge]
+        j = int(np.searchsorted(starts, t, side="left"))
+        if j >= len(starts):
+            return None
+        return float(starts[j]), float(ends[j])
+
+    def summary(self, start=None, end=None):
+        """Per bridge over [start, end]: intervals, open minutes, open at start, next opening after start."""
+        start = float(self.window[0] if start is None else start)
+        end = float(self.window[1] if end is None else end)
+        out = {}
+        for name in self.bridges:
+            upcoming = self.next_opening(name, start)
+            out[name] = {
+                "open_now": self.is_open(name, start),
+                "intervals": [{"start": s, "end": e, "minutes": round((e - s) / 60, 1)}
+                              for s, e in self.intervals(name, start, end)],
+                "open_minutes": round(self.open_seconds(name, start, end) / 60, 1),
+                "next_opening": {"start": upcoming[0], "end": upcoming[1]} if upcoming else None
+            }
+        return {"start": start, "end": end, "bridges": out}
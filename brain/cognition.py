@@ -1,7 +1,6 @@
 import os
 import json
 import time
-from openai import OpenAI
 from dotenv import load_dotenv
 
 # Load Environment
@@ -22,6 +21,7 @@ class LLMService:
             # Let's set mock_mode to True but log strictly.
             self.mock_mode = True 
         else:
+            from openai import OpenAI # Deferred: ~650ms import, only needed with a key
             self.client = OpenAI(api_key=self.api_key)
             logger.info("BRAIN: SYSTEM ONLINE. LINKED TO OPENAI.")
 
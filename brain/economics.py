@@ -14,6 +14,9 @@ class EconomicsEngine:
         # New: Megamax Economics (from Jan 2026 Report)
         self.megamax_hourly_charter_rate = 5000.0 
         self.dredging_op_cost_daily = 35000.0 
+        
+        # Road traffic across the Rethe/Kattwyk bridges (HPA counts, peak-averaged)
+        self.bridge_trucks_per_hour = 120.0
 
     def _fetch_live_market_data(self):
         """
@@ -59,3 +62,19 @@ class EconomicsEngine:
                 "delay_h": delay_hours
             }
         return {"status": "ON_TIME", "cost_eur": 0.0, "delay_h": 0}
+
+    def calculate_closure_impact(self, closure_minutes: float):
+        """
+        Road cost of bridge openings (from the bridge interval index, not snapshots).
+        Trucks arriving during a closure idle for half of it on average.
+        """
+        closure_h = closure_minutes / 60.0
+        trucks = closure_h * self.bridge_trucks_per_hour
+        idle_fuel_liters = trucks * (closure_h / 2) * self.idling_consumption_lph
+        return {
+            "closure_minutes": round(closure_minutes, 1),
+            "trucks_affected": int(round(trucks)),
+            "idle_fuel_l": round(idle_fuel_liters, 2),
+            "cost_eur": round(idle_fuel_liters * self.diesel_price_eur, 2),
+            "co2_kg": round(idle_fuel_liters * self.co2_per_liter, 2)
+        }
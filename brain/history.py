@@ -6,13 +6,15 @@ Features:
 - Realistic patrol patterns for tugs (between waypoints, not circles)
 - Ship info API endpoint for popup details
 """
+import gzip
+import hashlib
 import json
-import math
-import random
-from datetime import datetime, timedelta
+import time
 from typing import List, Dict, Tuple, Optional
 import os
 
+from brain.services import services
+
 # ============================================================================
 # REAL SHIP DATABASE - Verified from ITU MARS, MarineTraffic, VesselFinder
 # Each vessel has authentic registration data
@@ -590,6 +592,7 @@ REAL_VESSELS = [
 # ============================================================================
 
 # Main Elbe channel
+ELBE_MAIN = [
     (53.8950, 8.6800),   # Elbe 1 buoy
     (53.8920, 8.7500),   # Scharhörn  
     (53.8850, 8.8500),   # Neuwerk
@@ -609,6 +612,7 @@ REAL_VESSELS = [
     (53.5420, 9.8900),   # Parkhafen Entry
     (53.5350, 9.9000),   # Bubendey-Ufer
     (53.5300, 9.9100),   # Waltershof junction (Main Hub)
+]
 
 # Terminal approach branches (connected to Waltershof junction)
 TERMINAL_APPROACHES = {
@@ -670,8 +674,8 @@ TERMINAL_APPROACHES = {
 
 # Bridge Locations for "Geofencing"
 BRIDGE_ZONES = {
-    "RETHE": {"lat": 53.5008, "lng": 9.9710, "radius": 0.005},
-    "KATTWYK": {"lat": 53.4940, "lng": 9.9520, "radius": 0.005}
+    "RETHE": {"lat": 53.5008, "lng": 9.9710, "radius": 0.005, "radius_m": 300},
+    "KATTWYK": {"lat": 53.4940, "lng": 9.9520, "radius": 0.005, "radius_m": 300}
 }
 
 # Patrol zones (tugs move between these points)
@@ -695,35 +699,22 @@ PATROL_ZONES = {
 }
 
 
-def get_full_path(terminal: str, direction: str) -> List[Tuple[float, float]]:
-    """Get connected path from sea to terminal or vice versa"""
+def get_full_path(terminal: str, direction: str, over_water: bool = False) -> List[Tuple[float, float]]:
+    """
+    Get connected path from sea to terminal or vice versa.
+    over_water=True: legs inside the water data are re-routed over the channel
+    graph (eye.routing, cached), so the path never crosses land.
+    """
     approach = TERMINAL_APPROACHES.get(terminal, TERMINAL_APPROACHES["MULTI"])
     
     if direction == "ARRIVAL":
-        return ELBE_MAIN + approach[1:]  # Skip junction duplicate
+        path = ELBE_MAIN + approach[1:]  # Skip junction duplicate
     else:
-        return list(reversed(approach)) + list(reversed(ELBE_MAIN[:-1]))  # Skip junction duplicate
-
+        path = list(reversed(approach)) + list(reversed(ELBE_MAIN[:-1]))  # Skip junction duplicate
 
-def interpolate_path(path: List[Tuple], progress: float) -> Tuple[float, float]:
-    """Smoothly interpolate position along path"""
-    if progress <= 0:
-        return path[0]
-    if progress >= 1:
-        return path[-1]
-    
-    total_segments = len(path) - 1
-    segment_progress = progress * total_segments
-    segment_idx = min(int(segment_progress), total_segments - 1)
-    t = segment_progress - segment_idx
-    
-    p1 = path[segment_idx]
-    p2 = path[segment_idx + 1]
-    
-    lat = p1[0] + t * (p2[0] - p1[0])
-    lng = p1[1] + t * (p2[1] - p1[1])
-    
-    return (round(lat, 6), round(lng, 6))
+    if over_water:
+        path = services.get("router").route_via(path)
+    return path
 
 
 def fetch_historical_movement(interval_minutes: int = 10) -> List[Dict]:
@@ -749,239 +740,15 @@ def fetch_historical_movement(interval_minutes: int = 10) -> List[Dict]:
     return _generate_synthetic_history(interval_minutes)
 
 
-def calculate_traffic_density(hour: float, bridge_open: bool) -> int:
-    """
-    Returns traffic density (0-100) based on hour of day.
-    If bridge is open, density spikes to 100 (Gridlock).
-    """
-    if bridge_open:
-        return 100 # Gridlock
-    
-    # 24h Traffic Curve
-    if 0 <= hour < 5: return random.randint(10, 20)      # Night
-    if 5 <= hour < 7: return random.randint(30, 50)      # Early
-    if 7 <= hour < 9: return random.randint(85, 95)      # Morning Rush
-    if 9 <= hour < 15: return random.randint(50, 65)     # Midday
-    if 15 <= hour < 18: return random.randint(85, 100)   # Evening Rush
-    if 18 <= hour < 22: return random.randint(40, 60)    # Evening
-    return random.randint(20, 30)                        # Late Night
-
-
 def _generate_synthetic_history(interval_minutes: int = 10) -> List[Dict]:
-    """Internal Generator: Reconstructs movement from HPA Schedule + Elbe Geometry"""
-    base_time = datetime(2026, 1, 30, 12, 0, 0)
-    end_time = base_time + timedelta(hours=24)
-    
-    history = []
-    current_time = base_time
-    
-    # Randomly schedule 3 Unexpected Bridge Events (Ghost Ships)
-    unexpected_events = sorted([random.uniform(2, 22) for _ in range(3)])
-
-    # OBSTACLES (The "Unknown Unknowns")
-    # Time relative to start (0-24h). 
-    # Impact: Adds delay_h to any ship in the channel.
-    obstacles = [
-        {"time": 4.5, "type": "ICE FLOE", "duration": 1.0, "delay_h": 0.5},
-        {"time": 18.0, "type": "DEBRIS FIELD", "duration": 1.5, "delay_h": 0.8}
-    ]
-    ship_delays = {v["mmsi"]: 0.0 for v in REAL_VESSELS}
-    
-    while current_time <= end_time:
-        elapsed_hours = (current_time - base_time).total_seconds() / 3600
-        hour_of_day = current_time.hour
-        
-        snapshot = {
-            "timestamp": current_time.isoformat(),
-            "timestamp_unix": current_time.timestamp(),
-            "ships": [],
-            "bridges": {
-                "RETHE": "CLOSED",
-                "KATTWYK": "CLOSED"
-            },
-            "weather": "FOG" if (hour_of_day % 4 != 0) else "SNOW", # Sync with Eye
-            "active_obstacles": [],
-            "active_obstacles": [],
-            "traffic_density": _calculate_density(hour_of_day, bridge_active) + random.randint(-5, 5) # Add noise
-        }
-        
-        bridge_active = False
-        
-        # Check active obstacles
-        for obs in obstacles:
-            if obs["time"] <= elapsed_hours <= obs["time"] + obs["duration"]:
-                snapshot["active_obstacles"].append(f"WARNING: {obs['type']} AT ELBE KM 620")
-                # Apply delay to ALL active ships (simplification for "River Blockage")
-                # In a real agent, this would be geo-fenced.
-                for mmsi in ship_delays:
-                    # Increment delay slowly while obstacle is active
-                    ship_delays[mmsi] = min(ship_delays[mmsi] + (interval_minutes/60.0 * 0.5), obs["delay_h"])
-
-        for vessel in REAL_VESSELS:
-            # Calculate Effective Time (Time - Delay)
-            # If ship is delayed, it appears to be at an earlier position in its path.
-            effective_elapsed = elapsed_hours - ship_delays.get(vessel["mmsi"], 0)
-            
-            ship_state = calculate_vessel_position(vessel, effective_elapsed)
-            
-            if ship_state:
-                # Add delay info to status
-                current_delay = ship_delays.get(vessel["mmsi"], 0)
-                if current_delay > 0.1:
-                    ship_state["status"] = f"DELAYED (+{int(current_delay*60)}m)"
-                
-                snapshot["ships"].append(ship_state)
-                
-                # Check Bridge Proximity (Using Delayed Position)
-                s_lat, s_lng = ship_state["lat"], ship_state["lng"]
-                
-                # Rethe Check
-                dist_rethe = math.sqrt((s_lat - BRIDGE_ZONES["RETHE"]["lat"])**2 + (s_lng - BRIDGE_ZONES["RETHE"]["lng"])**2)
-                if dist_rethe < BRIDGE_ZONES["RETHE"]["radius"]:
-                    snapshot["bridges"]["RETHE"] = "OPEN"
-                    bridge_active = True
-                    
-                # Kattwyk Check
-                dist_katt = math.sqrt((s_lat - BRIDGE_ZONES["KATTWYK"]["lat"])**2 + (s_lng - BRIDGE_ZONES["KATTWYK"]["lng"])**2)
-                if dist_katt < BRIDGE_ZONES["KATTWYK"]["radius"]:
-                    snapshot["bridges"]["KATTWYK"] = "OPEN"
-                    bridge_active = True
-
-        # Unexpected Events Disruption
-        for event_hour in unexpected_events:
-            if abs(elapsed_hours - event_hour) < 0.2: # 12 min window
-                snapshot["bridges"]["RETHE"] = "OPEN" # Force open
-                bridge_active = True
-
-        snapshot["traffic_density"] = calculate_traffic_density(hour_of_day, bridge_active)
-        
-        history.append(snapshot)
-        current_time += timedelta(minutes=interval_minutes)
-    
-    return history
-
-
-def calculate_vessel_position(vessel: Dict, elapsed_hours: float) -> Optional[Dict]:
-    """Calculate vessel position at given time"""
-    schedule = vessel.get("schedule", {})
-    event = schedule.get("event")
-    
-    base_info = {
-        "id": vessel["name"],
-        "imo": vessel["imo"],
-        "mmsi": vessel["mmsi"],
-        "type": vessel["type"],
-        "length_m": vessel["length_m"]
-    }
-    
-    if event == "PATROL":
-        zone = schedule.get("zone", "CTB_AREA")
-        path = PATROL_ZONES.get(zone, PATROL_ZONES["CTB_AREA"])
-        
-        # Move through zone continuously
-        loop_hours = 1.5  # Complete loop every 1.5 hours
-        progress = (elapsed_hours % loop_hours) / loop_hours
-        lat, lng = interpolate_path(path, progress)
-        
-        return {**base_info, "lat": lat, "lng": lng, "status": "PATROL"}
-    
-    elif event == "DREDGING":
-        zone = schedule.get("zone", "FAIRWAY")
-        path = PATROL_ZONES.get(zone, PATROL_ZONES["FAIRWAY"])
-        
-        # Slow dredging pattern
-        loop_hours = 3.0
-        progress = (elapsed_hours % loop_hours) / loop_hours
-        lat, lng = interpolate_path(path, progress)
-        
-        return {**base_info, "lat": lat, "lng": lng, "status": "DREDGING"}
-    
-    else:
-        # Arrival or departure
-        offset = schedule.get("offset_h", 12)
-        terminal = schedule.get("terminal", "CTH")
-        speed = vessel.get("speed_kn", 12)
-        
-        transit_hours = 60.0 / speed  # 60nm from sea to port
-        
-        if event == "ARRIVAL":
-            transit_start = offset - transit_hours
-            transit_end = offset
-            
-            if elapsed_hours < transit_start:
-                # At sea
-                lat = 53.89 + random.uniform(-0.01, 0.01)
-                lng = 8.70 + random.uniform(-0.02, 0.02)
-                return {**base_info, "lat": lat, "lng": lng, "status": "AT_SEA"}
-            elif elapsed_hours < transit_end:
-                # In transit
-                progress = (elapsed_hours - transit_start) / transit_hours
-                path = get_full_path(terminal, "ARRIVAL")
-                lat, lng = interpolate_path(path, progress)
-                return {**base_info, "lat": lat, "lng": lng, "status": "UNDERWAY"}
-            else:
-                # Moored
-                terminal_pos = TERMINAL_APPROACHES[terminal][-1]
-                lat = terminal_pos[0] + random.uniform(-0.0003, 0.0003)
-                lng = terminal_pos[1] + random.uniform(-0.0003, 0.0003)
-                return {**base_info, "lat": lat, "lng": lng, "status": "MOORED"}
-        
-        else:  # DEPARTURE
-            transit_start = offset
-            transit_end = offset + transit_hours
-            
-            if elapsed_hours < transit_start:
-                terminal_pos = TERMINAL_APPROACHES[terminal][-1]
-                lat = terminal_pos[0] + random.uniform(-0.0003, 0.0003)
-                lng = terminal_pos[1] + random.uniform(-0.0003, 0.0003)
-                return {**base_info, "lat": lat, "lng": lng, "status": "MOORED"}
-            elif elapsed_hours < transit_end:
-                progress = (elapsed_hours - transit_start) / transit_hours
-                path = get_full_path(terminal, "DEPARTURE")
-                lat, lng = interpolate_path(path, progress)
-                return {**base_info, "lat": lat, "lng": lng, "status": "UNDERWAY"}
-            else:
-                lat = 53.89 + random.uniform(-0.02, 0.02)
-                lng = 8.70 + random.uniform(-0.03, 0.03)
-                return {**base_info, "lat": lat, "lng": lng, "status": "AT_SEA"}
-    
-    return None
+    """Internal Generator: Reconstructs movement from HPA Schedule + Elbe Geometry (seeded, see brain.synthetic)"""
+    from brain.synthetic import generate_snapshots  # Deferred: NumPy
+    return generate_snapshots(interval_s=interval_minutes * 60, seed=int(os.getenv("HISTORY_SEED", "0")))
 
 
 def get_vessel_details(identifier: str) -> Optional[Dict]:
-    """Get full vessel details by name, IMO, or MMSI"""
-    identifier = str(identifier).upper()
-    
-    for v in REAL_VESSELS:
-        if (v["name"].upper() == identifier or 
-            v["imo"] == identifier or 
-            v["mmsi"] == identifier):
-            return {
-                "name": v["name"],
-                "imo": v["imo"],
-                "mmsi": v["mmsi"],
-                "callsign": v.get("callsign", ""),
-                "flag": v.get("flag", ""),
-                "type": v["type"],
-                "subtype": v.get("subtype", ""),
-                "built": v.get("built", 0),
-                "dimensions": {
-                    "length_m": v["length_m"],
-                    "beam_m": v.get("beam_m", 0),
-                    "draft_m": v.get("draft_m", 0),
-                },
-                "tonnage": {
-                    "gross": v.get("gross_tonnage", 0),
-                    "deadweight": v.get("dwt", 0),
-                },
-                "capacity": {
-                    "teu": v.get("teu", 0),
-                    "passengers": v.get("passengers", 0),
-                },
-                "operator": v.get("operator", ""),
-                "speed_kn": v.get("speed_kn", 0),
-            }
-    return None
+    """Get full vessel details by name, IMO, MMSI or callsign (hash indexes, brain.registry)"""
+    return services.get("registry").details(identifier)
 
 
 def save_history_file():
@@ -991,14 +758,15 @@ def save_history_file():
     print("=" * 60)
     print(f"Vessels: {len(REAL_VESSELS)}")
     
-    history = generate_24h_history(interval_minutes=10)
+    history = _generate_synthetic_history(interval_minutes=10)
     print(f"Snapshots: {len(history)}")
     
-    output_path = os.path.join(os.path.dirname(__file__), "..", "eye", "data", "ship_history_24h.json")
-    with open(output_path, "w") as f:
-        json.dump(history, f, indent=2)
+    from brain.historystore import write_store
+
+    output_path = os.path.join(os.path.dirname(__file__), "..", "eye", "data", "ship_history")
+    write_store(history, output_path)
     
-    print(f"✓ Saved to {output_path}")
+    print(f"✓ Saved to {output_path} (columnar)")
     
     # Movement check
     for h_idx in [0, 36, 72, 108, 144]:
@@ -1014,79 +782,205 @@ def save_history_file():
 # ============================================================================
 
 class Historian:
-    def __init__(self):
-        self.history = None
+    """
+    24h History Service.
+    History lives in a columnar, memory-mapped store (brain.historystore) next to
+    the legacy ship_history_24h.json, which is converted on first load (and again
+    whenever the JSON changes). The pivoted per-ship view and its encoded JSON
+    (plain + gzip) are built once per history version; the version changes only
+    when the store is rewritten (meta.json mtime/size, checked on each call), so
+    repeat requests are a stat() plus a byte copy.
+
+    Once the Eye's recorder (eye.recorder) spans RECORDING_MIN_COVERAGE of the
+    last 24h with ships in it, the views are served from the recording instead
+    (HISTORY_SOURCE=auto|synthetic), memoized per recording stamp: the compacted
+    segments plus the hot segment's last append in RECORDING_REFRESH_S buckets, so
+    live samples refresh the view (and its ETag) at that cadence, not per sample;
+    query(start=, end=) reads any recorded window.
+    """
+    RECORDING_MIN_COVERAGE = 0.9  # A fresh or patchy recording would serve a near-empty day
+    RECORDING_REFRESH_S = 300     # The recorder's compaction resolution
+
+    def __init__(self, data_dir=None):
+        data_dir = data_dir or os.path.join(os.path.dirname(__file__), "..", "eye", "data")
+        self.json_path = os.path.join(data_dir, "ship_history_24h.json")
+        self.store_dir = os.path.join(data_dir, "ship_history")
+        self.recordings_dir = os.getenv("HISTORY_DIR", os.path.join(data_dir, "recordings"))
+        self.source = os.getenv("HISTORY_SOURCE", "auto")
+        self.store = None
+        self.recorded = None  # SegmentedHistory, once the recording directory exists
+        self.version = 0
+        self._stamp = None    # (mtime_ns, size) of the loaded store's meta.json
+        self._pivot = None    # (version, pivoted dict)
+        self._encoded = None  # (version, body, gzip body, etag)
+        self._window = None   # (stamp key, in-memory store over the recorded last 24h)
+        self._bridges = None  # (window/version key, BridgeIntervals)
         self._load_or_generate()
     
-    def _load_or_generate(self):
-        path = os.path.join(os.path.dirname(__file__), "..", "eye", "data", "ship_history_24h.json")
+    def _file_stamp(self):
         try:
-            with open(path, "r") as f:
-                self.history = json.load(f)
-                print(f"HISTORIAN: Loaded {len(self.history)} snapshots")
-        except:
+            st = os.stat(os.path.join(self.store_dir, "meta.json"))
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _json_stamp(self):
+        try:
+            st = os.stat(self.json_path)
+            return [st.st_mtime_ns, st.st_size]
+        except OSError:
+            return None
+
+    def _load_or_generate(self):
+        # Deferred: keeps `from brain.history import BRIDGE_ZONES` free of NumPy
+        from brain.historystore import HistoryStore, convert_json, write_store
+
+        json_stamp = self._json_stamp()
+        if HistoryStore.exists(self.store_dir):
+            store = HistoryStore(self.store_dir)
+            if json_stamp is None or store.meta.get("source_stamp") in (None, json_stamp):
+                self.store = store
+        if self.store is None and json_stamp is not None:
+            print("HISTORIAN: Converting ship_history_24h.json to the columnar store...")
+            convert_json(self.json_path, self.store_dir)
+            self.store = HistoryStore(self.store_dir)
+        if self.store is None:
             print("HISTORIAN: Generating...")
             # Use the new API wrapper
-            self.history = fetch_historical_movement(interval_minutes=10)
-            os.makedirs(os.path.dirname(path), exist_ok=True)
-            with open(path, "w") as f:
-                json.dump(self.history, f)
-    
-    def get_24h_history(self) -> Dict:
-        if not self.history:
+            write_store(fetch_historical_movement(interval_minutes=10), self.store_dir)
+            self.store = HistoryStore(self.store_dir)
+        print(f"HISTORIAN: Loaded {len(self.store)} snapshots ({self.store.meta['points']} points, memory-mapped)")
+        self._stamp = self._file_stamp()
+        self.version += 1
+
+    def refresh(self):
+        """Reopens the store if it was rewritten. Returns the current version."""
+        if self.store is None or self._file_stamp() != self._stamp or \
+                self.store.meta.get("source_stamp") not in (None, self._json_stamp()):
+            self.store = None
             self._load_or_generate()
-        
-        if not self.history:
-            return {"window_start": 0, "window_end": 0, "ships": []}
-        
-        window_start = self.history[0]["timestamp_unix"]
-        window_end = self.history[-1]["timestamp_unix"]
-        
-        ship_paths = {}
-        timeline = []
-
-        for snapshot in self.history:
-            ts = snapshot["timestamp_unix"]
-            
-            # Aggregate Timeline Data
-            timeline.append({
-                "ts": ts,
-                "bridges": snapshot.get("bridges", {"RETHE": "CLOSED", "KATTWYK": "CLOSED"}),
-                "traffic_density": snapshot.get("traffic_density", 0),
-                "weather": snapshot.get("weather", "CLEAR"),
-                "obstacles": snapshot.get("active_obstacles", [])
-            })
+        return self.version
+
+    # --- RECORDED HISTORY ---
+    def _recording(self):
+        """SegmentedHistory of the Eye's recorder, or None (not recording / disabled)."""
+        if self.source == "synthetic":
+            return None
+        if self.recorded is None and os.path.isdir(self.recordings_dir):
+            from brain.historystore import SegmentedHistory
+            self.recorded = SegmentedHistory(self.recordings_dir)
+        return self.recorded
+
+    def _current(self):
+        """(cache key, store) behind the 24h views: the recording if it covers the last 24h."""
+        recording = self._recording()
+        if recording is not None:
+            now = time.time()
+            stamp = recording.stamp(now - 86400, now, hot_resolution_s=self.RECORDING_REFRESH_S)
+            if stamp and recording.coverage(now - 86400, now) >= self.RECORDING_MIN_COVERAGE:
+                key = ("recorded", stamp)
+                if self._window is None or self._window[0] != key:
+                    self._window = (key, recording.window_store(now - 86400, now))
+                if len(self._window[1].ships):
+                    return self._window
+        return ("synthetic", self.refresh()), self.store
+
+    # --- VIEWS ---
+    def get_24h_history(self) -> Dict:
+        """Per-ship paths + timeline. Memoized per version: treat the result as read-only."""
+        key, store = self._current()
+        if self._pivot is None or self._pivot[0] != key:
+            self._pivot = (key, store.pivot())
+        return self._pivot[1]
+
+    def get_24h_history_encoded(self):
+        """(JSON bytes, gzip bytes, ETag) of get_24h_history(), encoded once per version."""
+        history = self.get_24h_history()
+        key = self._pivot[0]
+        if self._encoded is None or self._encoded[0] != key:
+            body = json.dumps(history, separators=(",", ":")).encode("utf-8")
+            etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+            self._encoded = (key, body, gzip.compress(body, compresslevel=6), etag)
+        return self._encoded[1:]
+
+    def _recorded_for(self, start=None, end=None):
+        """The recording, if [start, end] reaches back past the last 24h into recorded segments."""
+        recording = self._recording()
+        if recording is not None and start is not None and start < time.time() - 86400 \
+                and recording.segments(start, end):
+            return recording
+        return None
+
+    def _store_for(self, start=None, end=None, bracket=False):
+        """
+        Store covering [start, end]: recorded segments for windows past the last 24h.
+        bracket=True keeps one sample on each side of the window (interpolation).
+        """
+        recording = self._recorded_for(start, end)
+        if recording is not None:
+            return recording.window_store(start, end, bracket)
+        return self._current()[1]
+
+    def query(self, start=None, end=None, **filters) -> Dict:
+        """
+        Filtered, downsampled history (see HistoryStore.query), read from the columns.
+        Windows reaching back past the last 24h are read from the recording's segments.
+        """
+        return self._store_for(start, end).query(start=start, end=end, **filters)
+
+    def bridge_index(self, start=None, end=None):
+        """
+        Merged OPEN intervals per bridge (brain.bridges), built once per window and
+        history version: recorded windows are keyed by their segments' stamp.
+        """
+        from brain.bridges import BridgeIntervals  # Deferred: NumPy
+        recording = self._recorded_for(start, end)
+        if recording is not None:
+            key = ("window", start, end, recording.stamp(start, end))
+            if self._bridges is None or self._bridges[0] != key:
+                self._bridges = (key, BridgeIntervals.from_store(recording.window_store(start, end, bracket=True)))
+            return self._bridges[1]
+        key, store = self._current()
+        if self._bridges is None or self._bridges[0] != key:
+            self._bridges = (key, BridgeIntervals.from_store(store))
+        return self._bridges[1]
+
+    def at(self, ts: float) -> Dict:
+        """
+        Fleet interpolated at ts: one binary search for all ships (HistoryStore.at).
+        Recorded times are read in place from their segment (SegmentedHistory.frames_at).
+        """
+        recording = self._recorded_for(ts, ts)
+        if recording is not None:
+            return recording.frames_at([ts])[0]
+        return self._current()[1].at(ts)
+
+    def frames(self, start: float, end: float, step: float) -> List[Dict]:
+        """Frames from start to end every step seconds (slider scrubbing, frame export)."""
+        recording = self._recorded_for(start, end)
+        if recording is not None:
+            from brain.historystore import frame_times  # Deferred: NumPy
+            return recording.frames_at(frame_times(start, end, step))
+        return self._current()[1].frames(start, end, step)
+
+    def get_route(self, terminal: str, direction: str = "ARRIVAL") -> Dict:
+        """Land-free sea <-> berth path for a terminal (cached by the router)."""
+        path = get_full_path(terminal, direction, over_water=True)
+        return {"terminal": terminal, "direction": direction, "path": path}
 
-            for ship in snapshot["ships"]:
-                ship_id = ship["id"]
-                if ship_id not in ship_paths:
-                    ship_paths[ship_id] = {
-                        "id": ship_id,
-                        "imo": ship.get("imo", ""),
-                        "mmsi": ship.get("mmsi", ""),
-                        "type": ship.get("type", "Unknown"),
-                        "path": []
-                    }
-                ship_paths[ship_id]["path"].append({
-                    "ts": ts,
-                    "lat": ship["lat"],
-                    "lng": ship["lng"],
-                    "status": ship.get("status", "UNKNOWN")
-                })
-        
-        return {
-            "window_start": window_start,
-            "window_end": window_end,
-            "ships": list(ship_paths.values()),
-            "timeline": timeline
-        }
-    
     def get_vessel_info(self, identifier: str) -> Optional[Dict]:
         """Get detailed vessel information"""
         return get_vessel_details(identifier)
 
 
-historian = Historian()
+services.register("historian", Historian)
+
+
+def __getattr__(name):
+    # Lazy singleton: the 24h file is loaded (or generated) on first use
+    if name == "historian":
+        return services.get("historian")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
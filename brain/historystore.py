@@ -0,0 +1,650 @@
+"""
+Columnar Ship History.
+Replaces the nested-dict ship_history_24h.json with one .npy file per column,
+read with np.load(mmap_mode="r"): opening a store costs the same for a day or a
+month of history, and only the pages a query touches are read.
+
+LAYOUT (directory):
+- meta.json          : format, counts, string table, ship table, bridge names
+- pt_ts / pt_lat / pt_lng / pt_status / pt_ship .npy
+                     : one row per ship position, grouped by ship, ts ascending
+- pt_key.npy         : ship * span + (ts - t0), globally sorted (see time_key)
+- ship_offsets.npy   : ship i owns points [ship_offsets[i], ship_offsets[i + 1])
+- by_time.npy        : point indices ordered by (ts, ship)
+- snap_ts / snap_density / snap_weather .npy, snap_bridge_<NAME>.npy
+                     : the per-snapshot timeline table
+- snap_offsets.npy   : snapshot j owns by_time[snap_offsets[j]:snap_offsets[j + 1]]
+- obstacle_offsets / obstacle_ids .npy : per-snapshot obstacle strings
+Strings (status, weather, bridge state, obstacles) are ids into meta["strings"].
+"""
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+STORE_FORMAT = 1
+SHIP_FIELDS = ("id", "imo", "mmsi", "type", "length_m")
+MAX_FRAME_POINTS = 5_000_000  # ships x frames per /history/frames call
+
+
+class StringTable:
+    """Interns strings to dense uint16 ids (status, weather, bridge states...)."""
+    def __init__(self, strings=None):
+        self.strings = list(strings or [])
+        self._ids = {s: i for i, s in enumerate(self.strings)}
+
+    def id(self, value):
+        i = self._ids.get(value)
+        if i is None:
+            i = self._ids[value] = len(self.strings)
+            self.strings.append(value)
+        return i
+
+
+def _save(directory, name, array):
+    # Write-then-rename: readers that still map the old file keep a valid inode
+    tmp = os.path.join(directory, name + ".tmp.npy")
+    np.save(tmp, array)
+    os.replace(tmp, os.path.join(directory, name + ".npy"))
+
+
+def time_key(pt_ship, pt_ts, snap_ts):
+    """
+    -> (span, key): pt_ts made globally sorted as ship * span + (ts - t0), with
+    t0 / span from the snapshot window. Each ship's (sorted) timestamps occupy
+    their own band, so one searchsorted brackets a time for every ship at once.
+    """
+    t0 = float(snap_ts[0]) if len(snap_ts) else 0.0
+    span = (float(snap_ts[-1]) - t0 + 1.0) if len(snap_ts) else 1.0
+    return span, np.asarray(pt_ship, dtype=np.float64) * span + (np.asarray(pt_ts, dtype=np.float64) - t0)
+
+
+def build_columns(snapshots, source_stamp=None):
+    """
+    Snapshot list (the legacy JSON shape) -> ({column name: array}, meta).
+    Snapshots: [{"timestamp_unix", "ships": [{id, imo, mmsi, type, length_m, lat, lng, status}],
+                 "bridges": {name: state}, "traffic_density", "weather", "active_obstacles"}]
+    """
+    strings = StringTable()
+    ship_index = {}
+    ships = []
+    bridge_names = sorted({name for snap in snapshots for name in snap.get("bridges", {})})
+
+    pt_ts, pt_lat, pt_lng, pt_status, pt_ship = [], [], [], [], []
+    snap_ts, snap_density, snap_weather = [], [], []
+    snap_bridges = {name: [] for name in bridge_names}
+    obstacle_offsets = [0]
+    obstacle_ids = []
+
+    for snap in snapshots:
+        ts = float(snap["timestamp_unix"])
+        snap_ts.append(ts)
+        snap_density.append(int(snap.get("traffic_density", 0)))
+        snap_weather.append(strings.id(snap.get("weather", "CLEAR")))
+        bridges = snap.get("bridges", {})
+        for name in bridge_names:
+            snap_bridges[name].append(strings.id(bridges.get(name, "CLOSED")))
+        obstacle_ids.extend(strings.id(o) for o in snap.get("active_obstacles", []))
+        obstacle_offsets.append(len(obstacle_ids))
+
+        for ship in snap["ships"]:
+            idx = ship_index.get(ship["id"])
+            if idx is None:
+                idx = ship_index[ship["id"]] = len(ships)
+                ships.append({k: ship.get(k, "") for k in SHIP_FIELDS})
+            pt_ts.append(ts)
+            pt_lat.append(ship["lat"])
+            pt_lng.append(ship["lng"])
+            pt_status.append(strings.id(ship.get("status", "UNKNOWN")))
+            pt_ship.append(idx)
+
+    pt_ts = np.asarray(pt_ts, dtype=np.float64)
+    pt_ship = np.asarray(pt_ship, dtype=np.int32)
+    order = np.lexsort((pt_ts, pt_ship))  # Group by ship, ts ascending
+    pt_ts = pt_ts[order]
+    pt_ship = pt_ship[order]
+    by_time = np.lexsort((pt_ship, pt_ts)).astype(np.int64)
+    snap_ts = np.asarray(snap_ts, dtype=np.float64)
+    snap_offsets = np.searchsorted(pt_ts[by_time], snap_ts, side="left")
+
+    columns = {
+        "pt_ts": pt_ts,
+        "pt_lat": np.asarray(pt_lat, dtype=np.float64)[order],
+        "pt_lng": np.asarray(pt_lng, dtype=np.float64)[order],
+        "pt_status": np.asarray(pt_status, dtype=np.uint16)[order],
+        "pt_ship": pt_ship,
+        "pt_key": time_key(pt_ship, pt_ts, snap_ts)[1],
+        "ship_offsets": np.searchsorted(pt_ship, np.arange(len(ships) + 1)).astype(np.int64),
+        "by_time": by_time,
+        "snap_ts": snap_ts,
+        "snap_offsets": np.append(snap_offsets, len(by_time)).astype(np.int64),
+        "snap_density": np.asarray(snap_density, dtype=np.int32),
+        "snap_weather": np.asarray(snap_weather, dtype=np.uint16),
+        "obstacle_offsets": np.asarray(obstacle_offsets, dtype=np.int64),
+        "obstacle_ids": np.asarray(obstacle_ids, dtype=np.uint16)
+    }
+    for name in bridge_names:
+        columns[f"snap_bridge_{name}"] = np.asarray(snap_bridges[name], dtype=np.uint16)
+
+    meta = {
+        "format": STORE_FORMAT,
+        "points": int(len(pt_ts)),
+        "snapshots": int(len(snap_ts)),
+        "ships": ships,
+        "bridges": bridge_names,
+        "strings": strings.strings,
+        "source_stamp": source_stamp
+    }
+    return columns, meta
+
+
+def write_store(snapshots, directory, source_stamp=None):
+    """Snapshot list -> columnar store directory (see build_columns)."""
+    os.makedirs(directory, exist_ok=True)
+    columns, meta = build_columns(snapshots, source_stamp)
+    for name, array in columns.items():
+        _save(directory, name, array)
+    write_meta(directory, meta)
+    return directory
+
+
+def write_meta(directory, meta):
+    # meta.json last: it is the commit marker (and its mtime the store version)
+    tmp = os.path.join(directory, "meta.json.tmp")
+    with open(tmp, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp, os.path.join(directory, "meta.json"))
+
+
+class HistoryStore:
+    """
+    Read side: memory-mapped columns + the small tables from meta.json.
+    HistoryStore.from_snapshots() builds the same view in memory (recorded windows).
+    """
+    def __init__(self, directory, columns=None, meta=None):
+        self.directory = directory
+        if meta is None:
+            with open(os.path.join(directory, "meta.json"), "r") as f:
+                meta = json.load(f)
+        self.meta = meta
+        if self.meta.get("format") != STORE_FORMAT:
+            raise ValueError(f"Unsupported history store format {self.meta.get('format')}")
+        self.ships = self.meta["ships"]
+        self.strings = self.meta["strings"]
+        self.bridges = self.meta["bridges"]
+
+        def col(name, optional=False):
+            if columns is not None:
+                return columns.get(name) if optional else columns[name]
+            path = os.path.join(directory, name + ".npy")
+            if optional and not os.path.exists(path):
+                return None
+            return np.load(path, mmap_mode="r")
+
+        self.pt_ts = col("pt_ts")
+        self.pt_lat = col("pt_lat")
+        self.pt_lng = col("pt_lng")
+        self.pt_status = col("pt_status")
+        self.pt_ship = col("pt_ship")
+        self.pt_key = col("pt_key", optional=True)  # Absent in stores written before it existed
+        self.ship_offsets = col("ship_offsets")
+        self.by_time = col("by_time")
+        self.snap_ts = col("snap_ts")
+        self.snap_offsets = col("snap_offsets")
+        self.snap_density = col("snap_density")
+        self.snap_weather = col("snap_weather")
+        self.snap_bridges = {name: col(f"snap_bridge_{name}") for name in self.bridges}
+        self.obstacle_offsets = col("obstacle_offsets")
+        self.obstacle_ids = col("obstacle_ids")
+        self._key = None  # (span, ship/time sort key), see _time_key()
+
+    @classmethod
+    def from_snapshots(cls, snapshots):
+        columns, meta = build_columns(snapshots)
+        return cls(None, columns, meta)
+
+    @staticmethod
+    def exists(directory):
+        return os.path.exists(os.path.join(directory, "meta.json"))
+
+    def __len__(self):
+        return len(self.snap_ts)
+
+    @property
+    def window(self):
+        if not len(self.snap_ts):
+            return 0, 0
+        return float(self.snap_ts[0]), float(self.snap_ts[-1])
+
+    def ship_range(self, i):
+        return int(self.ship_offsets[i]), int(self.ship_offsets[i + 1])
+
+    def obstacles(self, j):
+        lo, hi = int(self.obstacle_offsets[j]), int(self.obstacle_offsets[j + 1])
+        return [self.strings[k] for k in self.obstacle_ids[lo:hi]]
+
+    def timeline_entry(self, j):
+        return {
+            "ts": float(self.snap_ts[j]),
+            "bridges": {name: self.strings[self.snap_bridges[name][j]] for name in self.bridges},
+            "traffic_density": int(self.snap_density[j]),
+            "weather": self.strings[self.snap_weather[j]],
+            "obstacles": self.obstacles(j)
+        }
+
+    def ship_path(self, i, lo=None, hi=None):
+        """Path dicts of ship i (optionally a sub-range of its points)."""
+        s_lo, s_hi = self.ship_range(i)
+        lo = s_lo if lo is None else lo
+        hi = s_hi if hi is None else hi
+        ts = self.pt_ts[lo:hi].tolist()
+        lat = self.pt_lat[lo:hi].tolist()
+        lng = self.pt_lng[lo:hi].tolist()
+        status = [self.strings[k] for k in self.pt_status[lo:hi].tolist()]
+        return [{"ts": t, "lat": a, "lng": b, "status": s} for t, a, b, s in zip(ts, lat, lng, status)]
+
+    def pivot(self):
+        """The Historian's /history shape: per-ship paths + timeline."""
+        window_start, window_end = self.window
+        ships = []
+        for i, meta in enumerate(self.ships):
+            ships.append({
+                "id": meta["id"],
+                "imo": meta.get("imo", ""),
+                "mmsi": meta.get("mmsi", ""),
+                "type": meta.get("type", "Unknown"),
+                "path": self.ship_path(i)
+            })
+        return {
+            "window_start": window_start,
+            "window_end": window_end,
+            "ships": ships,
+            "timeline": [self.timeline_entry(j) for j in range(len(self))]
+        }
+
+    def query(self, start=None, end=None, bbox=None, ids=None, types=None, points=None):
+        """
+        Filtered /history view, read straight from the columns:
+        - start/end: unix window (per-ship binary search on the ts column)
+        - bbox: (west, south, east, north); keeps in-box points plus one neighbour
+          on each side so tracks run off the edge of the view
+        - ids / types: vessel id (name, IMO or MMSI) / type filters
+        - points: max points per track (LTTB downsampling)
+        Cost follows the selected ships and window, not the stored history.
+        """
+        w_start, w_end = self.window
+        start = w_start if start is None else start
+        end = w_end if end is None else end
+        ids = {str(v).upper() for v in ids} if ids else None
+        types = {str(v).upper() for v in types} if types else None
+
+        ships = []
+        for i, meta in enumerate(self.ships):
+            if ids and not ids & {str(meta.get(k, "")).upper() for k in ("id", "imo", "mmsi")}:
+                continue
+            if types and str(meta.get("type", "")).upper() not in types:
+                continue
+            s_lo, s_hi = self.ship_range(i)
+            ts = self.pt_ts[s_lo:s_hi]
+            lo = s_lo + int(np.searchsorted(ts, start, side="left"))
+            hi = s_lo + int(np.searchsorted(ts, end, side="right"))
+            if hi <= lo:
+                continue
+            idx = np.arange(lo, hi)
+            lat = np.asarray(self.pt_lat[lo:hi])
+            lng = np.asarray(self.pt_lng[lo:hi])
+            if bbox is not None:
+                west, south, east, north = bbox
+                inside = (lng >= west) & (lng <= east) & (lat >= south) & (lat <= north)
+                if not inside.any():
+                    continue
+                near = inside.copy()
+                near[1:] |= inside[:-1]
+                near[:-1] |= inside[1:]
+                idx, lat, lng = idx[near], lat[near], lng[near]
+            if points and len(idx) > points:
+                keep = lttb(lng * np.cos(np.radians(lat)), lat, points)
+                idx = idx[keep]
+            status = [self.strings[k] for k in self.pt_status[idx].tolist()]
+            ships.append({
+                "id": meta["id"],
+                "imo": meta.get("imo", ""),
+                "mmsi": meta.get("mmsi", ""),
+                "type": meta.get("type", "Unknown"),
+                "path": [{"ts": t, "lat": a, "lng": b, "status": s} for t, a, b, s in
+                         zip(self.pt_ts[idx].tolist(), self.pt_lat[idx].tolist(), self.pt_lng[idx].tolist(), status)]
+            })
+
+        j_lo = int(np.searchsorted(self.snap_ts, start, side="left"))
+        j_hi = int(np.searchsorted(self.snap_ts, end, side="right"))
+        return {
+            "window_start": max(start, w_start),
+            "window_end": min(end, w_end),
+            "ships": ships,
+            "timeline": [self.timeline_entry(j) for j in range(j_lo, j_hi)]
+        }
+
+    # --- POINT IN TIME ---
+    def _time_key(self):
+        """(span, key) of time_key(): the persisted pt_key column (memory-mapped)."""
+        if self._key is None:
+            if self.pt_key is not None:
+                self._key = (time_key([], [], self.snap_ts)[0], self.pt_key)
+            else:
+                # Older store without pt_key: built in RAM once (re-write the store to persist it)
+                self._key = time_key(self.pt_ship, self.pt_ts, self.snap_ts)
+        return self._key
+
+    def positions_at(self, times):
+        """
+        Every ship at every time in `times` (binary search + linear interpolation):
+        -> lat, lng [ships, T] (NaN where the ship has no samples around t), status
+        ids of the preceding sample [ships, T]. Costs O(ships * T * log n).
+        """
+        times = np.atleast_1d(np.asarray(times, dtype=np.float64))
+        n_ships = len(self.ships)
+        if not len(self.pt_ts):
+            empty = np.full((n_ships, len(times)), np.nan)
+            return empty, empty.copy(), np.zeros((n_ships, len(times)), dtype=np.uint16)
+        span, key = self._time_key()
+        start = np.asarray(self.ship_offsets[:-1])[:, None]
+        end = np.asarray(self.ship_offsets[1:])[:, None]
+        query = np.arange(n_ships, dtype=np.float64)[:, None] * span + (times[None, :] - self.window[0])
+        hi = np.searchsorted(key, query, side="right")  # First sample after t (per ship band)
+        lo = hi - 1
+        valid = (lo >= start) & (end > start)
+        last = np.where(end > start, end - 1, 0)
+        valid &= times[None, :] <= np.asarray(self.pt_ts)[last]  # Inside the ship's track
+        lo = np.where(valid, lo, 0)
+        hi = np.where(valid, np.minimum(hi, end - 1), 0)
+
+        t_lo = self.pt_ts[lo]
+        dt = self.pt_ts[hi] - t_lo
+        ratio = np.where(dt > 0, (times[None, :] - t_lo) / np.where(dt > 0, dt, 1.0), 0.0)
+        lat = self.pt_lat[lo] + (self.pt_lat[hi] - self.pt_lat[lo]) * ratio
+        lng = self.pt_lng[lo] + (self.pt_lng[hi] - self.pt_lng[lo]) * ratio
+        lat[~valid] = np.nan
+        lng[~valid] = np.nan
+        return lat, lng, np.asarray(self.pt_status[lo])
+
+    def _frame(self, t, lat, lng, status):
+        ships = []
+        for i in np.flatnonzero(~np.isnan(lat)).tolist():
+            meta = self.ships[i]
+            ships.append({
+                "id": meta["id"],
+                "imo": meta.get("imo", ""),
+                "mmsi": meta.get("mmsi", ""),
+                "type": meta.get("type", "Unknown"),
+                "lat": round(float(lat[i]), 6),
+                "lng": round(float(lng[i]), 6),
+                "status": self.strings[status[i]]
+            })
+        j = max(int(np.searchsorted(self.snap_ts, t, side="right")) - 1, 0)  # Latest snapshot <= t
+        entry = self.timeline_entry(j) if len(self) else {}
+        entry.pop("ts", None)
+        return {"ts": float(t), **entry, "ships": ships}
+
+    def at(self, t):
+        """Interpolated fleet + environment at time t (the /history/at frame)."""
+        lat, lng, status = self.positions_at([t])
+        return self._frame(t, lat[:, 0], lng[:, 0], status[:, 0])
+
+    def frames(self, start, end, step):
+        """Frames at start, start + step, ... <= end, all ships x times in one search."""
+        return self.frames_at(frame_times(start, end, step))
+
+    def frames_at(self, times):
+        """Frames at each of `times` (ascending)."""
+        times = np.asarray(times, dtype=np.float64)
+        if len(times) * max(len(self.ships), 1) > MAX_FRAME_POINTS:
+            raise ValueError(f"{len(times)} frames x {len(self.ships)} ships exceeds {MAX_FRAME_POINTS} points")
+        lat, lng, status = self.positions_at(times)
+        return [self._frame(t, lat[:, k], lng[:, k], status[:, k]) for k, t in enumerate(times.tolist())]
+
+    def snapshot(self, j):
+        """Legacy snapshot dict j (the JSON file's shape)."""
+        entry = self.timeline_entry(j)
+        ts = entry["ts"]
+        ships = []
+        for p in self.by_time[int(self.snap_offsets[j]):int(self.snap_offsets[j + 1])]:
+            meta = self.ships[int(self.pt_ship[p])]
+            ships.append({**meta, "lat": float(self.pt_lat[p]), "lng": float(self.pt_lng[p]),
+                          "status": self.strings[self.pt_status[p]]})
+        return {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(ts)),
+            "timestamp_unix": ts,
+            "ships": ships,
+            "bridges": entry["bridges"],
+            "weather": entry["weather"],
+            "active_obstacles": entry["obstacles"],
+            "traffic_density": entry["traffic_density"]
+        }
+
+
+def frame_times(start, end, step):
+    """start, start + step, ... <= end."""
+    return start + np.arange(int((end - start) / step + 1e-9) + 1, dtype=np.float64) * step
+
+
+def lttb(x, y, target):
+    """
+    Largest-Triangle-Three-Buckets on a track: keeps `target` points (first and
+    last always), choosing in each bucket the point whose triangle with the last
+    kept point and the next bucket's centroid has the largest area in (x, y).
+    Shape-preserving: turns survive, straight runs collapse. Returns indices.
+    """
+    n = len(x)
+    if target >= n:
+        return np.arange(n)
+    if target < 3:
+        return np.array([0, n - 1])
+    edges = np.linspace(1, n - 1, target - 1).astype(np.int64)  # target - 2 interior buckets
+    keep = np.empty(target, dtype=np.int64)
+    keep[0] = 0
+    keep[-1] = n - 1
+    a = 0
+    for b in range(target - 2):
+        lo, hi = edges[b], max(edges[b + 1], edges[b] + 1)
+        nlo = hi
+        nhi = max(edges[b + 2], nlo + 1) if b + 2 < len(edges) else n
+        cx = x[nlo:nhi].mean()
+        cy = y[nlo:nhi].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[b + 1] = a
+    return keep
+
+
+class SegmentedHistory:
+    """
+    Reader for a recording directory (written by eye.recorder.HistoryRecorder):
+    - hot/<start>-<end>.jsonl : recent segments, one legacy snapshot per line
+    - cold/<start>-<end>/     : older segments compacted into columnar stores
+    Any window is served by reading only the segments that overlap it.
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        self.hot_dir = os.path.join(directory, "hot")
+        self.cold_dir = os.path.join(directory, "cold")
+
+    @staticmethod
+    def _span(name):
+        start, end = name.split(".")[0].split("-")
+        return int(start), int(end)
+
+    def segments(self, start=None, end=None):
+        """[(seg_start, seg_end, kind, path)] overlapping [start, end], oldest first."""
+        found = []
+        for kind, base in (("cold", self.cold_dir), ("hot", self.hot_dir)):
+            if not os.path.isdir(base):
+                continue
+            for name in os.listdir(base):
+                if name.endswith(".tmp") or (kind == "hot" and not name.endswith(".jsonl")):
+                    continue
+                if kind == "cold" and not HistoryStore.exists(os.path.join(base, name)):
+                    continue  # Compaction in progress
+                s0, s1 = self._span(name)
+                if (end is None or s0 <= end) and (start is None or s1 >= start):
+                    found.append((s0, s1, kind, os.path.join(base, name)))
+        # A segment compacted between listings may show up in both: prefer cold
+        found.sort(key=lambda seg: (seg[0], seg[2] != "cold"))
+        unique = []
+        for seg in found:
+            if not unique or unique[-1][0] != seg[0]:
+                unique.append(seg)
+        return unique
+
+    def coverage(self, start, end):
+        """Share of [start, end] spanned by recorded segments (0..1)."""
+        if end <= start:
+            return 0.0
+        covered = sum(max(0, min(s1, end) - max(s0, start)) for s0, s1, _, _ in self.segments(start, end))
+        return min(covered / (end - start), 1.0)
+
+    def stamp(self, start=None, end=None, hot_resolution_s=None):
+        """
+        Changes whenever a segment in the window is appended, compacted or dropped.
+        hot_resolution_s: hot segments only count by their last append time in
+        buckets of that many seconds, so a live recording changes the stamp at
+        that cadence rather than on every sample.
+        """
+        out = []
+        for s0, _, kind, path in self.segments(start, end):
+            target = os.path.join(path, "meta.json") if kind == "cold" else path
+            try:
+                st = os.stat(target)
+            except OSError:
+                continue
+            if kind == "hot" and hot_resolution_s:
+                out.append((s0, kind, int(st.st_mtime // hot_resolution_s)))
+            else:
+                out.append((s0, kind, st.st_mtime_ns, st.st_size))
+        return tuple(out)
+
+    @staticmethod
+    def _read(kind, path, start=None, end=None):
+        """Snapshot dicts of one segment in [start, end], time-ordered."""
+        if kind == "cold":
+            store = HistoryStore(path)
+            lo = 0 if start is None else int(np.searchsorted(store.snap_ts, start, side="left"))
+            hi = len(store) if end is None else int(np.searchsorted(store.snap_ts, end, side="right"))
+            return [store.snapshot(j) for j in range(lo, hi)]
+        try:
+            with open(path, "r") as f:
+                lines = f.readlines()
+        except OSError:
+            return []  # Compacted away since listing
+        out = []
+        for line in lines:
+            try:
+                snap = json.loads(line)
+            except ValueError:
+                continue  # Torn last line of a segment being written
+            ts = snap["timestamp_unix"]
+            if (start is None or ts >= start) and (end is None or ts <= end):
+                out.append(snap)
+        return out
+
+    def _edge(self, t, before):
+        """
+        Nearest snapshot strictly before (before=True) or after t, or None.
+        Cold segments answer with one binary search on snap_ts; hot lines are
+        parsed from the near end only until the sample is found.
+        """
+        segs = self.segments(None, t) if before else self.segments(t, None)
+        for _, _, kind, path in (reversed(segs) if before else segs):
+            if kind == "cold":
+                store = HistoryStore(path)
+                if before:
+                    j = int(np.searchsorted(store.snap_ts, t, side="left")) - 1
+                else:
+                    j = int(np.searchsorted(store.snap_ts, t, side="right"))
+                if 0 <= j < len(store):
+                    return store.snapshot(j)
+                continue
+            try:
+                with open(path, "r") as f:
+                    lines = f.readlines()
+            except OSError:
+                continue  # Compacted away since listing
+            for line in (reversed(lines) if before else lines):
+                try:
+                    snap = json.loads(line)
+                except ValueError:
+                    continue  # Torn last line of a segment being written
+                if (snap["timestamp_unix"] < t) if before else (snap["timestamp_unix"] > t):
+                    return snap
+        return None
+
+    def snapshots(self, start=None, end=None, bracket=False):
+        """
+        Legacy snapshot dicts in [start, end], time-ordered. bracket=True adds the
+        nearest sample before start and after end, so positions can be
+        interpolated anywhere inside the window (at / frames).
+        """
+        out = []
+        for _, _, kind, path in self.segments(start, end):
+            out.extend(self._read(kind, path, start, end))
+        if bracket:
+            before = self._edge(start, True) if start is not None else None
+            after = self._edge(end, False) if end is not None else None
+            out = ([before] if before else []) + out + ([after] if after else [])
+        return out
+
+    def window_store(self, start=None, end=None, bracket=False):
+        """In-memory HistoryStore over a window (pivot/query/snapshot work unchanged)."""
+        return HistoryStore.from_snapshots(self.snapshots(start, end, bracket))
+
+    def frames_at(self, times):
+        """
+        Frames at each of `times` (ascending). Times inside a cold segment's samples
+        are interpolated on its memory-mapped columns (HistoryStore.positions_at);
+        only times in a hot segment or between segments build a bracketed
+        in-memory store.
+        """
+        times = np.asarray(times, dtype=np.float64)
+        if not len(times):
+            return []
+        cold = [HistoryStore(path) for _, _, kind, path in self.segments(times[0], times[-1]) if kind == "cold"]
+        cold = [store for store in cold if len(store)]
+        out = []
+        k = 0
+        while k < len(times):
+            t = times[k]
+            store = next((c for c in cold if c.window[0] <= t <= c.window[1]), None)
+            if store is not None:
+                n = int(np.searchsorted(times, store.window[1], side="right"))
+            else:
+                later = [c.window[0] for c in cold if c.window[0] > t]
+                n = int(np.searchsorted(times, min(later), side="left")) if later else len(times)
+                store = self.window_store(t, times[n - 1], bracket=True)
+            out.extend(store.frames_at(times[k:n]))
+            k = n
+        return out
+
+    def latest(self):
+        segs = self.segments()
+        return segs[-1][1] if segs else None
+
+
+def convert_json(json_path, directory):
+    """ship_history_24h.json -> columnar store (records the source's mtime/size)."""
+    with open(json_path, "r") as f:
+        snapshots = json.load(f)
+    st = os.stat(json_path)
+    return write_store(snapshots, directory, source_stamp=[st.st_mtime_ns, st.st_size])
+
+
+if __name__ == "__main__":
+    # Usage: python -m brain.historystore <history.json> <store dir>
+    if len(sys.argv) != 3:
+        print("Usage: python -m brain.historystore <history.json> <store dir>")
+        sys.exit(1)
+    t0 = time.perf_counter()
+    out = convert_json(sys.argv[1], sys.argv[2])
+    store = HistoryStore(out)
+    print(f"HISTORY STORE: {store.meta['snapshots']} snapshots, {store.meta['points']} points, "
+          f"{len(store.ships)} ships -> {out} ({(time.perf_counter() - t0) * 1000:.0f}ms)")
@@ -4,7 +4,9 @@ import os
 import random
 import json
 import uvicorn
-from fastapi import FastAPI, HTTPException
+import websockets
+from typing import Optional
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from loguru import logger
 from brain.conflict import ConflictEngine
@@ -12,7 +14,9 @@ from brain.economics import EconomicsEngine
 from brain.risk import RiskEngine
 from brain.api import SentinelAPI
 from brain.voice import VoiceAgent
-from brain.history import historian
+import brain.history # Registers the historian (built on first request)
+from brain.history import TERMINAL_APPROACHES
+from brain.services import services
 
 app = FastAPI(title="SENTINEL: The Brain")
 
@@ -27,8 +31,8 @@ app.add_middleware(
 # Engines
 from brain.cognition import LLMService
 
-# Replaced old engines with The Cognitive Core
-llm_service = LLMService()
+# Replaced old engines with The Cognitive Core (built on first analysis)
+services.register("llm", LLMService)
 # conflict_engine = ConflictEngine() # Deprecated
 economics_engine = EconomicsEngine()
 voice_agent = VoiceAgent()
@@ -56,10 +60,65 @@ from brain.prediction import PredictiveEngine
 predictive_engine = PredictiveEngine()
 # ...
 
+# Live Eye view, maintained by the push stream (see subscribe_eye)
+EYE_STREAM_URL = os.getenv("EYE_STREAM_URL", "ws://127.0.0.1:8001/stream")
+eye_view = {"live": False, "seq": 0, "ships": {}, "nodes": {}}
+
+def apply_eye_message(msg: dict) -> bool:
+    """
+    Applies one Eye stream message (full snapshot or delta) to eye_view.
+    Returns False on a sequence gap, which means we must resubscribe.
+    """
+    if msg.get("type") == "snapshot":
+        eye_view["ships"] = dict(msg["ships"])
+        eye_view["nodes"] = {node: dict(fields) for node, fields in msg["nodes"].items()}
+        eye_view["seq"] = msg["seq"]
+    elif msg.get("type") == "delta":
+        if msg["seq"] <= eye_view["seq"]:
+            return True # Already covered by a resync snapshot
+        if msg["seq"] != eye_view["seq"] + 1:
+            return False
+        ships = eye_view["ships"]
+        for key in msg["ships"]["remove"]:
+            ships.pop(key, None)
+        ships.update(msg["ships"]["upsert"])
+        for node, fields in msg["nodes"].items():
+            eye_view["nodes"].setdefault(node, {}).update(fields)
+        eye_view["seq"] = msg["seq"]
+    else:
+        return True
+
+    # Low-latency path: push ships/tide into the decision state right away
+    visual_truth = current_state["visual_truth"]
+    if "ships" in visual_truth:
+        visual_truth["ships"] = list(eye_view["ships"].values())
+        for fields in eye_view["nodes"].values():
+            if "tide_level_m" in fields:
+                visual_truth["tide"] = fields["tide_level_m"]
+    return True
+
+async def subscribe_eye():
+    """Background task: one push subscription per Eye, HTTP polling is the fallback"""
+    while True:
+        try:
+            async with websockets.connect(EYE_STREAM_URL, max_size=None) as ws:
+                logger.info(f"EYE STREAM: Subscribed to {EYE_STREAM_URL}")
+                async for raw in ws:
+                    if not apply_eye_message(json.loads(raw)):
+                        logger.warning("EYE STREAM: Sequence gap, resubscribing")
+                        break
+                    eye_view["live"] = True
+        except Exception as e:
+            logger.warning(f"EYE STREAM: Unavailable ({e}). Falling back to polling.")
+        eye_view["live"] = False
+        await asyncio.sleep(5)
+
 async def poll_eyes():
     """Background task to fetch visual truth from The Eye"""
     async with httpx.AsyncClient() as client:
         nodes = ["rethe", "kattwyk"]
+        # Conditional GET cache: node -> (etag, last decoded status)
+        node_cache = {}
         while True:
             try:
                 aggregated_ships = []
@@ -71,10 +130,22 @@ async def poll_eyes():
                 security_alerts = []
                 
                 for node in nodes:
-                    resp = await client.get(f"http://127.0.0.1:8001/status?node_id={node}")
-                    if resp.status_code == 200:
-                        data = resp.json()
-                        
+                    data = None
+                    if eye_view["live"]:
+                        # Pushed state: no request, no re-decode of unchanged ships
+                        data = {**eye_view["nodes"].get(node, {}), "ships": list(eye_view["ships"].values())}
+                    else:
+                        cached = node_cache.get(node)
+                        headers = {"If-None-Match": cached[0]} if cached else {}
+                        resp = await client.get(f"http://127.0.0.1:8001/status?node_id={node}", headers=headers)
+                        if resp.status_code == 304 and cached:
+                            data = cached[1] # Unchanged since last poll: skip decode
+                        elif resp.status_code == 200:
+                            data = resp.json()
+                            if "ETag" in resp.headers:
+                                node_cache[node] = (resp.headers["ETag"], data)
+
+                    if data is not None:
                         # Aggregate Data
                         aggregated_trucks.extend(data.get("trucks", []))
                         # Ships are global, but we take latest set
@@ -107,7 +178,7 @@ async def poll_eyes():
                 # 3. ULTRATHINK: CALL THE LLM
                 # We throttle this to save tokens (every ~10s or 5 loops)
                 if random.random() < 0.2: 
-                    thought = llm_service.analyze_situation(current_state)
+                    thought = services.get("llm").analyze_situation(current_state)
                     
                     # LOG THE GRAND STRATEGY
                     if "reasoning" in thought:
@@ -122,12 +193,16 @@ async def poll_eyes():
                     # 4. TIDAL ECONOMICS CHECK (New from Jan 2026 Report)
                     # Check for deep draft vessels in current view
                     for ship_data in current_state["visual_truth"].get("ships", []):
-                        # Heuristic: Identify Megamax by name or type
                         s_id = ship_data.get("id", "").upper()
-                        if "TRIUMPH" in s_id or "NUBA" in s_id:
-                            # It's a Deep Draft Vessel (16m)
+                        # Real draft from AIS static data (joined by the Eye)
+                        draft = ship_data.get("draft_m")
+                        if draft is None and ("TRIUMPH" in s_id or "NUBA" in s_id):
+                            # Heuristic for non-AIS sources (Lookout/Scout): known Megamax (16m)
+                            draft = 16.0
+                        if draft and draft > 15.0:
+                            # It's a Deep Draft Vessel
                             tide = current_state["visual_truth"].get("tide", 0)
-                            delay_analysis = economics_engine.calculate_tidal_delay_cost(16.0, tide)
+                            delay_analysis = economics_engine.calculate_tidal_delay_cost(draft, tide)
                             
                             if delay_analysis["status"] == "DELAYED":
                                 msg = f"TIDAL WARNING: {s_id} delayed. Cost: €{delay_analysis['cost_eur']}"
@@ -158,7 +233,11 @@ def add_log(source: str, message: str):
 @app.on_event("startup")
 async def startup_event():
     logger.info("Brain Activation...")
+    asyncio.create_task(subscribe_eye())
     asyncio.create_task(poll_eyes())
+    # Warm the lazy singletons in worker threads: the port opens immediately
+    for name in ("historian", "registry", "llm"):
+        asyncio.create_task(asyncio.to_thread(services.get, name))
 
 @app.get("/")
 def health_check():
@@ -223,14 +302,85 @@ def process_voice_command(command: dict):
         
     return response
 
+def _csv(value: Optional[str]):
+    return [v.strip() for v in value.split(",") if v.strip()] if value else None
+
 @app.get("/history")
-def get_history():
+def get_history(request: Request, start: Optional[float] = None, end: Optional[float] = None,
+                bbox: Optional[str] = None, ids: Optional[str] = None, types: Optional[str] = None,
+                points: Optional[int] = None):
     """
     Returns 24h ship movement history.
     Tries MarineTraffic API first, falls back to UltraThink Generative Model.
+    Without filters: bytes encoded once per history version (gzip if accepted, ETag/304).
+    Filters (all optional):
+    - start / end: unix seconds
+    - bbox: west,south,east,north
+    - ids / types: comma-separated vessel ids (name, IMO, MMSI) / vessel types
+    - points: max points per track (shape-preserving LTTB downsampling)
     """
+    historian = services.get("historian")
+    if any(v is not None for v in (start, end, bbox, ids, types, points)):
+        box = None
+        if bbox:
+            try:
+                box = tuple(float(v) for v in bbox.split(","))
+            except ValueError:
+                box = ()
+            if len(box) != 4:
+                raise HTTPException(status_code=400, detail="bbox must be west,south,east,north")
+        if points is not None and points < 2:
+            raise HTTPException(status_code=400, detail="points must be >= 2")
+        return historian.query(start=start, end=end, bbox=box, ids=_csv(ids), types=_csv(types), points=points)
+
     # Use Historian class which now uses the API wrapper
-    return historian.get_24h_history()
+    body, gz_body, etag = historian.get_24h_history_encoded()
+    headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=gz_body, media_type="application/json", headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@app.get("/history/at")
+def get_history_at(ts: float):
+    """
+    Point-in-time frame: every ship interpolated at ts (unix seconds) between its
+    bracketing samples, plus the bridges/traffic/weather of the snapshot at ts.
+    """
+    return services.get("historian").at(ts)
+
+@app.get("/history/frames")
+def get_history_frames(from_: float = Query(..., alias="from"), to: float = Query(...), step: float = 60.0):
+    """Frames from `from` to `to` every `step` seconds (batch of /history/at)."""
+    if step <= 0 or to < from_:
+        raise HTTPException(status_code=400, detail="need from <= to and step > 0")
+    try:
+        frames = services.get("historian").frames(from_, to, step)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"from": from_, "to": to, "step": step, "frames": frames}
+
+@app.get("/bridges/windows")
+def get_bridge_windows(start: Optional[float] = None, end: Optional[float] = None, source: str = "history"):
+    """
+    Bridge OPEN (= road closed) intervals from the interval index: per bridge the
+    intervals overlapping [start, end], total open minutes, open at start, next
+    opening, and the road impact of the closures.
+    source=history (recorded/synthetic history) or forecast (mirrored +24h).
+    """
+    historian = services.get("historian")
+    if source == "forecast":
+        index = predictive_engine.bridge_index(historian.get_24h_history())
+    elif source == "history":
+        index = historian.bridge_index(start, end)
+    else:
+        raise HTTPException(status_code=400, detail="source must be history or forecast")
+    summary = index.summary(start, end)
+    for bridge in summary["bridges"].values():
+        bridge["road_impact"] = economics_engine.calculate_closure_impact(bridge["open_minutes"])
+    return summary
 
 @app.post("/playback/state")
 def receive_playback_state(data: dict):
@@ -263,25 +413,50 @@ def receive_playback_state(data: dict):
     
     return {"received": True, "ships_count": len(ships)}
 
+@app.get("/route/{terminal}")
+def get_terminal_route(terminal: str, direction: str = "ARRIVAL"):
+    """Land-free sea <-> berth path over the navigable-channel graph."""
+    if terminal not in TERMINAL_APPROACHES or direction not in ("ARRIVAL", "DEPARTURE"):
+        raise HTTPException(status_code=404, detail=f"No route for '{terminal}' ({direction})")
+    return services.get("historian").get_route(terminal, direction)
+
+@app.get("/vessel/search")
+def search_vessels(q: str, limit: int = 10):
+    """
+    Vessel autocomplete: ranked matches on name (prefix + fuzzy), IMO, MMSI, callsign.
+    """
+    if not 1 <= limit <= 50:
+        raise HTTPException(status_code=400, detail="limit must be 1..50")
+    return {"query": q, "results": services.get("registry").search(q, limit)}
+
 @app.get("/vessel/{identifier}")
 def get_vessel_info(identifier: str):
     """
     Get detailed vessel information by name, IMO, or MMSI.
     Returns real ship registry data.
     """
-    info = historian.get_vessel_info(identifier)
+    info = services.get("historian").get_vessel_info(identifier)
     if info:
         return info
     raise HTTPException(status_code=404, detail=f"Vessel '{identifier}' not found")
 
 @app.get("/prediction/future")
-def get_future_prediction():
+def get_future_prediction(step: int = 3600):
     """
-    Returns a 24h probabilistic forecast.
+    Returns a 24h probabilistic forecast, one frame every `step` seconds (60..3600).
     """
+    if not 60 <= step <= 3600:
+        raise HTTPException(status_code=400, detail="step must be 60..3600 seconds")
     # Generate on demand
-    history_data = historian.get_24h_history()
-    return predictive_engine.predict_24h_future(current_state, history_data)
+    history_data = services.get("historian").get_24h_history()
+    return predictive_engine.predict_24h_future(current_state, history_data, step_s=step)
+
+@app.get("/prediction/short")
+def get_short_prediction():
+    """
+    Dead-reckoned live fleet for the next minutes (+1, +5, +10 min).
+    """
+    return predictive_engine.predict_short_horizon(current_state)
 
 if __name__ == "__main__":
     logger.info("Starting The Brain...")
@@ -1,6 +1,12 @@
 import random
+import time
 from datetime import datetime, timedelta
 
+import numpy as np
+
+from brain.bridges import BridgeIntervals
+from eye.reckoning import extrapolate
+
 class PredictiveEngine:
     """
     The Probabilistic Future.
@@ -8,20 +14,89 @@ class PredictiveEngine:
     """
     def __init__(self):
         self.future_log = []
+        self._bridges = None # (history timeline, forecast BridgeIntervals)
+        self._mirror = None # (history ships list, mirror_index arrays)
+
+    def bridge_index(self, history_data: dict):
+        """
+        Forecast bridge windows: the history's merged OPEN intervals, mirrored +24h
+        (Future(t) = History(t - 24h)). Rebuilt only when the history timeline changes.
+        """
+        timeline = (history_data or {}).get("timeline") or []
+        if self._bridges is None or self._bridges[0] is not timeline:
+            self._bridges = (timeline, BridgeIntervals.from_timeline(timeline).shifted(86400))
+        return self._bridges[1]
+
+    def mirror_index(self, history_data: dict):
+        """
+        The history's ship paths as flat arrays, sorted by (ship, ts): each ship's
+        points occupy their own band of a single key (ship * span + ts - t0), so one
+        searchsorted brackets any number of times for every ship at once.
+        Rebuilt only when the history ships list changes.
+        """
+        ships = (history_data or {}).get("ships") or []
+        if self._mirror is None or self._mirror[0] is not ships:
+            tracks = [s for s in ships if len(s.get("path") or []) >= 2]
+            ts = np.array([p["ts"] for s in tracks for p in s["path"]], dtype=np.float64)
+            lat = np.array([p["lat"] for s in tracks for p in s["path"]], dtype=np.float64)
+            lng = np.array([p["lng"] for s in tracks for p in s["path"]], dtype=np.float64)
+            ship = np.repeat(np.arange(len(tracks)), [len(s["path"]) for s in tracks])
+            t0 = float(ts.min()) if len(ts) else 0.0
+            span = (float(ts.max()) - t0 + 1.0) if len(ts) else 1.0
+            key = ship * span + (ts - t0)
+            order = np.argsort(key, kind="stable")
+            offsets = np.concatenate(([0], np.cumsum([len(s["path"]) for s in tracks]))).astype(np.int64)
+            meta = [{
+                "id": f"FUT_{s.get('id', 'ship')}",
+                "name": f"PRED: {s.get('name', 'Vessel')}",
+                "type": s.get("type", "Unknown"),
+                "imo": s.get("imo", "FUTURE")
+            } for s in tracks]
+            self._mirror = (ships, {"t0": t0, "span": span, "key": key[order], "ts": ts[order],
+                                    "lat": lat[order], "lng": lng[order], "offsets": offsets, "meta": meta})
+        return self._mirror[1]
+
+    def mirror_positions(self, history_data: dict, times):
+        """
+        Every mirrored ship at every history time in `times` (binary search + linear
+        interpolation): -> lat, lng [T, ships], NaN where the ship's path does not cover t.
+        """
+        index = self.mirror_index(history_data)
+        times = np.asarray(times, dtype=np.float64)
+        n_ships = len(index["meta"])
+        if not n_ships:
+            empty = np.full((len(times), 0), np.nan)
+            return empty, empty.copy()
+        start, end = index["offsets"][:-1], index["offsets"][1:]
+        pt_ts = index["ts"]
+        query = np.arange(n_ships)[None, :] * index["span"] + (times[:, None] - index["t0"])
+        # Segment ending at the first point at or after t (per ship band), as the path walk
+        # bracketed: on a repeated sample time that is the first of the repeats
+        hi = np.searchsorted(index["key"], query, side="left")
+        first = times[:, None] == pt_ts[start]  # On the path's first sample: its first segment
+        lo = np.where(first, start, hi - 1)
+        hi = np.where(first, start + 1, hi)
+        valid = (lo >= start) & (times[:, None] <= pt_ts[end - 1])  # Inside the ship's path
+        lo = np.where(valid, lo, 0)
+        hi = np.where(valid, hi, 0)
 
-    def predict_24h_future(self, current_state: dict, history_data: dict = None):
+        t_lo = pt_ts[lo]
+        dt = pt_ts[hi] - t_lo
+        ratio = np.where(dt > 0, (times[:, None] - t_lo) / np.where(dt > 0, dt, 1.0), 0.0)
+        lat = index["lat"][lo] + (index["lat"][hi] - index["lat"][lo]) * ratio
+        lng = index["lng"][lo] + (index["lng"][hi] - index["lng"][lo]) * ratio
+        lat[~valid] = np.nan
+        lng[~valid] = np.nan
+        return lat, lng
+
+    def predict_24h_future(self, current_state: dict, history_data: dict = None, step_s: int = 3600):
         """
         Generates a 24-hour forecast by MIRRORING the last 24 hours of history.
         This ensures realistic ship movements and traffic density.
+        One frame every step_s seconds (3600 = hourly, 60 = per minute).
         """
         now = datetime.now()
         timeline = []
-        events = []
-        
-        # Savings Accumulator
-        total_money_saved = 0
-        total_co2_saved = 0
-        total_trucks_affected = 0
         
         # We need to map history timestamps to future timestamps
         # History: [Start (-24h) ... End (Now)]
@@ -32,62 +107,26 @@ class PredictiveEngine:
             # Fallback if no history (should not happen in prod)
             return self._generate_fallback_prediction(now)
 
-        # 1. Pre-process Ships from Mirror
-        # We need to know which ships are active at each Future Hour
-        # The history data 'ships' list contains full paths.
-        mirror_ships = history_data.get('ships', [])
-        
-        # 2. Build Hourly Snapshots
-        for i in range(24):
-            future_time = now + timedelta(hours=i)
-            # Corresponding historical time (24h ago)
-            mirror_time_ts = (future_time - timedelta(hours=24)).timestamp()
-            
-            # A. Extract Ships active at this mirror time
-            current_frame_ships = []
-            
-            # Debug log to console (will show in terminal)
-            # print(f"Predicting Hour {i}, Mirror Time: {datetime.fromtimestamp(mirror_time_ts)}")
+        forecast_bridges = self.bridge_index(history_data)
 
-            for ship in mirror_ships:
-                path = ship.get('path', [])
-                # Robust check: Path must exist and have points
-                if not path or len(path) < 2: 
-                    continue
-                
-                # We simply find the segment that covers 'mirror_time_ts'
-                # Path points sorted by ts? assume yes from history engine.
-                
-                # Check if ship is active in this timeframe
-                # If the ship started AFTER the mirror time, or ended BEFORE it, skip.
-                if mirror_time_ts < path[0]['ts'] or mirror_time_ts > path[-1]['ts']:
-                    continue
+        # 1. Mirror Projection: all frames, all ships in one pass
+        now_ts = now.timestamp()
+        offsets = np.arange(int(86400 // step_s)) * float(step_s)
+        frame_lat, frame_lng = self.mirror_positions(history_data, now_ts + offsets - 86400)
+        meta = self.mirror_index(history_data)["meta"]
+        frame_bridges = forecast_bridges.states_at(now_ts + offsets)
 
-                for k in range(len(path) - 1):
-                    p1 = path[k]
-                    p2 = path[k+1]
-                    if p1['ts'] <= mirror_time_ts <= p2['ts']:
-                        # INTERPOLATION
-                        duration = p2['ts'] - p1['ts']
-                        if duration <= 0: continue
-                        
-                        ratio = (mirror_time_ts - p1['ts']) / duration
-                        lat = p1['lat'] + (p2['lat'] - p1['lat']) * ratio
-                        lng = p1['lng'] + (p2['lng'] - p1['lng']) * ratio
-                        
-                        # FORCE VISIBILITY check?
-                        # No, just add it.
-                        
-                        current_frame_ships.append({
-                            "id": f"FUT_{ship.get('id', 'ship')}", 
-                            "name": f"PRED: {ship.get('name', 'Vessel')}",
-                            "type": ship.get('type', 'Unknown'),
-                            "lat": lat,
-                            "lng": lng,
-                            "status": "PREDICTED_UNDERWAY",
-                            "imo": ship.get('imo', 'FUTURE')
-                        })
-                        break
+        # 2. Build Snapshots
+        for i, offset in enumerate(offsets.tolist()):
+            future_time = datetime.fromtimestamp(now_ts + offset)
+            active = ~np.isnan(frame_lat[i])
+            current_frame_ships = [{
+                **meta[k],
+                "lat": lat,
+                "lng": lng,
+                "status": "PREDICTED_UNDERWAY"
+            } for k, lat, lng in zip(np.flatnonzero(active).tolist(),
+                                     frame_lat[i][active].tolist(), frame_lng[i][active].tolist())]
             
             # --- FALLBACK INJECTION ---
             if len(current_frame_ships) < 2:
@@ -101,8 +140,8 @@ class PredictiveEngine:
                     "status": "PREDICTED_MOORED"
                 })
                  
-                # 2. Moving Tanker (West -> East)
-                prog = (i % 12) / 12.0
+                # 2. Moving Tanker (West -> East, one crossing per 12h)
+                prog = ((offset / 3600) % 12) / 12.0
                 current_frame_ships.append({
                     "id": "PRED_MOVING",
                     "name": "PREDICTED: HACKATHON EXPRESS",
@@ -112,15 +151,13 @@ class PredictiveEngine:
                     "status": "PREDICTED_UNDERWAY"
                 })
 
-            # B. Environment (Mirror or randomize slightly)
-            density = 30 + (i * 2) if i < 12 else 80 - (i*2) # Simple curve if no history env
-            # Keep it simple: Low night, High day
+            # B. Environment: Low night, High day
             hour = future_time.hour
             if 6 <= hour <= 18: density = random.randint(50, 90)
             else: density = random.randint(10, 40)
             
             weather = "CLEAR"
-            bridges = {"RETHE": "CLOSED", "KATTWYK": "CLOSED"}
+            bridges = {"RETHE": "CLOSED", "KATTWYK": "CLOSED", **frame_bridges[i]}
             
             timeline.append({
                 "ts": future_time.timestamp(),
@@ -135,7 +172,9 @@ class PredictiveEngine:
         return {
             "timestamp": now.isoformat(),
             "prediction_window": "24h",
+            "step_s": step_s,
             "timeline": timeline,
+            "bridge_windows": forecast_bridges.summary(now_ts, now_ts + 86400),
             "events": [
                 {"time": "12:00", "type": "INFO", "description": "Based on mirrored historical patterns (T-24h)."}
             ],
@@ -146,6 +185,39 @@ class PredictiveEngine:
             }
         }
 
+    def predict_short_horizon(self, current_state: dict, horizons_s=(60, 300, 600)):
+        """
+        Short-horizon projection of the LIVE fleet (dead reckoning from last AIS report).
+        One vectorized pass per horizon over all ships with a known speed/course.
+        """
+        ships = [s for s in current_state.get("visual_truth", {}).get("ships", [])
+                 if "sog" in s and "cog" in s and "last_seen" in s]
+        now = time.time()
+        frames = []
+        for horizon in horizons_s:
+            if ships:
+                lat, lng, confidence = extrapolate(
+                    [s["lat"] for s in ships], [s["lng"] for s in ships],
+                    [s["sog"] for s in ships], [s["cog"] for s in ships],
+                    # Eye positions are already projected to position_ts; age counts from the report
+                    [now + horizon - s.get("position_ts", s["last_seen"]) for s in ships],
+                    max_dt_s=max(horizons_s) + 600,
+                    age_s=[now + horizon - s["last_seen"] for s in ships]
+                )
+            frames.append({
+                "ts": now + horizon,
+                "horizon_s": horizon,
+                "ships": [{
+                    "id": s.get("id"),
+                    "mmsi": s.get("mmsi"),
+                    "lat": float(lat[k]),
+                    "lng": float(lng[k]),
+                    "confidence": round(float(confidence[k]), 3),
+                    "status": "PROJECTED"
+                } for k, s in enumerate(ships)]
+            })
+        return {"timestamp": datetime.now().isoformat(), "frames": frames}
+
     def _generate_fallback_prediction(self, now):
         """
         Generates a purely synthetic prediction if history is unavailable.
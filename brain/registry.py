@@ -0,0 +1,289 @@
+"""
+VESSEL REGISTRY: Multi-key index over vessel master data.
+Sources: REAL_VESSELS, plus an optional master-data file (VESSEL_REGISTRY env or
+path argument: .jsonl / .json / .csv, streamed, any size; rows need at least
+name and one of imo/mmsi/callsign; later rows win on key clashes).
+
+INDEXES (built once at load):
+- hash: IMO, MMSI, callsign, normalized name -> row
+- prefix: sorted (word-start suffix of each normalized name, row) pairs, so
+  "TRIUMPH" and "ONE TRI" both find "ONE TRIUMPH" with two bisects
+- fuzzy: trigram -> postings (row ids); a query's candidates are scored by
+  trigram Jaccard in one bincount, so typos and scraped variants still match
+"""
+import bisect
+import csv
+import itertools
+import json
+import math
+import os
+import re
+import sys
+import time
+import unicodedata
+
+import numpy as np
+
+from brain.history import REAL_VESSELS
+
+KEY_FIELDS = ("imo", "mmsi", "callsign")
+DETAIL_FIELDS = ("name", "imo", "mmsi", "callsign", "flag", "type", "subtype", "built", "length_m", "beam_m",
+                 "draft_m", "gross_tonnage", "dwt", "teu", "passengers", "operator", "speed_kn")
+NUMERIC_FIELDS = ("built", "length_m", "beam_m", "draft_m", "gross_tonnage", "dwt", "teu", "passengers", "speed_kn")
+FUZZY_MIN = 0.3      # Trigram Jaccard below this is not a match
+RESOLVE_MIN = 0.55   # Whole-name trigram Jaccard needed to tie a scraped name to a registry vessel
+RESOLVE_MARGIN = 0.1 # Runner-up this close to the best: ambiguous, not resolved
+
+_TAGS = re.compile(r"[\(\[].*?[\)\]]")  # "IJSSELDELTA (DREDGER)", "X [AI_INFERRED_ARCHIVE]"
+_NON_ALNUM = re.compile(r"[^A-Z0-9]+")
+
+
+def normalize(name):
+    """Upper-case ASCII words: accents folded, tags and punctuation dropped."""
+    text = unicodedata.normalize("NFKD", str(name)).encode("ascii", "ignore").decode("ascii").upper()
+    return _NON_ALNUM.sub(" ", _TAGS.sub(" ", text)).strip()
+
+
+def trigrams(norm):
+    padded = f"  {norm} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def read_master_data(path):
+    """Streams vessel rows (dicts) from a .jsonl, .json (list) or .csv file."""
+    if path.endswith(".csv"):
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+    elif path.endswith(".jsonl"):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            yield from json.load(f)
+
+
+class VesselRegistry:
+    """
+    Vessel master data with exact, prefix and fuzzy lookups.
+    lookup() is the exact path (/vessel/{identifier}); search() ranks
+    autocomplete candidates; resolve() ties a scraped name to one vessel.
+    """
+    def __init__(self, path=None):
+        t0 = time.perf_counter()
+        self.path = path if path is not None else os.getenv("VESSEL_REGISTRY")
+        self.vessels = []
+        self.names = []            # Normalized name per row
+        self.keys = {field: {} for field in KEY_FIELDS}
+        self.by_name = {}
+
+        rows = list(REAL_VESSELS)
+        if self.path:
+            rows = itertools.chain(rows, read_master_data(self.path))
+        for row in rows:
+            self._add(row)
+        self._build_search()
+        self.load_ms = round((time.perf_counter() - t0) * 1000, 1)
+        print(f"REGISTRY: {len(self.vessels)} vessels indexed ({self.load_ms}ms)")
+
+    def _add(self, row):
+        name = normalize(row.get("name", ""))
+        if not name:
+            return
+        vessel = {field: row[field] for field in DETAIL_FIELDS if row.get(field) not in (None, "")}
+        for field in NUMERIC_FIELDS:
+            if isinstance(vessel.get(field), str):
+                try:
+                    vessel[field] = float(vessel[field]) if "." in vessel[field] else int(vessel[field])
+                except ValueError:
+                    del vessel[field]
+        i = len(self.vessels)
+        self.vessels.append(vessel)
+        self.names.append(name)
+        for field in KEY_FIELDS:
+            key = str(vessel.get(field, "")).strip().upper()
+            if key:
+                self.keys[field][key] = i
+        self.by_name[name] = i
+
+    def _build_search(self):
+        # Prefix index: every word start of every name
+        pairs = []
+        for i, name in enumerate(self.names):
+            pairs.append((name, i))
+            pairs.extend((name[m.end():], i) for m in re.finditer(" ", name))
+        pairs.sort()
+        self._prefix_keys = [p[0] for p in pairs]
+        self._prefix_rows = [p[1] for p in pairs]
+
+        # Trigram postings
+        postings = {}
+        gram_count = np.empty(len(self.names), dtype=np.int32)
+        for i, name in enumerate(self.names):
+            grams = trigrams(name)
+            gram_count[i] = len(grams)
+            for g in grams:
+                postings.setdefault(g, []).append(i)
+        self._postings = {g: np.asarray(rows, dtype=np.int32) for g, rows in postings.items()}
+        self._gram_count = gram_count
+
+    # --- EXACT ---
+    def lookup(self, identifier):
+        """Row index by IMO, MMSI, callsign or (normalized) name, or None."""
+        key = str(identifier).strip().upper()
+        for field in KEY_FIELDS:
+            i = self.keys[field].get(key)
+            if i is not None:
+                return i
+        return self.by_name.get(normalize(identifier))
+
+    def details(self, identifier):
+        """/vessel/{identifier} payload, or None."""
+        i = self.lookup(identifier)
+        if i is None:
+            return None
+        v = self.vessels[i]
+        return {
+            "name": v["name"],
+            "imo": v.get("imo", ""),
+            "mmsi": v.get("mmsi", ""),
+            "callsign": v.get("callsign", ""),
+            "flag": v.get("flag", ""),
+            "type": v.get("type", ""),
+            "subtype": v.get("subtype", ""),
+            "built": v.get("built", 0),
+            "dimensions": {
+                "length_m": v.get("length_m", 0),
+                "beam_m": v.get("beam_m", 0),
+                "draft_m": v.get("draft_m", 0),
+            },
+            "tonnage": {
+                "gross": v.get("gross_tonnage", 0),
+                "deadweight": v.get("dwt", 0),
+            },
+            "capacity": {
+                "teu": v.get("teu", 0),
+                "passengers": v.get("passengers", 0),
+            },
+            "operator": v.get("operator", ""),
+            "speed_kn": v.get("speed_kn", 0),
+        }
+
+    # --- SEARCH ---
+    def _prefix(self, norm, limit):
+        """Rows with a word starting with norm -> {row: score}; whole-name prefixes rank higher."""
+        lo = bisect.bisect_left(self._prefix_keys, norm)
+        hi = bisect.bisect_left(self._prefix_keys, norm + "\x7f", lo)
+        scores = {}
+        for k in range(lo, min(hi, lo + limit * 8)):
+            i = self._prefix_rows[k]
+            name = self.names[i]
+            score = (1.5 if name.startswith(norm) else 1.2) + len(norm) / max(len(name), 1) * 0.3
+            if score > scores.get(i, 0.0):
+                scores[i] = score
+        return scores
+
+    def _fuzzy(self, norm, limit):
+        """Rows sharing trigrams with norm -> {row: Jaccard} (>= FUZZY_MIN)."""
+        query = trigrams(norm)
+        grams = [self._postings[g] for g in query if g in self._postings]
+        if not grams:
+            return {}
+        shared = np.bincount(np.concatenate(grams), minlength=len(self.names))
+        # Jaccard <= shared / len(query): rows below this can't reach FUZZY_MIN
+        candidates = np.flatnonzero(shared >= max(1, math.ceil(FUZZY_MIN * len(query))))
+        hits = shared[candidates]
+        jaccard = hits / (len(query) + self._gram_count[candidates] - hits)
+        keep = jaccard >= FUZZY_MIN
+        candidates, jaccard = candidates[keep], jaccard[keep]
+        if len(candidates) > limit:
+            top = np.argpartition(-jaccard, limit)[:limit]
+            candidates, jaccard = candidates[top], jaccard[top]
+        return dict(zip(candidates.tolist(), jaccard.tolist()))
+
+    def _rank(self, query, limit):
+        """[(row, score, match kind)], best first."""
+        norm = normalize(query)
+        if not norm:
+            return []
+        scores = {}
+        matches = {}
+        exact = self.lookup(query)
+        if exact is not None:
+            scores[exact] = 3.0
+            matches[exact] = "exact"
+        prefix = self._prefix(norm, limit)
+        # Fuzzy only fills up: a full page of prefix hits always outranks it
+        fuzzy = self._fuzzy(norm, limit) if len(prefix) < limit else {}
+        for kind, found in (("prefix", prefix), ("fuzzy", fuzzy)):
+            for i, score in found.items():
+                if score > scores.get(i, 0.0):
+                    scores[i] = score
+                    matches[i] = kind
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], self.names[kv[0]]))[:limit]
+        return [(i, score, matches[i]) for i, score in ranked]
+
+    def search(self, query, limit=10):
+        """
+        Ranked autocomplete matches: [{name, imo, mmsi, callsign, type, score, match}].
+        Exact key (IMO/MMSI/callsign/name) > name prefix > word prefix > fuzzy.
+        """
+        out = []
+        for i, score, match in self._rank(query, limit):
+            v = self.vessels[i]
+            out.append({
+                "name": v["name"],
+                "imo": v.get("imo", ""),
+                "mmsi": v.get("mmsi", ""),
+                "callsign": v.get("callsign", ""),
+                "type": v.get("type", ""),
+                "score": round(score, 3),
+                "match": match
+            })
+        return out
+
+    def resolve(self, name):
+        """
+        Registry vessel for a scraped/free-text name (master data dict), or None.
+        Only an exact key/name hit or a whole-name trigram match resolves; a
+        word prefix ("MSC", "MAERSK") is autocomplete, not identity, and a
+        runner-up within RESOLVE_MARGIN of the best leaves the name unresolved.
+        """
+        exact = self.lookup(name)
+        if exact is not None:
+            return self.vessels[exact]
+        norm = normalize(name)
+        if not norm:
+            return None
+        prefix = sorted(self._prefix(norm, 2).values(), reverse=True)
+        if len(prefix) > 1 and prefix[0] - prefix[1] < RESOLVE_MARGIN:
+            return None
+        fuzzy = sorted(self._fuzzy(norm, 2).items(), key=lambda kv: -kv[1])
+        if not fuzzy or fuzzy[0][1] < RESOLVE_MIN:
+            return None
+        if len(fuzzy) > 1 and fuzzy[0][1] - fuzzy[1][1] < RESOLVE_MARGIN:
+            return None
+        return self.vessels[fuzzy[0][0]]
+
+    def stats(self):
+        return {
+            "vessels": len(self.vessels),
+            "source": self.path or "REAL_VESSELS",
+            "prefix_keys": len(self._prefix_keys),
+            "trigrams": len(self._postings),
+            "load_ms": self.load_ms
+        }
+
+
+if __name__ == "__main__":
+    # Usage: python -m brain.registry [master_data.jsonl] "query" ...
+    args = sys.argv[1:]
+    path = args.pop(0) if args and os.path.exists(args[0]) else None
+    reg = VesselRegistry(path)
+    for q in args:
+        t0 = time.perf_counter()
+        hits = reg.search(q)
+        print(f"{q!r}: {(time.perf_counter() - t0) * 1000:.3f}ms")
+        for hit in hits:
+            print(f"   {hit['score']:.3f} {hit['match']:<6} {hit['name']} (IMO {hit['imo']})")
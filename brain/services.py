@@ -0,0 +1,13 @@
+from shared.services import ServiceRegistry
+
+# The Brain's lazy singletons (separate from the Eye's registry: eye.services)
+services = ServiceRegistry()
+
+# Brain services by path, imported on first get(). The router (/route) is the
+# Eye's channel graph, loaded in this process only when a route is requested
+PROVIDERS = {
+    "registry": "brain.registry:VesselRegistry",
+    "router": "eye.routing:build_router",
+}
+for _name, _path in PROVIDERS.items():
+    services.register(_name, _path)
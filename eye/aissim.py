@@ -0,0 +1,249 @@
+"""
+AIS STAND-IN: Local AisStream-compatible websocket server.
+Synthesizes PositionReport traffic from the Historian's path model
+(REAL_VESSELS + ELBE_MAIN + TERMINAL_APPROACHES + PATROL_ZONES), so the Eye's
+ingestion and perception path can be load-tested without network or API key.
+
+Usage:
+    python -m eye.aissim --vessels 2000 --rate 5000 --port 8765
+    AISSTREAM_URL=ws://127.0.0.1:8765 python -m uvicorn eye.main:app --port 8001
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import websockets
+
+from brain.history import REAL_VESSELS, TERMINAL_APPROACHES, PATROL_ZONES, get_full_path
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("EYE.AISSIM")
+
+KNOT_MS = 0.514444
+M_PER_DEG_LAT = 111320.0
+
+
+def in_boxes(lat, lng, boxes):
+    """Mask of positions inside any AisStream bounding box [[lat, lng], [lat, lng]]."""
+    keep = np.zeros(len(lat), dtype=bool)
+    for (lat0, lng0), (lat1, lng1) in boxes:
+        keep |= ((lat >= min(lat0, lat1)) & (lat <= max(lat0, lat1)) &
+                 (lng >= min(lng0, lng1)) & (lng <= max(lng0, lng1)))
+    return keep
+
+
+class _Route:
+    """Polyline with cumulative metric length (for speed-true interpolation)."""
+    def __init__(self, points):
+        pts = np.asarray(points, dtype=np.float64)
+        self.lat = pts[:, 0]
+        self.lng = pts[:, 1]
+        coslat = np.cos(np.radians(self.lat.mean()))
+        d = np.hypot(np.diff(self.lat) * M_PER_DEG_LAT, np.diff(self.lng) * M_PER_DEG_LAT * coslat)
+        self.cum = np.concatenate(([0.0], np.cumsum(d)))
+        self.length = max(self.cum[-1], 1.0)
+        # Course over ground per segment (degrees from north)
+        self.cog = (np.degrees(np.arctan2(np.diff(self.lng) * coslat, np.diff(self.lat))) + 360.0) % 360.0
+
+    def locate(self, dist):
+        """Vectorized: distance along route (m) -> lat, lng, cog."""
+        dist = np.mod(dist, self.length)
+        seg = np.clip(np.searchsorted(self.cum, dist, side="right") - 1, 0, len(self.cum) - 2)
+        seg_len = np.maximum(self.cum[seg + 1] - self.cum[seg], 1e-9)
+        t = (dist - self.cum[seg]) / seg_len
+        lat = self.lat[seg] + t * (self.lat[seg + 1] - self.lat[seg])
+        lng = self.lng[seg] + t * (self.lng[seg + 1] - self.lng[seg])
+        return lat, lng, self.cog[seg]
+
+
+def _build_routes():
+    routes = {}
+    for terminal in TERMINAL_APPROACHES:
+        routes[("ARRIVAL", terminal)] = _Route(get_full_path(terminal, "ARRIVAL"))
+        routes[("DEPARTURE", terminal)] = _Route(get_full_path(terminal, "DEPARTURE"))
+    for zone, path in PATROL_ZONES.items():
+        routes[("PATROL", zone)] = _Route(path)
+    return routes
+
+
+class SyntheticFleet:
+    """
+    N synthetic vessels cloned from REAL_VESSELS templates.
+    The first len(REAL_VESSELS) keep their real MMSI/name; clones get
+    synthetic MMSIs and a spread-out start offset along the same route.
+    """
+    def __init__(self, size=500, seed=42):
+        rng = np.random.default_rng(seed)
+        self.routes = _build_routes()
+        self.route_keys = list(self.routes.keys())
+        route_index = {k: i for i, k in enumerate(self.route_keys)}
+
+        self.size = size
+        self.mmsi = np.empty(size, dtype=np.int64)
+        self.names = []
+        self.route = np.empty(size, dtype=np.int64)
+        self.speed_ms = np.empty(size, dtype=np.float64)
+        self.offset_m = np.empty(size, dtype=np.float64)
+
+        for i in range(size):
+            template = REAL_VESSELS[i % len(REAL_VESSELS)]
+            clone = i // len(REAL_VESSELS)
+            schedule = template.get("schedule", {})
+            event = schedule.get("event", "ARRIVAL")
+            if event in ("PATROL", "DREDGING"):
+                key = ("PATROL", schedule.get("zone", "CTB_AREA"))
+            else:
+                key = (event, schedule.get("terminal", "MULTI"))
+
+            self.route[i] = route_index[key]
+            self.mmsi[i] = int(template["mmsi"]) if clone == 0 else 200000000 + i
+            self.names.append(template["name"] if clone == 0 else f"{template['name']} {clone}")
+            self.speed_ms[i] = max(template.get("speed_kn", 10), 1) * KNOT_MS * rng.uniform(0.85, 1.15)
+            self.offset_m[i] = rng.uniform(0, self.routes[key].length)
+
+    def positions(self, idx, t):
+        """Vectorized positions for vessel indices idx at sim time t (s)."""
+        lat = np.empty(len(idx))
+        lng = np.empty(len(idx))
+        cog = np.empty(len(idx))
+        route_ids = self.route[idx]
+        for r in np.unique(route_ids):
+            mask = route_ids == r
+            sel = idx[mask]
+            lat[mask], lng[mask], cog[mask] = self.routes[self.route_keys[r]].locate(
+                self.offset_m[sel] + self.speed_ms[sel] * t
+            )
+        return lat, lng, cog
+
+    def frames(self, idx, t, boxes=None):
+        """Encodes frames for vessel indices idx at sim time t (vessels outside `boxes` are skipped)."""
+        lat, lng, cog = self.positions(idx, t)
+        if boxes:
+            keep = in_boxes(lat, lng, boxes)
+            idx, lat, lng, cog = idx[keep], lat[keep], lng[keep], cog[keep]
+        return self.encode(idx, lat, lng, cog)
+
+    def encode(self, idx, lat, lng, cog):
+        """Encodes AisStream-shaped PositionReport frames for vessel indices idx at the given positions."""
+        sog = self.speed_ms[idx] / KNOT_MS
+        time_utc = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f +0000 UTC")
+        out = []
+        for j in range(len(idx)):
+            i = int(idx[j])
+            mmsi = int(self.mmsi[i])
+            out.append(json.dumps({
+                "MessageType": "PositionReport",
+                "MetaData": {
+                    "MMSI": mmsi,
+                    "ShipName": self.names[i],
+                    "latitude": float(lat[j]),
+                    "longitude": float(lng[j]),
+                    "time_utc": time_utc
+                },
+                "Message": {
+                    "PositionReport": {
+                        "UserID": mmsi,
+                        "Latitude": float(lat[j]),
+                        "Longitude": float(lng[j]),
+                        "Sog": round(float(sog[j]), 1),
+                        "Cog": round(float(cog[j]), 1),
+                        "TrueHeading": int(cog[j]) % 360,
+                        "NavigationalStatus": 0
+                    }
+                }
+            }))
+        return out
+
+
+class AisStandIn:
+    """
+    Serves the AisStream subscribe/stream protocol for a SyntheticFleet.
+    Like AisStream, only vessels inside the subscription boxes report: each tick
+    samples per_tick reports round-robin among the vessels currently inside, so
+    the delivered rate matches `rate` even when most of the fleet is out of the box.
+    """
+    def __init__(self, fleet, rate=1000, tick_hz=10, time_scale=1.0, report_every_s=10.0):
+        self.fleet = fleet
+        self.rate = rate              # PositionReports per second (per client)
+        self.tick_hz = tick_hz
+        self.time_scale = time_scale  # Sim seconds per wall second
+        self.report_every_s = report_every_s
+        self.start = time.time()
+
+    def tick(self, pool, boxes, t, cursor, per_tick):
+        """One tick's frames: per_tick reports from the pool vessels inside `boxes` at sim time t. Returns (frames, cursor, inside)."""
+        lat, lng, cog = self.fleet.positions(pool, t)
+        inside = np.flatnonzero(in_boxes(lat, lng, boxes)) if boxes else np.arange(len(pool))
+        if not len(inside):
+            return [], cursor, 0
+        pick = inside[(cursor + np.arange(per_tick)) % len(inside)]
+        frames = self.fleet.encode(pool[pick], lat[pick], lng[pick], cog[pick])
+        return frames, (cursor + per_tick) % len(inside), len(inside)
+
+    async def handler(self, websocket):
+        try:
+            subscribe = json.loads(await websocket.recv())
+        except Exception:
+            await websocket.close(code=1008, reason="Expected subscribe message")
+            return
+        if "APIKey" not in subscribe or "BoundingBoxes" not in subscribe:
+            await websocket.send(json.dumps({"error": "Api Key and BoundingBoxes are required"}))
+            await websocket.close()
+            return
+
+        boxes = subscribe.get("BoundingBoxes") or None
+        mmsi_filter = set(int(m) for m in subscribe.get("FiltersShipMMSI") or [])
+        pool = np.arange(self.fleet.size)
+        if mmsi_filter:
+            pool = pool[np.isin(self.fleet.mmsi, list(mmsi_filter))]
+        if not len(pool):
+            return
+
+        logger.info(f"AISSIM: Client subscribed ({len(pool)} vessels, {self.rate} msg/s)")
+        per_tick = max(1, int(self.rate / self.tick_hz))
+        cursor = 0
+        interval = 1.0 / self.tick_hz
+        next_tick = time.perf_counter()
+        report_start, delivered = next_tick, 0
+        try:
+            while True:
+                t = (time.time() - self.start) * self.time_scale
+                frames, cursor, inside = self.tick(pool, boxes, t, cursor, per_tick)
+                for frame in frames:
+                    await websocket.send(frame)
+                delivered += len(frames)
+
+                elapsed = time.perf_counter() - report_start
+                if elapsed >= self.report_every_s:
+                    logger.info(f"AISSIM: Delivered {delivered / elapsed:.0f} msg/s (target {self.rate}, "
+                                f"{inside}/{len(pool)} vessels in the box)")
+                    report_start, delivered = time.perf_counter(), 0
+
+                next_tick += interval
+                await asyncio.sleep(max(0.0, next_tick - time.perf_counter()))
+        except websockets.ConnectionClosed:
+            logger.info("AISSIM: Client disconnected")
+
+
+async def serve(host, port, fleet_size, rate, tick_hz, time_scale):
+    fleet = SyntheticFleet(size=fleet_size)
+    stand_in = AisStandIn(fleet, rate=rate, tick_hz=tick_hz, time_scale=time_scale)
+    async with websockets.serve(stand_in.handler, host, port, max_queue=None):
+        logger.info(f"AISSIM: Serving {fleet_size} synthetic vessels on ws://{host}:{port}")
+        await asyncio.Future()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local AisStream stand-in (synthetic Elbe traffic)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--vessels", type=int, default=500, help="Fleet size")
+    parser.add_argument("--rate", type=int, default=1000, help="PositionReports per second per client")
+    parser.add_argument("--tick-hz", type=int, default=10)
+    parser.add_argument("--time-scale", type=float, default=1.0, help="Sim seconds per wall second")
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port, args.vessels, args.rate, args.tick_hz, args.time_scale))
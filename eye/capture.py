@@ -0,0 +1,184 @@
+import asyncio
+import gzip
+import logging
+import queue
+import sys
+import threading
+import time
+import zlib
+
+logger = logging.getLogger("EYE.CAPTURE")
+
+_CLOSE = object()
+
+
+class CaptureWriter:
+    """
+    AIS Flight Recorder.
+    Tees every raw AisStream frame into an append-only gzip log.
+
+    FORMAT (one record per line, after decompression):
+        <receive_unix_ts>\t<raw frame JSON>
+    Re-opening an existing file appends a new gzip member, which gzip readers
+    treat as one continuous stream.
+
+    write() only enqueues: compression and disk I/O run on a dedicated writer
+    thread, so a slow disk never stalls the socket reader. If the thread falls
+    more than maxsize frames behind, incoming frames are dropped (counted).
+    """
+    def __init__(self, path, flush_interval=1.0, maxsize=100000):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.frames = 0
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._file = gzip.open(path, "at", encoding="utf-8", newline="\n", compresslevel=6)
+        self._thread = threading.Thread(target=self._run, name="ais-capture", daemon=True)
+        self._thread.start()
+        logger.info(f"CAPTURE: Recording raw AIS frames to {path}")
+
+    def write(self, frame, ts=None):
+        """Queues one frame for the writer thread. Never blocks."""
+        try:
+            self._queue.put_nowait((time.time() if ts is None else ts, frame))
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        last_flush = time.time()
+        pending = False
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = None  # Idle: flush what is buffered
+            if item is _CLOSE:
+                break
+            if item is not None:
+                ts, frame = item
+                if isinstance(frame, bytes):
+                    frame = frame.decode("utf-8", errors="replace")
+                # Newlines in valid JSON are only ever whitespace, so this is lossless
+                self._file.write(f"{ts:.6f}\t{frame.replace(chr(10), ' ')}\n")
+                self.frames += 1
+                pending = True
+            now = time.time()
+            if pending and now - last_flush >= self.flush_interval:
+                self._file.flush()
+                last_flush = now
+                pending = False
+        self._file.close()
+
+    def close(self):
+        """Drains queued frames and writes the gzip trailer. Without it the last member is truncated (replay stops there)."""
+        if self._thread.is_alive():
+            self._queue.put(_CLOSE)
+            self._thread.join()
+            logger.info(f"CAPTURE: Closed {self.path} ({self.frames} frames, {self.dropped} dropped)")
+
+
+def read_capture(path):
+    """
+    Yields (ts, frame) tuples from a capture file, in recorded order.
+    A truncated trailing member (writer killed before close()) ends the replay
+    after its last complete line instead of raising. Records are split on "\n"
+    only: a stray "\r" inside a frame does not end the record.
+    """
+    with gzip.open(path, "rt", encoding="utf-8", newline="\n") as f:
+        try:
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # Cut off mid-record
+                line = line.rstrip("\n")
+                if not line:
+                    continue
+                ts, frame = line.split("\t", 1)
+                yield float(ts), frame
+        except (EOFError, gzip.BadGzipFile, zlib.error) as e:
+            logger.warning(f"CAPTURE: {path} is truncated, stopping at the last complete frame ({e})")
+
+
+class CaptureReplayer:
+    """
+    Time-Scaled Player.
+    Feeds a capture back through a submit() callable (the live ingest entry point).
+    speed: 1.0 = real time, 10.0 / 100.0 = accelerated, 0 = as fast as possible.
+
+    CLOCK: now() is the replayed time (capture time, advancing at `speed`; at
+    MAX speed, the time of the last submitted frame). The Eye stamps and ages
+    contacts with it during a replay, so TTL eviction and dead reckoning see
+    capture-time ages at any speed. Looped passes continue the clock forward.
+    """
+    def __init__(self, path, speed=1.0, loop=False, yield_every=1000):
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+        self.yield_every = yield_every
+        self.frames = 0
+        self._start_wall = None
+        self._start_ts = None   # Replayed time at the start of the current pass
+        self._last_ts = None    # Replayed time of the last submitted frame
+
+    def now(self):
+        if self._start_ts is None:
+            return time.time()
+        if not self.speed:
+            return self._last_ts
+        return self._start_ts + (time.perf_counter() - self._start_wall) * self.speed
+
+    async def replay(self, submit):
+        offset = 0.0  # Shifts looped passes so replayed time never runs backwards
+        while True:
+            logger.info(f"CAPTURE: Replaying {self.path} at {'MAX' if not self.speed else f'{self.speed}x'} speed")
+            start_wall = time.perf_counter()
+            start_ts = None
+            pending = 0
+
+            for ts, frame in read_capture(self.path):
+                if start_ts is None:
+                    start_ts = ts
+                    if self._last_ts is not None:
+                        offset = self._last_ts - ts
+                    self._start_wall, self._start_ts = start_wall, ts + offset
+
+                if self.speed:
+                    delay = (ts - start_ts) / self.speed - (time.perf_counter() - start_wall)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                        pending = 0
+
+                self._last_ts = ts + offset
+                submit(frame)
+                self.frames += 1
+                pending += 1
+                if pending >= self.yield_every:
+                    # Give the decode worker a chance to drain (same as a live burst)
+                    await asyncio.sleep(0)
+                    pending = 0
+
+            elapsed = time.perf_counter() - start_wall
+            logger.info(f"CAPTURE: Replay pass done ({self.frames} frames, {elapsed:.1f}s)")
+            if not self.loop:
+                return
+
+
+def summarize(path):
+    frames = 0
+    first = last = None
+    for ts, _ in read_capture(path):
+        frames += 1
+        first = ts if first is None else first
+        last = ts
+    duration = (last - first) if frames > 1 else 0.0
+    return {
+        "frames": frames,
+        "start": first,
+        "end": last,
+        "duration_s": round(duration, 3),
+        "avg_rate_hz": round(frames / duration, 1) if duration > 0 else None
+    }
+
+
+if __name__ == "__main__":
+    # Usage: python -m eye.capture <capture.ais.gz>
+    print(summarize(sys.argv[1]))
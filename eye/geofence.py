@@ -0,0 +1,118 @@
+import math
+
+import numpy as np
+
+EARTH_RADIUS_M = 6371008.8
+
+
+def haversine_m(lat1, lng1, lat2, lng2):
+    """Great-circle distance in meters (scalars or NumPy arrays)."""
+    p1 = np.radians(lat1)
+    p2 = np.radians(lat2)
+    dp = p2 - p1
+    dl = np.radians(np.asarray(lng2) - np.asarray(lng1))
+    a = np.sin(dp / 2) ** 2 + np.cos(p1) * np.cos(p2) * np.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+
+class GeofenceIndex:
+    """
+    Bridge/Lock Geofencing on a Uniform Grid.
+    Zones are static: they are registered once and rasterized into the grid cells
+    their circle touches. Each update buckets all vessel positions into cells in
+    one NumPy pass, so only vessels in zone-bearing cells get an exact (haversine)
+    distance test. Cost per update no longer scales with zones x ships.
+
+    GRID: local equirectangular meters around ref_lat; cell size >= largest radius.
+    """
+    def __init__(self, ref_lat=53.5, cell_m=None):
+        self.ref_lat = ref_lat
+        self._m_per_deg_lat = math.pi * EARTH_RADIUS_M / 180.0
+        self._m_per_deg_lng = self._m_per_deg_lat * math.cos(math.radians(ref_lat))
+        self.cell_m = cell_m
+        self.zones = {}          # name -> {"lat", "lng", "radius_m"}
+        self._cells = {}         # cell key -> [zone names]
+        self._cell_keys = np.zeros(0, dtype=np.int64)
+        self._version = None
+        self._hits = {}
+
+    # --- REGISTRATION (once) ---
+    def register(self, name, lat, lng, radius_m):
+        self.zones[name] = {"lat": lat, "lng": lng, "radius_m": float(radius_m)}
+        self._rebuild()
+
+    def register_many(self, zones):
+        """zones: {name: {"lat", "lng", "radius_m"}}"""
+        for name, z in zones.items():
+            self.zones[name] = {"lat": z["lat"], "lng": z["lng"], "radius_m": float(z["radius_m"])}
+        self._rebuild()
+
+    def _cell(self, x, y):
+        return np.floor(x / self.cell_m).astype(np.int64), np.floor(y / self.cell_m).astype(np.int64)
+
+    @staticmethod
+    def _key(cx, cy):
+        # Pack two signed cell coords into one int64
+        return (np.asarray(cx, dtype=np.int64) << 32) ^ (np.asarray(cy, dtype=np.int64) & 0xFFFFFFFF)
+
+    def _project(self, lat, lng):
+        return np.asarray(lng) * self._m_per_deg_lng, np.asarray(lat) * self._m_per_deg_lat
+
+    def _rebuild(self):
+        self._cells = {}
+        self._version = None
+        if not self.zones:  # Nothing to rasterize: every locate() is a miss
+            self._cell_keys = np.zeros(0, dtype=np.int64)
+            return
+        max_r = max(z["radius_m"] for z in self.zones.values())
+        if self.cell_m is None or self.cell_m < max_r:
+            self.cell_m = max_r
+        for name, z in self.zones.items():
+            x, y = self._project(z["lat"], z["lng"])
+            r = z["radius_m"]
+            cx0, cy0 = self._cell(x - r, y - r)
+            cx1, cy1 = self._cell(x + r, y + r)
+            for cx in range(int(cx0), int(cx1) + 1):
+                for cy in range(int(cy0), int(cy1) + 1):
+                    self._cells.setdefault(int(self._key(cx, cy)), []).append(name)
+        self._cell_keys = np.array(sorted(self._cells), dtype=np.int64)
+
+    # --- QUERIES ---
+    def locate(self, lat, lng):
+        """
+        Vectorized: which zone(s) contain each point.
+        Returns {zone name: array of point indices inside it}.
+        """
+        lat = np.asarray(lat, dtype=np.float64)
+        lng = np.asarray(lng, dtype=np.float64)
+        hits = {name: [] for name in self.zones}
+        if not len(lat) or not self._cells:
+            return {name: np.zeros(0, dtype=np.int64) for name in self.zones}
+
+        x, y = self._project(lat, lng)
+        keys = self._key(*self._cell(x, y))
+        candidates = np.flatnonzero(np.isin(keys, self._cell_keys))
+
+        if len(candidates):
+            cand_keys = keys[candidates]
+            for key in np.unique(cand_keys):
+                idx = candidates[cand_keys == key]
+                for name in self._cells[int(key)]:
+                    z = self.zones[name]
+                    d = haversine_m(lat[idx], lng[idx], z["lat"], z["lng"])
+                    hits[name].extend(idx[d <= z["radius_m"]].tolist())
+
+        return {name: np.unique(np.asarray(v, dtype=np.int64)) for name, v in hits.items()}
+
+    def occupancy(self, store, now=None):
+        """
+        Zone -> live VesselStore slots inside it, using dead-reckoned positions at `now`.
+        Recomputed only when the store or the perception timestamp changed.
+        """
+        key = (store.version, now)
+        if self._version != key:
+            slots, lat, lng, _ = store.project(now)
+            found = self.locate(lat, lng)
+            self._hits = {name: slots[idx] for name, idx in found.items()}
+            self._version = key
+        return self._hits
@@ -1,7 +1,291 @@
+import hashlib
 import random
 import json
+import math
 import os
-from shapely.geometry import Polygon, Point
+import sys
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+import shapely
+from shapely import STRtree
+from shapely.geometry import Polygon
+
+from eye.geofence import haversine_m
+from eye.services import services
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+SOURCE_PATH = os.path.join(DATA_DIR, "water_polygons.json")
+COMPILED_PATH = os.path.join(DATA_DIR, "water_polygons.wkb.npz")
+COMPILED_FORMAT = 1
+M_PER_DEG_LAT = 111320.0
+
+PLACEMENT_CANDIDATES = 8  # Water candidates kept per seed (fallbacks for separation)
+PLACEMENT_TRIES = 200     # Uniform draws per seed without the raster mask
+RETHE_CENTER = (53.5002, 9.9695)  # Verified on Google Maps: in the Elbe
+
+# Level-of-detail: one simplified copy per zoom band, tolerance = one 256px tile pixel
+LOD_ZOOMS = (8, 10, 12, 14)  # Above the last level, the full geometry is used
+
+
+def lod_tolerance(zoom, lat=53.5):
+    """Degrees per pixel of a 256px web-mercator tile at this zoom (at the port's latitude)."""
+    return 360.0 / (256 * 2 ** zoom) * math.cos(math.radians(lat))
+
+
+def seed_uniforms(seeds, k):
+    """
+    Deterministic per seed, no per-seed Random(): blake2b(seed) is the key of a
+    counter-based generator (splitmix64), evaluated for all seeds x k in one pass.
+    Returns float64 [len(seeds), k] in [0, 1).
+    """
+    keys = np.array(
+        [int.from_bytes(hashlib.blake2b(str(s).encode("utf-8"), digest_size=8).digest(), "little") for s in seeds],
+        dtype=np.uint64
+    )
+    z = keys[:, None] + (np.arange(1, k + 1, dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15))[None, :]
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    z = z ^ (z >> np.uint64(31))
+    return (z >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+
+def source_digest(path=SOURCE_PATH):
+    """sha256 of the source JSON: the compiled cache is only used if it matches."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def parse_water_json(path=SOURCE_PATH):
+    """
+    Slow path: water_polygons.json ([lat, lng] rings) -> (valid Shapely polygons, bounds).
+    Bounds cover the vertices of the polygons that were kept.
+    """
+    with open(path, "r") as f:
+        raw_polys = json.load(f)
+
+    polygons = []
+    all_lats = []
+    all_lngs = []
+    for coords in raw_polys:
+        if len(coords) >= 3:
+            # Convert (lat, lng) to Shapely format (lng, lat)
+            shapely_coords = [(pt[1], pt[0]) for pt in coords]
+            try:
+                poly = Polygon(shapely_coords)
+                if poly.is_valid and poly.area > 0:
+                    polygons.append(poly)
+                    # Track bounds
+                    for pt in coords:
+                        all_lats.append(pt[0])
+                        all_lngs.append(pt[1])
+            except:
+                pass
+
+    bounds = None
+    if all_lats and all_lngs:
+        bounds = (min(all_lats), max(all_lats), min(all_lngs), max(all_lngs))
+    return polygons, bounds
+
+
+def compile_water_polygons(source=SOURCE_PATH, target=COMPILED_PATH):
+    """
+    Build step: validated polygons -> one WKB blob + offsets, bounds and the source sha256.
+    (The STRtree itself is not stored: rebuilding it from loaded polygons takes < 1ms.)
+    """
+    polygons, bounds = parse_water_json(source)
+    wkb = shapely.to_wkb(np.array(polygons, dtype=object))
+    offsets = np.zeros(len(wkb) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(b) for b in wkb])
+    np.savez(
+        target,
+        format=np.int64(COMPILED_FORMAT),
+        source_sha256=np.array(source_digest(source)),
+        blob=np.frombuffer(b"".join(wkb), dtype=np.uint8),
+        offsets=offsets,
+        bounds=np.array(bounds, dtype=np.float64)
+    )
+    return target, len(polygons)
+
+
+def load_compiled(source=SOURCE_PATH, target=COMPILED_PATH):
+    """
+    Fast path: (polygons, bounds) from the compiled cache, or None if it is
+    missing, from another format version, or stale (source hash mismatch).
+    """
+    if not os.path.exists(target):
+        return None
+    with np.load(target) as data:
+        if int(data["format"]) != COMPILED_FORMAT or str(data["source_sha256"]) != source_digest(source):
+            return None
+        blob = data["blob"].tobytes()
+        offsets = data["offsets"]
+        bounds = tuple(float(v) for v in data["bounds"])
+    chunks = [blob[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+    polygons = list(shapely.from_wkb(np.array(chunks, dtype=object)))
+    return polygons, bounds
+
+
+class WaterMask:
+    """
+    Rasterized Water Bitmask (O(1) lookups).
+    A grid over WaterGeometry.bounds at resolution_m; a cell is water if its CENTER
+    lies inside a water polygon. Rows are bit-packed (np.packbits) and saved as .npy,
+    so every process can np.load(..., mmap_mode="r") and share the same pages.
+
+    FILES:
+    - water_mask_<res>m.npy  : uint8 [rows, ceil(cols / 8)], row 0 = min_lat
+    - water_mask_<res>m.json : bounds, resolution, shape
+    """
+    def __init__(self, bits, bounds, resolution_m, cols):
+        self.bits = bits
+        self.bounds = bounds  # (min_lat, max_lat, min_lng, max_lng)
+        self.resolution_m = resolution_m
+        self.rows = bits.shape[0]
+        self.cols = cols
+        min_lat, max_lat, min_lng, max_lng = bounds
+        self.dlat = resolution_m / M_PER_DEG_LAT
+        self.dlng = resolution_m / (M_PER_DEG_LAT * math.cos(math.radians((min_lat + max_lat) / 2)))
+        self._row_offsets = None  # Cumulative water-cell counts (built on first sample)
+
+    # --- BUILD ---
+    @classmethod
+    def rasterize(cls, polygons, bounds, resolution_m=5.0, row_chunk=256):
+        """
+        Scanline (even-odd) fill of every polygon at cell-center latitudes.
+        Polygons are OR-ed together, so overlaps behave as a union.
+        """
+        min_lat, max_lat, min_lng, max_lng = bounds
+        dlat = resolution_m / M_PER_DEG_LAT
+        dlng = resolution_m / (M_PER_DEG_LAT * math.cos(math.radians((min_lat + max_lat) / 2)))
+        rows = int(math.ceil((max_lat - min_lat) / dlat))
+        cols = int(math.ceil((max_lng - min_lng) / dlng))
+        mask = np.zeros((rows, cols), dtype=bool)
+
+        for poly in polygons:
+            rings = [poly.exterior] + list(poly.interiors)
+            edges = []
+            for ring in rings:
+                xy = np.asarray(ring.coords)  # (lng, lat), closed
+                edges.append(np.column_stack([xy[:-1], xy[1:]]))
+            edges = np.concatenate(edges)  # x0, y0, x1, y1
+            x0, y0, x1, y1 = edges.T
+
+            p_min_lng, p_min_lat, p_max_lng, p_max_lat = poly.bounds
+            r0 = max(int(math.floor((p_min_lat - min_lat) / dlat - 0.5)), 0)
+            r1 = min(int(math.ceil((p_max_lat - min_lat) / dlat - 0.5)) + 1, rows)
+            for c0 in range(r0, r1, row_chunk):
+                row_idx = np.arange(c0, min(c0 + row_chunk, r1))
+                y = min_lat + (row_idx + 0.5) * dlat
+                # Edges crossing each scanline (half-open rule avoids double-counting vertices)
+                cross = (y0[None, :] <= y[:, None]) != (y1[None, :] <= y[:, None])
+                r_i, e_i = np.nonzero(cross)
+                if not len(r_i):
+                    continue
+                t = (y[r_i] - y0[e_i]) / (y1[e_i] - y0[e_i])
+                x = x0[e_i] + t * (x1[e_i] - x0[e_i])
+
+                # Sort crossings per row, pair them up (inside spans)
+                order = np.lexsort((x, r_i))
+                r_s = r_i[order]
+                x_s = x[order]
+                start = r_s[0::2]
+                xa = x_s[0::2]
+                xb = x_s[1::2]
+                col_a = np.clip(np.ceil((xa - min_lng) / dlng - 0.5), 0, cols).astype(np.int64)
+                col_b = np.clip(np.ceil((xb - min_lng) / dlng - 0.5), 0, cols).astype(np.int64)
+
+                # Difference array per scanline -> cumulative sum -> filled spans
+                diff = np.zeros((len(row_idx), cols + 1), dtype=np.int32)
+                np.add.at(diff, (start, col_a), 1)
+                np.add.at(diff, (start, col_b), -1)
+                mask[row_idx] |= np.cumsum(diff[:, :cols], axis=1) > 0
+
+        return cls(np.packbits(mask, axis=1), bounds, resolution_m, cols)
+
+    # --- PERSISTENCE ---
+    @staticmethod
+    def paths(resolution_m, data_dir=DATA_DIR):
+        stem = os.path.join(data_dir, f"water_mask_{resolution_m:g}m")
+        return stem + ".npy", stem + ".json"
+
+    def save(self, data_dir=DATA_DIR):
+        npy_path, meta_path = self.paths(self.resolution_m, data_dir)
+        np.save(npy_path, np.asarray(self.bits))
+        with open(meta_path, "w") as f:
+            json.dump({"bounds": list(self.bounds), "resolution_m": self.resolution_m,
+                       "rows": self.rows, "cols": self.cols}, f)
+        return npy_path
+
+    @classmethod
+    def load(cls, resolution_m=5.0, data_dir=DATA_DIR):
+        """Memory-maps a saved mask (shared, read-only pages). Returns None if absent."""
+        npy_path, meta_path = cls.paths(resolution_m, data_dir)
+        if not (os.path.exists(npy_path) and os.path.exists(meta_path)):
+            return None
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        bits = np.load(npy_path, mmap_mode="r")
+        return cls(bits, tuple(meta["bounds"]), meta["resolution_m"], meta["cols"])
+
+    # --- QUERIES ---
+    def cells(self, lats, lngs):
+        """(row, col, inside_grid) for each point."""
+        min_lat, _, min_lng, _ = self.bounds
+        r = np.floor((np.asarray(lats, dtype=np.float64) - min_lat) / self.dlat).astype(np.int64)
+        c = np.floor((np.asarray(lngs, dtype=np.float64) - min_lng) / self.dlng).astype(np.int64)
+        inside = (r >= 0) & (r < self.rows) & (c >= 0) & (c < self.cols)
+        return np.where(inside, r, 0), np.where(inside, c, 0), inside
+
+    def contains_many(self, lats, lngs):
+        """Vectorized lookup: pure array indexing + bit test."""
+        r, c, inside = self.cells(lats, lngs)
+        byte = self.bits[r, c >> 3]
+        return inside & (((byte >> (7 - (c & 7))) & 1) == 1)
+
+    def contains(self, lat, lng):
+        return bool(self.contains_many([lat], [lng])[0])
+
+    def _offsets(self):
+        if self._row_offsets is None:
+            counts = np.zeros(self.rows, dtype=np.int64)
+            for r0 in range(0, self.rows, 512):
+                chunk = np.unpackbits(self.bits[r0:r0 + 512], axis=1, count=self.cols)
+                counts[r0:r0 + 512] = chunk.sum(axis=1)
+            self._row_offsets = np.concatenate(([0], np.cumsum(counts)))
+        return self._row_offsets
+
+    @property
+    def water_cells(self):
+        return int(self._offsets()[-1])
+
+    def cell_centers(self, ranks):
+        """k-th water cells (row-major order) -> (lats, lngs) of their centers."""
+        offsets = self._offsets()
+        ranks = np.asarray(ranks, dtype=np.int64)
+        rows = np.searchsorted(offsets, ranks, side="right") - 1
+        cols = np.empty(len(ranks), dtype=np.int64)
+        for r in np.unique(rows):
+            sel = rows == r
+            water_cols = np.flatnonzero(np.unpackbits(self.bits[r], count=self.cols))
+            cols[sel] = water_cols[ranks[sel] - offsets[r]]
+        min_lat, _, min_lng, _ = self.bounds
+        return min_lat + (rows + 0.5) * self.dlat, min_lng + (cols + 0.5) * self.dlng
+
+    def sample(self, n, rng=None):
+        """
+        Uniform sample of n water cell centers (no rejection sampling).
+        rng: random.Random (deterministic per seed) or None.
+        """
+        rng = rng or random
+        total = self.water_cells
+        ranks = [int(rng.random() * total) for _ in range(n)]
+        return self.cell_centers(ranks)
+
 
 class WaterGeometry:
     """
@@ -12,41 +296,45 @@ class WaterGeometry:
     - Our data file stores [lat, lng] pairs
     - Shapely Point uses (x, y) = (lng, lat)
     - We must convert when doing geometry checks
+
+    QUERY ENGINE:
+    - Polygons are prepared once and indexed in an STRtree
+    - is_water() / is_water_many() cost one tree probe per point, not a scan of all polygons;
+      bbox candidates are then tested with contains_xy against the prepared polygons
+    - If a rasterized WaterMask exists (python -m eye.geography --build-mask), it is
+      memory-mapped: approximate lookups and water-point sampling become array indexing
     """
-    def __init__(self):
+    def __init__(self, mask_resolution_m=5.0):
         self.polygons = []
         self.bounds = None  # Will store (min_lat, max_lat, min_lng, max_lng)
+        self.tree = None
+        self._prepared = None  # Object array of self.polygons (prepared), for vectorized predicates
+        self.mask = None
+        self._placements = OrderedDict()  # seed -> (lats, lngs) water candidates (LRU)
+        self._placement_lock = threading.Lock()  # Placements run on worker threads (Lookout, Scout)
+        self.placement_cache_size = 4096
+        self._lods = {}  # LOD zoom -> simplified polygons (aligned with self.polygons)
+        self._lod_lock = threading.Lock()
         
+        self.load_timings = {}  # stage -> milliseconds
+        self.source = None      # "compiled" | "json" | "fallback"
+
         try:
-            path = os.path.join(os.path.dirname(__file__), "data", "water_polygons.json")
-            with open(path, "r") as f:
-                raw_polys = json.load(f)
-                
-                all_lats = []
-                all_lngs = []
-                
-                for coords in raw_polys:
-                    if len(coords) >= 3:
-                        # Convert (lat, lng) to Shapely format (lng, lat)
-                        shapely_coords = [(pt[1], pt[0]) for pt in coords]
-                        try:
-                            poly = Polygon(shapely_coords)
-                            if poly.is_valid and poly.area > 0:
-                                self.polygons.append(poly)
-                                # Track bounds
-                                for pt in coords:
-                                    all_lats.append(pt[0])
-                                    all_lngs.append(pt[1])
-                        except:
-                            pass
-                
-                if all_lats and all_lngs:
-                    self.bounds = (min(all_lats), max(all_lats), min(all_lngs), max(all_lngs))
-                    
-            print(f"GEO-INT: Loaded {len(self.polygons)} Real Water Polygons.")
+            t0 = time.perf_counter()
+            loaded = load_compiled()
+            self.source = "compiled"
+            if loaded is None:
+                loaded = parse_water_json()
+                self.source = "json"
+            self.polygons, self.bounds = loaded
+            self.load_timings["polygons"] = (time.perf_counter() - t0) * 1000
+
+            print(f"GEO-INT: Loaded {len(self.polygons)} Real Water Polygons ({self.source}, {self.load_timings['polygons']:.1f}ms).")
             if self.bounds:
                 print(f"GEO-INT: Bounds: Lat [{self.bounds[0]:.4f}, {self.bounds[1]:.4f}], Lng [{self.bounds[2]:.4f}, {self.bounds[3]:.4f}]")
-                
+            if self.source == "json":
+                print("GEO-INT: No fresh compiled cache. Build one with: python -m eye.geography --compile")
+
         except Exception as e:
             print(f"GEO-INT WARNING: Could not load real water data ({e}).")
             # FALLBACK: Hardcoded Elbe channel near Rethe Bridge
@@ -57,13 +345,189 @@ class WaterGeometry:
             ]
             self.polygons.append(Polygon(elbe_channel))
             self.bounds = (53.4980, 53.5020, 9.9650, 9.9750)
+            self.source = "fallback"
+
+        t0 = time.perf_counter()
+        self._build_index()
+        self.load_timings["index"] = (time.perf_counter() - t0) * 1000
+        t0 = time.perf_counter()
+        self.mask = WaterMask.load(mask_resolution_m)
+        self.load_timings["mask"] = (time.perf_counter() - t0) * 1000
+        if self.mask:
+            print(f"GEO-INT: Water mask mapped ({self.mask.rows}x{self.mask.cols} @ {self.mask.resolution_m:g}m)")
+
+    def build_mask(self, resolution_m=5.0):
+        """Rasterizes the polygons, writes the .npy and maps it back in."""
+        mask = WaterMask.rasterize(self.polygons, self.bounds, resolution_m)
+        mask.save()
+        self.mask = WaterMask.load(resolution_m)
+        with self._placement_lock:
+            self._placements.clear()  # Candidates depend on the sampler
+        return self.mask
+
+    def lod_zoom(self, zoom):
+        """The LOD level serving a map zoom (None = full geometry)."""
+        for level in LOD_ZOOMS:
+            if zoom <= level:
+                return level
+        return None
+
+    def simplified(self, zoom):
+        """
+        Polygons simplified for a map zoom (topology preserved), built once per LOD
+        level on first use. Index-aligned with self.polygons, so STRtree hits apply.
+        """
+        level = self.lod_zoom(zoom)
+        if level is None:
+            return np.asarray(self.polygons, dtype=object)
+        lod = self._lods.get(level)
+        if lod is None:
+            with self._lod_lock:
+                lod = self._lods.get(level)
+                if lod is None:
+                    lod = shapely.simplify(np.asarray(self.polygons, dtype=object), lod_tolerance(level, (self.bounds[0] + self.bounds[1]) / 2), preserve_topology=True)
+                    self._lods[level] = lod
+        return lod
+
+    def build_lods(self):
+        """Precomputes every LOD level. Returns {level: vertex count}."""
+        counts = {"full": int(shapely.get_num_coordinates(np.asarray(self.polygons, dtype=object)).sum())}
+        for level in LOD_ZOOMS:
+            counts[level] = int(shapely.get_num_coordinates(self.simplified(level)).sum())
+        return counts
+
+    def _build_index(self):
+        """Prepares every polygon and builds the STRtree (once)."""
+        self._prepared = np.asarray(self.polygons, dtype=object)
+        shapely.prepare(self._prepared)
+        self.tree = STRtree(self._prepared)
+
+    def is_water_many(self, lats, lngs, exact=True):
+        """
+        Vectorized point-in-water test.
+        Returns a bool array: True where (lat, lng) lies inside any water polygon.
+        exact=False uses the raster mask (if loaded): O(1) per point, cell-resolution accurate.
+        """
+        if not exact and self.mask is not None:
+            return self.mask.contains_many(lats, lngs)
+        lats = np.asarray(lats, dtype=np.float64)
+        lngs = np.asarray(lngs, dtype=np.float64)
+        # Shapely Point uses (x, y) = (lng, lat)
+        pts = shapely.points(lngs, lats)
+        hits = np.zeros(len(pts), dtype=bool)
+        if len(pts):
+            # Tree: bbox candidates only. Exact test with the polygon as the prepared side
+            point_idx, poly_idx = self.tree.query(pts)
+            inside = shapely.contains_xy(self._prepared[poly_idx], lngs[point_idx], lats[point_idx])
+            hits[point_idx[inside]] = True
+        return hits
+
+    def is_water(self, lat, lng):
+        """True if (lat, lng) lies inside any water polygon."""
+        return bool(self.is_water_many([lat], [lng])[0])
+
+    def sample_water_points(self, n, seed=None):
+        """
+        n uniformly distributed water points as (lats, lngs) arrays.
+        Needs the raster mask; returns None without it.
+        """
+        if self.mask is None:
+            return None
+        rng = random.Random(seed) if seed else random
+        return self.mask.sample(n, rng)
+
+    def _placement_candidates(self, seeds):
+        """
+        seeds -> {seed: (lats, lngs)} of up to PLACEMENT_CANDIDATES water points each,
+        computed in one vectorized pass for all seeds not already in the LRU.
+        The LRU is only touched under its lock; candidates are computed outside it.
+        """
+        out = {}
+        missing = []
+        with self._placement_lock:
+            for seed in seeds:
+                hit = self._placements.get(seed)
+                if hit is not None:
+                    self._placements.move_to_end(seed)
+                    out[seed] = hit
+                elif seed not in out:
+                    missing.append(seed)
+                    out[seed] = None
+        if not missing:
+            return out
+
+        if self.mask is not None and self.mask.water_cells:
+            # Every mask cell center is water: ranks map straight to points
+            u = seed_uniforms(missing, PLACEMENT_CANDIDATES)
+            ranks = np.minimum((u * self.mask.water_cells).astype(np.int64), self.mask.water_cells - 1)
+            lats, lngs = self.mask.cell_centers(ranks.ravel())
+            lats = lats.reshape(ranks.shape)
+            lngs = lngs.reshape(ranks.shape)
+            found = [(lats[i], lngs[i]) for i in range(len(missing))]
+        else:
+            # Rejection sampling in the data bounds, all seeds in one tree query
+            min_lat, max_lat, min_lng, max_lng = self.bounds or (53.48, 53.52, 9.90, 10.00)
+            u = seed_uniforms(missing, 2 * PLACEMENT_TRIES)
+            lats = min_lat + u[:, 0::2] * (max_lat - min_lat)
+            lngs = min_lng + u[:, 1::2] * (max_lng - min_lng)
+            water = self.is_water_many(lats.ravel(), lngs.ravel()).reshape(lats.shape)
+            found = []
+            for i in range(len(missing)):
+                idx = np.flatnonzero(water[i])[:PLACEMENT_CANDIDATES]
+                if not len(idx):
+                    found.append((np.array([RETHE_CENTER[0]]), np.array([RETHE_CENTER[1]])))
+                else:
+                    found.append((lats[i, idx], lngs[i, idx]))
+
+        with self._placement_lock:
+            for seed, cand in zip(missing, found):
+                out[seed] = cand
+                self._placements[seed] = cand
+            while len(self._placements) > self.placement_cache_size:
+                self._placements.popitem(last=False)
+        return out
+
+    def get_safe_water_points(self, seeds, min_separation_m=0.0):
+        """
+        Places many vessels at once: seeds -> list of (lat, lng), all in water.
+        Deterministic per seed and cached (LRU), so rescans of the same names are free.
+        min_separation_m > 0: in seed order, a vessel that would land within that
+        distance of an already placed one moves to its next candidate (best effort).
+        """
+        seeds = list(seeds)
+        cands = self._placement_candidates(seeds)
+        placed_lat = []
+        placed_lng = []
+        points = []
+        for seed in seeds:
+            lats, lngs = cands[seed]
+            pick = 0
+            if min_separation_m > 0 and placed_lat:
+                for j in range(len(lats)):
+                    d = haversine_m(lats[j], lngs[j], np.array(placed_lat), np.array(placed_lng))
+                    if d.min() >= min_separation_m:
+                        pick = j
+                        break
+            lat, lng = float(lats[pick]), float(lngs[pick])
+            placed_lat.append(lat)
+            placed_lng.append(lng)
+            points.append((lat, lng))  # (lat, lng) for Leaflet
+        return points
 
     def get_safe_water_point(self, seed=None):
         """
         Returns a coordinate GUARANTEED to be in a water polygon.
-        Uses Rejection Sampling within actual data bounds.
+        With a seed: same placement as get_safe_water_points([seed]).
+        With the raster mask: uniform pick among water cell centers (no rejection).
+        Otherwise: Rejection Sampling within actual data bounds.
         """
-        rng = random.Random(seed) if seed else random
+        if seed:
+            return self.get_safe_water_points([seed])[0]
+        rng = random
+
+        if self.mask is not None and self.mask.water_cells:
+            lats, lngs = self.mask.sample(1, rng)
+            return (float(lats[0]), float(lngs[0]))
 
         # Use actual bounds if available, otherwise default
         if self.bounds:
@@ -72,21 +536,37 @@ class WaterGeometry:
             min_lat, max_lat = 53.48, 53.52
             min_lng, max_lng = 9.90, 10.00
 
-        for _ in range(200):  # Try 200 times
-            lat = rng.uniform(min_lat, max_lat)
-            lng = rng.uniform(min_lng, max_lng)
-            
-            # Shapely Point uses (x, y) = (lng, lat)
-            point = Point(lng, lat)
+        # Draw all 200 candidates up front (unseeded: module-level random),
+        # then test them in one tree query and take the first hit.
+        lats = np.empty(200)
+        lngs = np.empty(200)
+        for i in range(200):  # Try 200 times
+            lats[i] = rng.uniform(min_lat, max_lat)
+            lngs[i] = rng.uniform(min_lng, max_lng)
 
-            # Check if point is inside ANY water polygon
-            for poly in self.polygons:
-                if poly.contains(point):
-                    return (lat, lng)  # Return as (lat, lng) for Leaflet
+        hits = np.flatnonzero(self.is_water_many(lats, lngs))
+        if len(hits):
+            i = hits[0]
+            return (float(lats[i]), float(lngs[i]))  # Return as (lat, lng) for Leaflet
 
         # Fallback: Center of Rethe (known water location)
-        # Verified on Google Maps: 53.5002, 9.9695 is in the Elbe
-        return (53.5002, 9.9695)
+        return RETHE_CENTER
+
+def __getattr__(name):
+    # Lazy singleton: the polygons load on first `from eye.geography import geography`
+    if name == "geography":
+        return services.get("geography")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-geography = WaterGeometry()
 
+if __name__ == "__main__":
+    # Usage: python -m eye.geography --compile
+    #        python -m eye.geography --build-mask [resolution_m]
+    if len(sys.argv) > 1 and sys.argv[1] == "--compile":
+        t0 = time.perf_counter()
+        target, count = compile_water_polygons()
+        print(f"GEO-INT: Compiled {count} polygons -> {target} ({os.path.getsize(target) / 1024:.0f} KB, {(time.perf_counter() - t0) * 1000:.0f}ms)")
+    elif len(sys.argv) > 1 and sys.argv[1] == "--build-mask":
+        res = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+        built = services.get("geography").build_mask(res)
+        print(f"GEO-INT: Water mask {built.rows}x{built.cols} @ {res:g}m, {built.water_cells} water cells")
@@ -0,0 +1,160 @@
+import asyncio
+import json
+import logging
+import time
+
+from eye.statics import parse_static_message
+
+logger = logging.getLogger("EYE.INGEST")
+
+
+class IngestPipeline:
+    """
+    Staged AIS Ingestion.
+    1.  RECEIVE: submit() only puts the raw frame into a bounded queue (never blocks the socket reader)
+    2.  DECODE:  run() drains the queue in batches and parses them
+    3.  APPLY:   each decoded batch is committed to the VesselStore in one step
+
+    BACKPRESSURE POLICIES (when the queue is full):
+    - "drop_oldest": discard the oldest queued frame to make room (default, keeps data fresh)
+    - "drop_newest": discard the incoming frame
+    Within a batch, position reports are COALESCED: only the newest report per MMSI is applied.
+    Static/voyage messages (ShipStaticData, StaticDataReport) go to the optional StaticDataCache.
+    """
+    POLICIES = ("drop_oldest", "drop_newest")
+
+    def __init__(self, store, maxsize=20000, batch_size=2000, policy="drop_oldest", statics=None):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown drop policy '{policy}' (expected one of {self.POLICIES})")
+        self.store = store
+        self.statics = statics
+        self.batch_size = batch_size
+        self.policy = policy
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.recorder = None  # Optional CaptureWriter (raw frame tee, written on its own thread)
+        self.clock = time.time  # Receive-time stamp for applied batches (a replay swaps in its clock)
+
+        # Counters
+        self.received = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.decode_errors = 0
+        self.applied = 0
+        self.statics_applied = 0
+        self.batches = 0
+        self.last_batch_ms = 0.0
+
+    # --- STAGE 1: RECEIVE ---
+    def submit(self, frame):
+        """Enqueue one raw websocket frame. Returns False if a frame had to be dropped."""
+        self.received += 1
+        if self.recorder:
+            self.recorder.write(frame)
+        try:
+            self.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.policy == "drop_oldest":
+                self.queue.get_nowait()
+                self.queue.put_nowait(frame)
+            return False
+
+    # --- STAGE 2: DECODE ---
+    def decode(self, frame):
+        """
+        Parses one AisStream frame.
+        Returns ("position", mmsi, row), ("static", mmsi, fields) or None.
+        """
+        data = json.loads(frame)
+        message = data.get("Message", {})
+        meta = data.get("MetaData", {})
+        if "PositionReport" not in message:
+            for message_type in ("ShipStaticData", "StaticDataReport"):
+                if message_type in message:
+                    mmsi, fields = parse_static_message(message_type, message[message_type])
+                    mmsi = meta.get("MMSI", mmsi)
+                    return ("static", int(mmsi), fields) if mmsi is not None else None
+            return None
+        report = message["PositionReport"]
+        mmsi = meta.get("MMSI", report.get("UserID"))
+        if mmsi is None:
+            return None
+        return "position", int(mmsi), (
+            report["Latitude"],
+            report["Longitude"],
+            report.get("Sog", 0),
+            report.get("Cog", 0),
+            meta.get("ShipName", "").strip()
+        )
+
+    def decode_batch(self, frames):
+        """
+        Decodes a batch and coalesces it to the newest position per MMSI.
+        Returns (latest positions, static records in arrival order).
+        """
+        latest = {}
+        statics = []
+        for frame in frames:
+            try:
+                decoded = self.decode(frame)
+            except Exception as e:
+                self.decode_errors += 1
+                logger.debug(f"AIS Message Error: {e}")
+                continue
+            if decoded is None:
+                continue
+            kind, mmsi, row = decoded
+            if kind == "static":
+                statics.append((mmsi, row))
+                continue
+            if mmsi in latest:
+                self.coalesced += 1
+            latest[mmsi] = row  # Frames are in arrival order: last one wins
+        return latest, statics
+
+    # --- STAGE 3: APPLY ---
+    def apply(self, latest, statics=(), ts=None):
+        """Commits one coalesced batch to the store (no awaits -> atomic for perceive())."""
+        if latest:
+            self.store.upsert_many(latest, ts=ts)
+            self.applied += len(latest)
+        if statics and self.statics is not None:
+            for mmsi, fields in statics:
+                self.statics.update(mmsi, fields, ts=ts)
+            self.statics_applied += len(statics)
+
+    async def run(self):
+        """Decode/apply worker. Yields to the event loop between batches."""
+        while True:
+            frames = [await self.queue.get()]
+            while len(frames) < self.batch_size:
+                try:
+                    frames.append(self.queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            t0 = time.perf_counter()
+            latest, statics = self.decode_batch(frames)
+            self.apply(latest, statics, ts=self.clock())
+            self.batches += 1
+            self.last_batch_ms = (time.perf_counter() - t0) * 1000
+
+            await asyncio.sleep(0)  # Let HTTP handlers and the socket reader run
+
+    def stats(self):
+        return {
+            "queue_depth": self.queue.qsize(),
+            "queue_capacity": self.queue.maxsize,
+            "policy": self.policy,
+            "received": self.received,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "decode_errors": self.decode_errors,
+            "applied": self.applied,
+            "statics_applied": self.statics_applied,
+            "batches": self.batches,
+            "last_batch_ms": round(self.last_batch_ms, 2),
+            "tracked_vessels": len(self.store),
+            "capture_dropped": self.recorder.dropped if self.recorder else 0
+        }
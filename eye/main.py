@@ -2,14 +2,22 @@ import asyncio
 import os
 import json
 import logging
-import math
 import time
 import random
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 import httpx
-from bs4 import BeautifulSoup # Agentic Capability
-import websockets
+from eye.vessels import VesselStore
+from eye.statics import StaticDataCache
+from eye.ingest import IngestPipeline
+from eye.capture import CaptureWriter, CaptureReplayer
+from eye.geofence import GeofenceIndex
+from eye.snapshot import SnapshotCache
+from eye.stream import StreamHub
+from eye.services import services
+from eye.tiles import WaterTiles
+from eye.recorder import HistoryRecorder
+from brain.history import BRIDGE_ZONES
 
 # Configure standard logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -25,8 +33,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Buffer for Real Ships (AIS)
-real_ships_buffer = {}
+# Static/Voyage attributes (draft, dimensions, type, destination, ETA), keyed by MMSI
+vessel_statics = StaticDataCache(capacity=20000)
+# Live State for Real Ships (AIS), keyed by MMSI
+vessel_store = VesselStore(capacity=4096, ttl=600, statics=vessel_statics) # 10 min timeout
+# Receive -> Decode -> Apply pipeline feeding the store
+ais_ingest = IngestPipeline(vessel_store, maxsize=20000, batch_size=2000, policy="drop_oldest", statics=vessel_statics)
+# Bridge/Lock Geofences (registered once). Node -> zone it watches.
+NODE_ZONES = {"rethe": "RETHE", "kattwyk": "KATTWYK"}
+geofence = GeofenceIndex()
+geofence.register_many(BRIDGE_ZONES)
 # Buffer for Scheduled Ships (The Lookout)
 scheduled_ships_buffer = []
 
@@ -41,6 +57,7 @@ class LookoutService:
         # API_ENDPOINT = "https://api.hvcc-hamburg.de/v1/arrivals"
         self.url = "https://www.hafen-hamburg.de/en/vessels"
         self.last_scan = 0
+        self.version = 0 # Bumped whenever scheduled_ships_buffer is replaced
         
     async def scan(self):
         """Scrapes 'Expected Vessels' from public portal"""
@@ -53,6 +70,7 @@ class LookoutService:
             async with httpx.AsyncClient() as client:
                 r = await client.get(self.url, timeout=10.0)
                 if r.status_code == 200:
+                    from bs4 import BeautifulSoup # Agentic Capability (deferred: ~50ms import)
                     soup = BeautifulSoup(r.text, 'html.parser')
                     ships = []
                     
@@ -80,42 +98,10 @@ class LookoutService:
                         ]
                         logger.warning("THE LOOKOUT: No distinct ships found. Deploying Ghost Fleet (Simulation Mode).")
 
-                    # Convert to "Scheduled Ship" Objects
-                    new_buffer = []
-                    
-                    # Import Geography to find SAFE WATER (No Grounding)
-                    from eye.geography import geography
-                    
-                    # ORACLE UPGRADE: Generate ETAs for 24h Prediction
-                    now = time.time()
-                    
-                    for i, name in enumerate(ships[:15]): # Top 15
-                        # Get a safe point in the deep channel
-                        safe_pt = geography.get_safe_water_point(seed=name) # Stable seed based on name
-                        
-                        # Generating Synthetic ETA if real one is missing
-                        # Spread arrivals over next 24 hours (86400 seconds)
-                        # We use hash of name to keep ETA stable for same ship
-                        seed_val = sum(ord(c) for c in name)
-                        future_offset = (seed_val % 24) * 3600 # 0 to 24 hours ahead
-                        eta_ts = now + future_offset
-                        
-                        new_buffer.append({
-                            "id": f"SCHEDULED-{name}",
-                            "name": name,
-                            "lat": safe_pt[0], # VALIDATED WATER
-                            "lng": safe_pt[1], # VALIDATED WATER
-                            "type": "scheduled_vessel",
-                            "sog": 3.0, # Moving speed
-                            "status": "PREDICTED_ARRIVAL",
-                            "eta": eta_ts,
-                            "eta_readable": time.strftime("%H:%M", time.localtime(eta_ts))
-                        })
-                        
-                    # Sort by ETA for nicer timeline
-                    new_buffer.sort(key=lambda x: x['eta'])
-                    
+                    # Convert to "Scheduled Ship" Objects (placement + registry: off the event loop)
+                    new_buffer = await asyncio.to_thread(self._schedule, ships)
                     scheduled_ships_buffer = new_buffer
+                    self.version += 1
                     logger.info(f"THE LOOKOUT: Spotted {len(new_buffer)} incoming vessels (Scheduled)")
                     self.last_scan = time.time()
                 else:
@@ -123,6 +109,53 @@ class LookoutService:
         except Exception as e:
             logger.error(f"THE LOOKOUT: Blinded! {e}")
 
+    def _schedule(self, ships):
+        """Scraped names -> scheduled ship dicts in safe water, sorted by ETA (blocking)."""
+        new_buffer = []
+        
+        # ORACLE UPGRADE: Generate ETAs for 24h Prediction
+        now = time.time()
+
+        # Safe points for the whole batch in one pass (stable per name, cached;
+        # sorted so the separation pass is order-independent). No Grounding.
+        batch = sorted(ships[:15])
+        placements = dict(zip(batch, services.get("geography").get_safe_water_points(batch, min_separation_m=150)))
+        registry = services.get("registry")
+        
+        for i, name in enumerate(ships[:15]): # Top 15
+            # Get a safe point in the deep channel
+            safe_pt = placements[name]
+            # Tie the scraped name to registry master data (None if no confident match)
+            vessel = registry.resolve(name)
+            
+            # Generating Synthetic ETA if real one is missing
+            # Spread arrivals over next 24 hours (86400 seconds)
+            # We use hash of name to keep ETA stable for same ship
+            seed_val = sum(ord(c) for c in name)
+            future_offset = (seed_val % 24) * 3600 # 0 to 24 hours ahead
+            eta_ts = now + future_offset
+            
+            new_buffer.append({
+                "id": f"SCHEDULED-{name}",
+                "name": name,
+                "lat": safe_pt[0], # VALIDATED WATER
+                "lng": safe_pt[1], # VALIDATED WATER
+                "type": "scheduled_vessel",
+                "sog": 3.0, # Moving speed
+                "status": "PREDICTED_ARRIVAL",
+                "eta": eta_ts,
+                "eta_readable": time.strftime("%H:%M", time.localtime(eta_ts)),
+                "registry_name": vessel["name"] if vessel else None,
+                "imo": vessel.get("imo", "") if vessel else "",
+                "mmsi": vessel.get("mmsi", "") if vessel else "",
+                "vessel_type": vessel.get("type", "Unknown") if vessel else "Unknown",
+                "length_m": vessel.get("length_m", 0) if vessel else 0
+            })
+            
+        # Sort by ETA for nicer timeline
+        new_buffer.sort(key=lambda x: x['eta'])
+        return new_buffer
+
 lookout = LookoutService()
 
 # --- AGENTIC CAPABILITY: THE HYDROGRAPHER ---
@@ -134,6 +167,7 @@ class TideService:
         self.current_level = 0.0
         self.trend = "stable"
         self.last_update = 0
+        self.version = 0
 
     async def update(self):
         if time.time() - self.last_update < 300: # 5 min cache
@@ -145,7 +179,10 @@ class TideService:
                 if r.status_code == 200:
                     data = r.json()
                     # Value is in cm (e.g., 593). Convert to meters.
-                    self.current_level = data.get("value", 0) / 100.0
+                    level = data.get("value", 0) / 100.0
+                    if level != self.current_level:
+                        self.current_level = level
+                        self.version += 1
                     self.last_update = time.time()
                     logger.info(f"THE HYDROGRAPHER: St. Pauli Tide Level: {self.current_level:.2f}m")
         except Exception as e:
@@ -164,6 +201,19 @@ class WeatherService:
     def __init__(self):
         self.api_key = os.getenv("OPENWEATHER_API_KEY") 
         self.base_url = "https://api.openweathermap.org/data/2.5/weather"
+        self.current = None
+        self.version = 0
+        self.last_observed = 0
+
+    def refresh(self, max_age=60):
+        """Re-observes at most every max_age seconds; bumps version only on change."""
+        if self.current is None or time.time() - self.last_observed >= max_age:
+            observation = self.observe()
+            self.last_observed = time.time()
+            if observation != self.current:
+                self.current = observation
+                self.version += 1
+        return self.current
 
     def observe(self):
         # 1. ATTEMPT REAL API CALL
@@ -197,10 +247,34 @@ class EyeService:
     1.  Real AIS Data (AisStream)
     2.  Public Web Scrapers (The Lookout)
     3.  Hydrological Sensors (The Hydrographer)
+
+    SOURCE OVERRIDE (env):
+    - AISSTREAM_URL: websocket endpoint (default: AisStream.io). Point at eye.aissim for offline load tests
+
+    RECORD / REPLAY (env):
+    - AIS_CAPTURE_PATH: tee every raw AIS frame into this gzip capture file
+    - AIS_REPLAY_PATH:  replay a capture instead of connecting to AisStream
+    - AIS_REPLAY_SPEED: 1 (real time), 10, 100, ... or 0 (as fast as possible)
+    - AIS_REPLAY_LOOP:  "1" to restart the capture when it ends
+    During a replay, perception runs on the replayed clock (CaptureReplayer.now).
+
+    HISTORY RECORDING (env):
+    - HISTORY_RECORD:          "0" disables the rolling recorder (default on)
+    - HISTORY_DIR:             recording directory (default eye/data/recordings)
+    - HISTORY_RETENTION_DAYS:  how long recorded segments are kept (default 7)
     """
     def __init__(self):
         self.api_key = os.getenv("AISSTREAM_API_KEY")
-        if not self.api_key:
+        self.stream_url = os.getenv("AISSTREAM_URL", "wss://stream.aisstream.io/v0/stream")
+        if not self.api_key and "AISSTREAM_URL" in os.environ:
+            self.api_key = "LOCAL-STAND-IN" # Local stand-in accepts any key
+        self.replay_path = os.getenv("AIS_REPLAY_PATH")
+        self.capture_path = os.getenv("AIS_CAPTURE_PATH")
+        self.clock = time.time # Perception time (the replayed clock during a replay)
+        # Input versions for change-driven perception
+        self.traffic_version = 0
+        self.scout_version = 0
+        if not self.api_key and not self.replay_path:
             logger.warning("AISSTREAM_API_KEY missing! Real ships will not be tracked.") 
 
     async def connect_and_stream(self):
@@ -210,11 +284,28 @@ class EyeService:
         asyncio.create_task(self.run_tide_loop())
         asyncio.create_task(self.run_traffic_loop())
         asyncio.create_task(self.run_scout_loop())
+        asyncio.create_task(ais_ingest.run())
+
+        # REPLAY MODE: Same ingestion path, recorded source
+        if self.replay_path:
+            replayer = CaptureReplayer(
+                self.replay_path,
+                speed=float(os.getenv("AIS_REPLAY_SPEED", "1")),
+                loop=os.getenv("AIS_REPLAY_LOOP") == "1"
+            )
+            self.clock = ais_ingest.clock = replayer.now
+            await replayer.replay(ais_ingest.submit)
+            return
+
+        if self.capture_path:
+            ais_ingest.recorder = CaptureWriter(self.capture_path)
+
+        import websockets # Deferred: only the live feed needs it
         
         while True:
             try:
                 # ... (WebSocket Logic) ...
-                async with websockets.connect("wss://stream.aisstream.io/v0/stream") as websocket:
+                async with websockets.connect(self.stream_url, max_size=None) as websocket:
                     subscribe_message = {
                         "APIKey": self.api_key,
                         "BoundingBoxes": [[
@@ -226,32 +317,11 @@ class EyeService:
                         "FilterMessageTypes": [] # Allow ALL Message Types (Navigation, Class B, Base Station, etc.)
                     }
                     await websocket.send(json.dumps(subscribe_message))
-                    logger.info("Connected to AisStream (REAL DATA MODE: ON)")
+                    logger.info(f"Connected to AisStream (REAL DATA MODE: ON) [{self.stream_url}]")
 
+                    # RECEIVE STAGE ONLY: parsing/applying happens in ais_ingest.run()
                     async for message in websocket:
-                        try:
-                            # logger.info(f"AIS RAW: {message[:100]}...") # Debug: Check if ANY data flows
-                            data = json.loads(message)
-                            if "Message" in data and "PositionReport" in data["Message"]:
-                                report = data["Message"]["PositionReport"]
-                                meta = data["MetaData"]
-                                
-                                logger.info(f"AIS CONTACT: {meta['ShipName']}")
-                                
-                                ship = {
-                                    "id": meta["ShipName"].strip(),
-                                    "lat": report["Latitude"],
-                                    "lng": report["Longitude"],
-                                    "type": "real_vessel_ais",
-                                    "sog": report.get("Sog", 0),
-                                    "last_seen": time.time(),
-                                    "draft_status": "OK" # Default
-                                }
-                                # Update global buffer
-                                real_ships_buffer[ship["id"]] = ship
-                                
-                        except Exception as e:
-                            logger.error(f"AIS Message Error: {e}")
+                        ais_ingest.submit(message)
 
             except Exception as e:
                 logger.warning(f"AisStream Connection Failed (Retrying in 5s): {e}")
@@ -274,36 +344,74 @@ class EyeService:
         global traffic_buffer
         if traffic_service:
             while True:
-                traffic_buffer = await traffic_service.check_traffic()
+                result = await traffic_service.check_traffic()
+                if result != traffic_buffer:
+                    traffic_buffer = result
+                    self.traffic_version += 1
                 await asyncio.sleep(300) # 5 mins
 
     async def run_scout_loop(self):
         """The Scout Agent: Scours the web for real ships"""
         global scouted_ships_buffer
         while True:
-            scouted_ships_buffer = await scout.find_real_ships()
+            scouted_ships_buffer = await services.get("scout").find_real_ships()
+            self.scout_version += 1
             await asyncio.sleep(600) # 10 mins (External request)
 
-    def perceive(self, node_id="rethe"):
-        """Fuses Real AIS + Scheduled Lookout Data + Tide Physics"""
-        t = time.time()
+    def input_versions(self, t):
+        """Version key of everything perceive() reads at time t"""
+        return (
+            vessel_store.version,
+            vessel_store.motion_epoch(t), # Dead-reckoned positions advance while ships move
+            vessel_statics.version,
+            tide_gauge.version,
+            weather_reporter.version,
+            lookout.version,
+            self.traffic_version,
+            self.scout_version
+        )
+
+    def history_snapshot(self, t):
+        """Live AIS fleet at time t in the history snapshot shape (for the recorder)."""
+        occupied = geofence.occupancy(vessel_store, t)
+        ships = []
+        for rec in vessel_store.snapshot(t):
+            ships.append({
+                "id": rec["mmsi"], # MMSI: stable even before the name arrives
+                "imo": rec.get("imo", ""),
+                "mmsi": rec["mmsi"],
+                "type": rec.get("ship_type", "AIS"),
+                "length_m": rec.get("length_m", 0),
+                "lat": round(rec["lat"], 6),
+                "lng": round(rec["lng"], 6),
+                "status": "UNDERWAY" if rec["sog"] >= vessel_store.MOVING_KN else "MOORED"
+            })
+        return {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(t)),
+            "timestamp_unix": t,
+            "ships": ships,
+            "bridges": {zone: "OPEN" if len(occupied.get(zone, [])) else "CLOSED" for zone in NODE_ZONES.values()},
+            "weather": (weather_reporter.current or {}).get("condition", "CLEAR"),
+            "active_obstacles": [],
+            "traffic_density": 0 # No road density sensor in the Eye
+        }
+
+    def perceive(self, node_id="rethe", t=None):
+        """Fuses Real AIS + Scheduled Lookout Data + Tide Physics (at perception time t)"""
+        t = self.clock() if t is None else t
         
         # 1. REAL AIS SHIPS
-        active_ships = []
-        for ship_id, ship_data in list(real_ships_buffer.items()):
-            if t - ship_data["last_seen"] < 600: # 10 min timeout
-                # Apply Hydrodynamic Logic
-                # If Ship Draft (simulated/scraped) > Tide Level, mark caution
-                # (For now, we don't have drafts, so we assume OK)
-                active_ships.append(ship_data)
+        # Stale contacts are evicted incrementally by the store's TTL heap.
+        # Positions are dead-reckoned from the last report to t.
+        # Draft/dimensions are joined from AIS static data (draft_status: OK | DEEP_DRAFT)
+        active_ships = vessel_store.snapshot(t)
         
         # 2. SCHEDULED SHIPS
         active_ships.extend(scheduled_ships_buffer)
 
         # 3. BRIDGE LOGIC (Inference)
         bridge_status = "bridge_closed"
-        bridge_lat = 53.5008
-        bridge_lng = 9.9710
+        zone = NODE_ZONES.get(node_id, "RETHE")
         
         traffic_flow = 0 
         traffic_alerts = []
@@ -322,18 +430,16 @@ class EyeService:
 
         # LOGIC: If Bridge is CLOSED (for ships) -> It is OPEN for Cars -> Traffic Flowing (100)
         if bridge_status == "bridge_closed": 
-            traffic_flow = random.randint(92, 100) # Traffic is flowing fast 
+            # Traffic is flowing fast (drawn per perception minute: the snapshot is a function of its inputs + t)
+            traffic_flow = random.Random(int(t // 60)).randint(92, 100)
         else:
             traffic_flow = 0 
         
         # Bridge status inferred from AIS (Real)
-        # If a ship is crossing the bridge coordinates (approx), we infer OPEN
-        for s in active_ships:
-            if s["type"] == "real_vessel_ais": # Only open for Real ships
-                dist = math.sqrt((s["lat"]-bridge_lat)**2 + (s["lng"]-bridge_lng)**2)
-                if dist < 0.003: # Approx 300m radius
-                     bridge_status = "bridge_open"
-                     logger.info(f"BRIDGE OPENING DETECTED for Ship: {s['id']}")
+        # If a real ship is inside this node's bridge geofence, we infer OPEN
+        for slot in geofence.occupancy(vessel_store, t).get(zone, []):
+            bridge_status = "bridge_open"
+            logger.info(f"BRIDGE OPENING DETECTED for Ship: {vessel_store.names[slot] or vessel_store.mmsi[slot]}")
         
         # FALLBACK VISUALS (If real AIS is empty, use THE SCOUT)
         if not active_ships:
@@ -349,9 +455,9 @@ class EyeService:
             "trucks": [], 
             "ships": active_ships,
             "tide_level_m": tide_gauge.current_level, 
-            "tide_verified_at": time.strftime("%H:%M"),
-            "weather": weather_reporter.observe(), # New Weather Data
-            "timestamp": time.time(),
+            "tide_verified_at": time.strftime("%H:%M", time.localtime(t)),
+            "weather": weather_reporter.refresh(), # New Weather Data
+            "timestamp": t,
             "source": "FUSION_ENGINE_V2_ULTRATHINK",
             "has_camera": False 
         }
@@ -368,8 +474,8 @@ except ImportError:
 # Global buffer for Scout
 scouted_ships_buffer = []
 
-# Scout Service
-from eye.scout import scout
+# Scout Service (registered here, built on first use by run_scout_loop)
+import eye.scout
 
 # Global instances
 from datetime import datetime
@@ -386,29 +492,117 @@ def notify_drivers(message: str, region: str = "PORT_AREA"):
     return True
 
 eye_service = EyeService()
-last_state = {"rethe": {}, "kattwyk": {}}
+# Encoded /status bodies + ETags, rebuilt only when inputs change
+snapshots = SnapshotCache()
+# Push channel to the Brain (full snapshot on connect, then deltas)
+stream_hub = StreamHub()
+# Rolling live history (segments written on a worker thread, read by the Brain's Historian); opened at startup
+history_recorder = None
+# Encoded water tiles (LOD geometry), built on first request and shared by all clients
+services.register("water_tiles", lambda: WaterTiles(services.get("geography"), capacity=512))
 
 @app.on_event("startup")
 async def startup_event():
+    global history_recorder
     logger.info("The Eye is opening (Hybrid Mode - Multi-Node)...")
+    if os.getenv("HISTORY_RECORD", "1") != "0":
+        history_recorder = HistoryRecorder(
+            os.getenv("HISTORY_DIR", os.path.join(os.path.dirname(__file__), "data", "recordings")),
+            retention_s=float(os.getenv("HISTORY_RETENTION_DAYS", "7")) * 86400
+        )
     asyncio.create_task(eye_service.connect_and_stream())
+    # Build the water geometry and channel graph off the event loop (first Lookout/Scout use would block it)
+    asyncio.create_task(asyncio.to_thread(services.get, "router"))
+    asyncio.create_task(asyncio.to_thread(services.get, "registry"))
     asyncio.create_task(perception_loop())
 
+@app.on_event("shutdown")
+def shutdown_event():
+    if ais_ingest.recorder:
+        ais_ingest.recorder.close() # Finishes the gzip member (a killed writer leaves it truncated)
+    if history_recorder:
+        history_recorder.close() # Drains queued segment writes
+
 async def perception_loop():
     while True:
-        # Update both nodes
-        last_state["rethe"] = eye_service.perceive("rethe")
-        last_state["kattwyk"] = eye_service.perceive("kattwyk")
+        # Advance time-driven inputs (these bump versions only on change)
+        t = eye_service.clock()
+        vessel_store.evict(t)
+        weather_reporter.refresh()
+
+        # Update nodes whose inputs changed (one shared perception timestamp)
+        inputs = eye_service.input_versions(t)
+        changed = False
+        for node_id in NODE_ZONES:
+            changed |= snapshots.refresh(node_id, inputs, lambda: eye_service.perceive(node_id, t))
+        if changed:
+            stream_hub.publish(snapshots.state)
+        if history_recorder and history_recorder.due(t):
+            history_recorder.submit(eye_service.history_snapshot(t))
         # logger.info(f"Dream Stream Updated: {len(last_state)} nodes active") # Disabled to save CPU
         await asyncio.sleep(1)
 
 @app.get("/")
 def health_check():
-    return {"status": "active", "mode": "hybrid", "nodes": list(last_state.keys())}
+    return {"status": "active", "mode": "hybrid", "nodes": list(NODE_ZONES.keys())}
 
 @app.get("/status")
-def get_bridge_status(node_id: str):
-    return last_state.get(node_id, {})
+def get_bridge_status(node_id: str, request: Request):
+    """Cached node snapshot. Honors If-None-Match (304 when unchanged)."""
+    body = snapshots.body.get(node_id)
+    if body is None:
+        return {}
+    etag = snapshots.etag[node_id]
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+@app.get("/tiles/water/{z}/{x}/{y}")
+def get_water_tile(z: int, x: int, y: int, request: Request):
+    """GeoJSON water polygons for one slippy-map tile (LOD by zoom). Honors If-None-Match."""
+    if not (0 <= z <= 22 and 0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        return Response(status_code=404)
+    body, etag = services.get("water_tiles").get(z, x, y)
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=86400"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/geo+json", headers=headers)
+
+@app.get("/tiles/stats")
+def get_tile_stats():
+    return services.get("water_tiles").stats()
+
+@app.websocket("/stream")
+async def stream_status(websocket: WebSocket):
+    """Push channel: full snapshot on connect, then ship/tide/alert deltas"""
+    await websocket.accept()
+    try:
+        await stream_hub.serve(websocket)
+    except WebSocketDisconnect:
+        pass
+
+@app.get("/stream/stats")
+def get_stream_stats():
+    return stream_hub.stats()
+
+@app.get("/status/stats")
+def get_snapshot_stats():
+    """Perception cache health: rebuilds vs skipped ticks"""
+    return snapshots.stats()
+
+@app.get("/ingest/stats")
+def get_ingest_stats():
+    """AIS pipeline health: queue depth, drops, coalescing"""
+    return ais_ingest.stats()
+
+@app.get("/history/recorder/stats")
+def get_recorder_stats():
+    return history_recorder.stats() if history_recorder else {"enabled": False}
+
+@app.get("/services/stats")
+def get_service_stats():
+    """Lazy singletons: which are built, and what they cost"""
+    return services.stats()
 
 # --- ORACLE API ---
 @app.get("/predict")
@@ -416,6 +610,7 @@ async def get_prediction():
     from eye.oracle import oracle
     global scheduled_ships_buffer
     
-    forecast = oracle.generate_forecast(scheduled_ships_buffer)
+    # Route solves (A*) run in a worker thread, not on the event loop
+    forecast = await asyncio.to_thread(oracle.generate_forecast, scheduled_ships_buffer)
     return forecast
 
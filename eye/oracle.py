@@ -1,5 +1,8 @@
 import time
 
+from brain.history import BRIDGE_ZONES
+from eye.services import services
+
 class OracleService:
     """
     Project Oracle: 24h Predictive Intelligence Engine.
@@ -11,6 +14,8 @@ class OracleService:
         Output: Chronological timeline of events.
         """
         timeline = []
+        router = services.get("router")
+        rethe = (BRIDGE_ZONES["RETHE"]["lat"], BRIDGE_ZONES["RETHE"]["lng"])
         
         # Sort by earliest arrival
         sorted_ships = sorted(scheduled_ships, key=lambda x: x.get('eta', 0))
@@ -19,14 +24,17 @@ class OracleService:
             eta = ship.get('eta')
             if not eta: continue
             
-            # 1. EVENT: Ship Arrival
+            # 1. EVENT: Ship Arrival (over-water distance to the Rethe bridge, cached route)
             arrival_time = time.strftime("%H:%M", time.localtime(eta))
-            timeline.append({
+            arrival = {
                 "time": arrival_time,
                 "type": "ARRIVAL",
                 "risk": "MODERATE",
                 "message": f"Vessel {ship['name']} entering Rethe Channel."
-            })
+            }
+            if ship.get('lat') is not None and ship.get('lng') is not None:
+                arrival["route_nm"] = round(router.length_m(router.route((ship['lat'], ship['lng']), rethe)) / 1852, 1)
+            timeline.append(arrival)
             
             # 2. EVENT: Bridge Closure Logic (10 mins before)
             close_time = time.strftime("%H:%M", time.localtime(eta - 600))
@@ -0,0 +1,40 @@
+import numpy as np
+
+KNOT_MS = 0.514444
+EARTH_RADIUS_M = 6371008.8
+
+# AIS "not available" sentinels
+SOG_NA = 102.3
+COG_NA = 360.0
+
+MAX_DT_S = 600.0  # Default projection cap
+
+
+def extrapolate(lat, lng, sog_kn, cog_deg, dt_s, max_dt_s=MAX_DT_S, tau_s=180.0, age_s=None):
+    """
+    Dead Reckoning (vectorized).
+    Projects every vessel forward along its last course/speed by dt_s seconds
+    in one NumPy pass. Vessels without valid SOG/COG are held in place.
+
+    - Projection is capped at max_dt_s (beyond that we hold the capped position)
+    - confidence = exp(-age / tau_s): 1.0 for a fresh report, decaying with age
+      (age defaults to dt_s; pass age_s when projecting an already-projected position)
+
+    Returns (lat, lng, confidence) arrays.
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lng = np.asarray(lng, dtype=np.float64)
+    sog = np.asarray(sog_kn, dtype=np.float64)
+    cog = np.asarray(cog_deg, dtype=np.float64)
+    dt = np.maximum(np.asarray(dt_s, dtype=np.float64), 0.0)
+    age = dt if age_s is None else np.maximum(np.asarray(age_s, dtype=np.float64), 0.0)
+
+    valid = (sog > 0) & (sog < SOG_NA) & (cog >= 0) & (cog < COG_NA)
+    dist = np.where(valid, sog * KNOT_MS * np.minimum(dt, max_dt_s), 0.0)
+
+    heading = np.radians(cog)
+    dlat = dist * np.cos(heading) / EARTH_RADIUS_M
+    dlng = dist * np.sin(heading) / (EARTH_RADIUS_M * np.cos(np.radians(lat)))
+
+    confidence = np.exp(-age / tau_s)
+    return lat + np.degrees(dlat), lng + np.degrees(dlng), confidence
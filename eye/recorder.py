@@ -0,0 +1,140 @@
+import json
+import logging
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger("EYE.RECORDER")
+
+
+class HistoryRecorder:
+    """
+    Rolling History Recorder (live AIS -> replayable history).
+    Every interval_s the Eye hands over one snapshot (legacy history shape). It is
+    appended as a JSON line to the hot segment for its time slot
+    (hot/<start>-<end>.jsonl, segment_s long). When a slot closes, its segment is
+    compacted into a columnar store (cold/<start>-<end>/) at resolution_s, and
+    segments older than retention_s are deleted.
+
+    All file work runs on one dedicated worker thread (ordered, never on the event
+    loop); submit() only enqueues. Read side: brain.historystore.SegmentedHistory.
+    """
+    def __init__(self, directory, interval_s=60, segment_s=3600, resolution_s=300, retention_s=7 * 86400):
+        self.directory = directory
+        self.hot_dir = os.path.join(directory, "hot")
+        self.cold_dir = os.path.join(directory, "cold")
+        self.interval_s = interval_s
+        self.segment_s = segment_s
+        self.resolution_s = resolution_s
+        self.retention_s = retention_s
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="history-recorder")
+        self._last_sample = 0.0
+        self._open_segment = None
+        self.samples = 0
+        self.skipped = 0
+        self.compactions = 0
+        self.dropped_segments = 0
+        self.errors = 0
+        os.makedirs(self.hot_dir, exist_ok=True)
+        os.makedirs(self.cold_dir, exist_ok=True)
+        self._submit(self._maintain, time.time())  # Leftovers from a previous run
+
+    # --- EVENT LOOP SIDE ---
+    def due(self, t):
+        return t - self._last_sample >= self.interval_s
+
+    def submit(self, snapshot):
+        """Queues one snapshot for writing. Never blocks. Samples without ships are skipped."""
+        self._last_sample = snapshot["timestamp_unix"]
+        if not snapshot["ships"]:
+            self.skipped += 1 # No AIS contacts: nothing to replay
+            return
+        self.samples += 1
+        self._submit(self._append, snapshot)
+
+    def _submit(self, fn, *args):
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(self._check)
+
+    def _check(self, future):
+        if future.exception() is not None:
+            self.errors += 1
+            logger.error(f"RECORDER: Write failed ({future.exception()})")
+
+    # --- WORKER THREAD ---
+    def _segment_name(self, ts):
+        start = int(ts // self.segment_s) * self.segment_s
+        return f"{start}-{start + self.segment_s}"
+
+    def _append(self, snapshot):
+        ts = snapshot["timestamp_unix"]
+        name = self._segment_name(ts)
+        with open(os.path.join(self.hot_dir, name + ".jsonl"), "a") as f:
+            f.write(json.dumps(snapshot, separators=(",", ":")) + "\n")
+        if name != self._open_segment:
+            self._open_segment = name
+            self._maintain(ts)  # A new slot opened: the previous one is closed
+
+    def _maintain(self, now):
+        """Compacts closed hot segments, then enforces retention."""
+        for name in sorted(os.listdir(self.hot_dir)):
+            if not name.endswith(".jsonl"):
+                continue
+            start, end = (int(v) for v in name[:-len(".jsonl")].split("-"))
+            if end <= now:
+                self._compact(name[:-len(".jsonl")])
+
+        horizon = now - self.retention_s
+        for base in (self.cold_dir, self.hot_dir):
+            for name in os.listdir(base):
+                try:
+                    end = int(name.split(".")[0].split("-")[1])
+                except (IndexError, ValueError):
+                    continue
+                if end < horizon:
+                    path = os.path.join(base, name)
+                    shutil.rmtree(path) if os.path.isdir(path) else os.remove(path)
+                    self.dropped_segments += 1
+
+    def _compact(self, name):
+        from brain.historystore import write_store  # NumPy only on the worker thread
+
+        hot_path = os.path.join(self.hot_dir, name + ".jsonl")
+        snapshots = []
+        last_bucket = None
+        with open(hot_path, "r") as f:
+            for line in f:
+                try:
+                    snap = json.loads(line)
+                except ValueError:
+                    continue
+                bucket = int(snap["timestamp_unix"] // self.resolution_s)
+                if bucket != last_bucket:  # First sample of each resolution bucket
+                    snapshots.append(snap)
+                    last_bucket = bucket
+        if snapshots:
+            tmp_dir = os.path.join(self.cold_dir, name + ".tmp")
+            write_store(snapshots, tmp_dir)
+            final_dir = os.path.join(self.cold_dir, name)
+            if os.path.isdir(final_dir):
+                shutil.rmtree(final_dir)
+            os.replace(tmp_dir, final_dir)
+        os.remove(hot_path)
+        self.compactions += 1
+        logger.info(f"RECORDER: Compacted {name} ({len(snapshots)} snapshots @ {self.resolution_s}s)")
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def stats(self):
+        return {
+            "directory": self.directory,
+            "samples": self.samples,
+            "skipped": self.skipped,
+            "compactions": self.compactions,
+            "dropped_segments": self.dropped_segments,
+            "errors": self.errors,
+            "hot_segments": len([n for n in os.listdir(self.hot_dir) if n.endswith(".jsonl")]),
+            "cold_segments": len([n for n in os.listdir(self.cold_dir) if not n.endswith(".tmp")])
+        }
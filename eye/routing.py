@@ -0,0 +1,308 @@
+import heapq
+import math
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from eye.geofence import haversine_m
+from eye.geography import DATA_DIR, M_PER_DEG_LAT, source_digest
+from eye.services import services
+
+GRAPH_FORMAT = 1
+SQRT2 = math.sqrt(2.0)
+# 8-neighbourhood: (d_row, d_col, step length in cells)
+NEIGHBOURS = [(-1, 0, 1.0), (1, 0, 1.0), (0, -1, 1.0), (0, 1, 1.0),
+              (-1, -1, SQRT2), (-1, 1, SQRT2), (1, -1, SQRT2), (1, 1, SQRT2)]
+
+
+def bearing_deg(a, b):
+    """Initial great-circle bearing from a to b ((lat, lng) tuples), 0-360."""
+    p1 = math.radians(a[0])
+    p2 = math.radians(b[0])
+    dl = math.radians(b[1] - a[1])
+    y = math.sin(dl) * math.cos(p2)
+    x = math.cos(p1) * math.sin(p2) - math.sin(p1) * math.cos(p2) * math.cos(dl)
+    return math.degrees(math.atan2(y, x)) % 360
+
+
+class ChannelGraph:
+    """
+    Navigable-Channel Graph (grid skeleton).
+    A metric grid over the water polygons; a cell is a node if its center is water
+    and it belongs to the largest connected water body (isolated docks and ponds
+    are dropped, so every pair of nodes is routable). Edges are the 8 neighbours;
+    diagonals need both orthogonal cells navigable (no cutting across quay corners).
+    Built once and saved as channel_graph_<cell>m.npz, keyed by the source sha256.
+    """
+    def __init__(self, navigable, bounds, cell_m):
+        self.navigable = navigable
+        self.bounds = bounds  # (min_lat, max_lat, min_lng, max_lng)
+        self.cell_m = cell_m
+        self.rows, self.cols = navigable.shape
+        min_lat, max_lat, min_lng, max_lng = bounds
+        self.dlat = cell_m / M_PER_DEG_LAT
+        self.dlng = cell_m / (M_PER_DEG_LAT * math.cos(math.radians((min_lat + max_lat) / 2)))
+        self._nodes = np.flatnonzero(navigable.ravel())  # For snapping
+
+    # --- BUILD ---
+    @classmethod
+    def build(cls, geometry, cell_m=40.0):
+        min_lat, max_lat, min_lng, max_lng = geometry.bounds
+        dlat = cell_m / M_PER_DEG_LAT
+        dlng = cell_m / (M_PER_DEG_LAT * math.cos(math.radians((min_lat + max_lat) / 2)))
+        rows = int(math.ceil((max_lat - min_lat) / dlat))
+        cols = int(math.ceil((max_lng - min_lng) / dlng))
+        rr, cc = np.mgrid[0:rows, 0:cols]
+        water = geometry.is_water_many(
+            (min_lat + (rr + 0.5) * dlat).ravel(), (min_lng + (cc + 0.5) * dlng).ravel()
+        ).reshape(rows, cols)
+        return cls(cls._largest_component(water), geometry.bounds, cell_m)
+
+    @staticmethod
+    def _largest_component(water):
+        """Keeps the largest 8-connected water body (frontier BFS, one NumPy step per ring)."""
+        rows, cols = water.shape
+        seen = np.zeros(water.size, dtype=bool)
+        flat = water.ravel()
+        best = np.zeros(0, dtype=np.int64)
+        remaining = flat.sum()
+        for start in np.flatnonzero(flat):
+            if seen[start]:
+                continue
+            if remaining <= len(best):
+                break  # No unvisited body can be larger
+            seen[start] = True
+            members = [np.array([start])]
+            frontier = members[0]
+            while len(frontier):
+                r, c = np.divmod(frontier, cols)
+                nb = []
+                for dr, dc, _ in NEIGHBOURS:
+                    r2 = r + dr
+                    c2 = c + dc
+                    ok = (r2 >= 0) & (r2 < rows) & (c2 >= 0) & (c2 < cols)
+                    nb.append(r2[ok] * cols + c2[ok])
+                nb = np.unique(np.concatenate(nb))
+                frontier = nb[flat[nb] & ~seen[nb]]
+                seen[frontier] = True
+                members.append(frontier)
+            body = np.concatenate(members)
+            remaining -= len(body)
+            if len(body) > len(best):
+                best = body
+        navigable = np.zeros(water.size, dtype=bool)
+        navigable[best] = True
+        return navigable.reshape(rows, cols)
+
+    # --- PERSISTENCE ---
+    @staticmethod
+    def path_for(cell_m, data_dir=DATA_DIR):
+        return os.path.join(data_dir, f"channel_graph_{cell_m:g}m.npz")
+
+    def save(self, digest, data_dir=DATA_DIR):
+        path = self.path_for(self.cell_m, data_dir)
+        np.savez(
+            path,
+            format=np.int64(GRAPH_FORMAT),
+            source_sha256=np.array(digest),
+            navigable=np.packbits(self.navigable, axis=1),
+            cols=np.int64(self.cols),
+            bounds=np.array(self.bounds, dtype=np.float64),
+            cell_m=np.float64(self.cell_m)
+        )
+        return path
+
+    @classmethod
+    def load(cls, cell_m, digest, data_dir=DATA_DIR):
+        """The saved graph, or None if missing or built from other water data."""
+        path = cls.path_for(cell_m, data_dir)
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            if int(data["format"]) != GRAPH_FORMAT or str(data["source_sha256"]) != digest:
+                return None
+            navigable = np.unpackbits(data["navigable"], axis=1, count=int(data["cols"])).astype(bool)
+            return cls(navigable, tuple(float(v) for v in data["bounds"]), float(data["cell_m"]))
+
+    @classmethod
+    def load_or_build(cls, geometry, cell_m=40.0):
+        digest = source_digest()
+        graph = cls.load(cell_m, digest)
+        if graph is None:
+            t0 = time.perf_counter()
+            graph = cls.build(geometry, cell_m)
+            graph.save(digest)
+            print(f"ROUTER: Channel graph built ({len(graph._nodes)} nodes @ {cell_m:g}m, {(time.perf_counter() - t0) * 1000:.0f}ms)")
+        return graph
+
+    # --- GRID ---
+    def contains(self, lat, lng):
+        min_lat, max_lat, min_lng, max_lng = self.bounds
+        return min_lat <= lat <= max_lat and min_lng <= lng <= max_lng
+
+    def center(self, node):
+        r, c = divmod(int(node), self.cols)
+        return (self.bounds[0] + (r + 0.5) * self.dlat, self.bounds[2] + (c + 0.5) * self.dlng)
+
+    def snap(self, lat, lng):
+        """Nearest navigable node to (lat, lng) (berths and hand-typed waypoints often sit on the quay)."""
+        r, c = np.divmod(self._nodes, self.cols)
+        y = (lat - self.bounds[0]) / self.dlat - 0.5
+        x = (lng - self.bounds[2]) / self.dlng - 0.5
+        return int(self._nodes[np.argmin((r - y) ** 2 + (c - x) ** 2)])
+
+    # --- SEARCH ---
+    def astar(self, start, goal):
+        """A* over the 8-connected grid (octile heuristic). Returns the node list start..goal."""
+        nav = self.navigable
+        rows, cols = self.rows, self.cols
+        gr, gc = divmod(goal, cols)
+
+        def h(node):
+            r, c = divmod(node, cols)
+            dr = abs(r - gr)
+            dc = abs(c - gc)
+            return max(dr, dc) + (SQRT2 - 1) * min(dr, dc)
+
+        came = {start: None}
+        cost = {start: 0.0}
+        heap = [(h(start), start)]
+        while heap:
+            _, node = heapq.heappop(heap)
+            if node == goal:
+                break
+            r, c = divmod(node, cols)
+            base = cost[node]
+            for dr, dc, step in NEIGHBOURS:
+                r2 = r + dr
+                c2 = c + dc
+                if not (0 <= r2 < rows and 0 <= c2 < cols) or not nav[r2, c2]:
+                    continue
+                if dr and dc and not (nav[r, c2] and nav[r2, c]):
+                    continue
+                nxt = r2 * cols + c2
+                new_cost = base + step
+                if new_cost < cost.get(nxt, math.inf):
+                    cost[nxt] = new_cost
+                    came[nxt] = node
+                    heapq.heappush(heap, (new_cost + h(nxt), nxt))
+
+        if goal not in came:
+            return []
+        path = [goal]
+        while came[path[-1]] is not None:
+            path.append(came[path[-1]])
+        return path[::-1]
+
+    def line_clear(self, a, b):
+        """True if the straight segment between two node centers stays on navigable cells."""
+        ar, ac = divmod(a, self.cols)
+        br, bc = divmod(b, self.cols)
+        steps = int(max(abs(br - ar), abs(bc - ac)) * 2) + 1
+        t = np.linspace(0.0, 1.0, steps + 1)
+        r = np.rint(ar + t * (br - ar)).astype(np.int64)
+        c = np.rint(ac + t * (bc - ac)).astype(np.int64)
+        return bool(self.navigable[r, c].all())
+
+    def smooth(self, path):
+        """String-pulling: keep only the nodes where the line of sight breaks."""
+        if len(path) <= 2:
+            return path
+        out = [path[0]]
+        i = 0
+        while i < len(path) - 1:
+            j = len(path) - 1
+            while j > i + 1 and not self.line_clear(path[i], path[j]):
+                j -= 1
+            out.append(path[j])
+            i = j
+        return out
+
+
+class ChannelRouter:
+    """
+    Over-Water Routing with an LRU of solved routes.
+    Endpoints are snapped to graph nodes, so the cache key is (node, node) and
+    nearby requests (same berth, jittered positions) share one A* solve.
+    """
+    def __init__(self, graph, capacity=1024):
+        self.graph = graph
+        self.capacity = capacity
+        self._routes = OrderedDict()  # (start node, goal node) -> [(lat, lng)]
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def route(self, a, b):
+        """(lat, lng) -> (lat, lng): land-free polyline of node centers (smoothed)."""
+        key = (self.graph.snap(*a), self.graph.snap(*b))
+        with self._lock:
+            cached = self._routes.get(key)
+            if cached is not None:
+                self._routes.move_to_end(key)
+                self.hits += 1
+                return list(cached)
+
+        nodes = self.graph.smooth(self.graph.astar(*key))
+        path = [tuple(round(v, 6) for v in self.graph.center(n)) for n in nodes]
+        with self._lock:
+            self.misses += 1
+            self._routes[key] = path
+            while len(self._routes) > self.capacity:
+                self._routes.popitem(last=False)
+        return list(path)
+
+    def route_via(self, waypoints):
+        """
+        Replaces every leg inside the graph's coverage with an over-water route;
+        legs leaving the covered area (open sea) stay straight.
+        """
+        out = [self._on_water(waypoints[0])]
+        for a, b in zip(waypoints, waypoints[1:]):
+            if self.graph.contains(*a) and self.graph.contains(*b):
+                leg = self.route(a, b)
+                out.extend(p for p in leg if p != out[-1])
+            else:
+                out.append(self._on_water(b))
+        return out
+
+    def _on_water(self, point):
+        """Covered points move to their graph node (hand-typed waypoints may sit on land)."""
+        if not self.graph.contains(*point):
+            return tuple(point)
+        return tuple(round(v, 6) for v in self.graph.center(self.graph.snap(*point)))
+
+    @staticmethod
+    def length_m(path):
+        if len(path) < 2:
+            return 0.0
+        pts = np.asarray(path, dtype=np.float64)
+        return float(haversine_m(pts[:-1, 0], pts[:-1, 1], pts[1:, 0], pts[1:, 1]).sum())
+
+    def stats(self):
+        return {
+            "nodes": int(len(self.graph._nodes)),
+            "cell_m": self.graph.cell_m,
+            "cached_routes": len(self._routes),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+def build_router():
+    """Factory of the "router" service (eye.services.PROVIDERS)."""
+    return ChannelRouter(ChannelGraph.load_or_build(services.get("geography")))
+
+
+if __name__ == "__main__":
+    # Usage: python -m eye.routing --build [cell_m]
+    if len(sys.argv) > 1 and sys.argv[1] == "--build":
+        cell = float(sys.argv[2]) if len(sys.argv) > 2 else 40.0
+        t0 = time.perf_counter()
+        built = ChannelGraph.build(services.get("geography"), cell)
+        path = built.save(source_digest())
+        print(f"ROUTER: {len(built._nodes)} nodes @ {cell:g}m -> {path} ({(time.perf_counter() - t0) * 1000:.0f}ms)")
@@ -1,13 +1,14 @@
 import httpx
-from bs4 import BeautifulSoup
 import logging
 import random
 import json
 import asyncio
-from eye.geography import geography
+from eye.services import services
 
 logger = logging.getLogger("EYE.SCOUT")
 
+DOWNSTREAM_EXIT = (53.5480, 9.8500) # Teufelsbrück, Elbe fairway (west edge of the water data)
+
 class ScoutService:
     """
     Agentic Scraper: 'The Scout'.
@@ -24,6 +25,8 @@ class ScoutService:
         scours the web for *actual* ships in Hamburg.
         Returns a list of dicts: {name, type, lat, lng}
         """
+        from bs4 import BeautifulSoup  # Deferred: only the scrape needs it
+
         ships = []
         
         # Targets from proven test script
@@ -84,18 +87,33 @@ class ScoutService:
         else:
             logger.info(f"SCOUT: Visual Confirmation on {len(ships)} vessels.")
             
-        # 3. CONVERT TO OBJECTS
+        # 3. CONVERT TO OBJECTS (placement + A* routes: off the event loop)
+        return await asyncio.to_thread(self._place, ships, source)
+
+    def _place(self, ships, source):
+        """Scraped names -> ship dicts in safe water, heading down the channel (blocking)."""
+        from eye.routing import bearing_deg # Deferred: NumPy + the water geometry
         results = []
-        for name in ships[:15]: # Limit increased to 15
-            lat, lng = geography.get_safe_water_point(seed=name)
+        batch = sorted(ships[:15]) # Limit increased to 15
+        placements = dict(zip(batch, services.get("geography").get_safe_water_points(batch, min_separation_m=150)))
+        router = services.get("router")
+        registry = services.get("registry")
+        for name in ships[:15]:
+            lat, lng = placements[name]
+            vessel = registry.resolve(name) # Real vessel behind the scraped name, if confident
+            # Heading: first leg of the over-water route downstream (follows the channel)
+            route = router.route((lat, lng), DOWNSTREAM_EXIT)
+            cog = round(bearing_deg(route[0], route[1]), 0) if len(route) > 1 else round(random.uniform(180, 240), 0)
             results.append({
                 "id": name.upper().replace(" ", "-"),
                 "name": f"{name} [{source}]" if source == "AI_INFERRED_ARCHIVE" else name, 
                 "lat": lat,
                 "lng": lng,
-                "type": "Cargo Vessel", # Simulating Type if unknown
+                "type": vessel.get("type", "Cargo Vessel") if vessel else "Cargo Vessel", # Simulating Type if unknown
+                "imo": vessel.get("imo", "") if vessel else "",
+                "mmsi": vessel.get("mmsi", "") if vessel else "",
                 "sog": round(random.uniform(5.5, 12.0), 1), # Realistic Channel Speed
-                "cog": round(random.uniform(180, 240), 0), # Roughly South-West (Downstream)
+                "cog": cog, # Downstream along the channel
                 "status": "UNDERWAY"
             })
             
@@ -130,4 +148,10 @@ class ScoutService:
             logger.error(f"SCOUT: OpenAI Connect Failed ({e}). RADAR IS BLIND.")
             return [] # No fake ships. Real silence.
 
-scout = ScoutService()
+services.register("scout", ScoutService)
+
+
+def __getattr__(name):
+    if name == "scout":
+        return services.get("scout")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,14 @@
+from shared.services import ServiceRegistry
+
+# The Eye's lazy singletons (the Brain keeps its own registry: brain.services)
+services = ServiceRegistry()
+
+# Eye services by path: resolving one imports its module (NumPy, Shapely, the
+# water data) only when it is first needed
+PROVIDERS = {
+    "geography": "eye.geography:WaterGeometry",
+    "router": "eye.routing:build_router",
+    "registry": "brain.registry:VesselRegistry",
+}
+for _name, _path in PROVIDERS.items():
+    services.register(_name, _path)
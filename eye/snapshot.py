@@ -0,0 +1,53 @@
+import hashlib
+import json
+import time
+
+
+class SnapshotCache:
+    """
+    Pre-encoded Node Snapshots.
+    Each node's perception is rebuilt only when its input versions change
+    (vessel store, tide, traffic, weather, lookout, scout). The JSON body and
+    its ETag are encoded once per rebuild, so /status is a byte copy or a 304.
+    A build must depend only on its inputs and the perception timestamp (no wall
+    clock, no unseeded randomness), or the cached body and ETag go stale.
+    """
+    def __init__(self):
+        self.state = {}   # node -> snapshot dict
+        self.body = {}    # node -> encoded JSON bytes
+        self.etag = {}    # node -> strong ETag
+        self.inputs = {}  # node -> input version key used to build it
+        self.built_at = {}
+        self.rebuilds = 0
+        self.skips = 0
+
+    def nodes(self):
+        return list(self.state.keys())
+
+    def is_stale(self, node_id, inputs):
+        return self.inputs.get(node_id) != inputs
+
+    def put(self, node_id, inputs, snapshot):
+        body = json.dumps(snapshot, separators=(",", ":")).encode("utf-8")
+        self.state[node_id] = snapshot
+        self.body[node_id] = body
+        self.etag[node_id] = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+        self.inputs[node_id] = inputs
+        self.built_at[node_id] = time.time()
+        self.rebuilds += 1
+
+    def refresh(self, node_id, inputs, build):
+        """Rebuilds node_id via build() only if its inputs changed. Returns True if rebuilt."""
+        if not self.is_stale(node_id, inputs):
+            self.skips += 1
+            return False
+        self.put(node_id, inputs, build())
+        return True
+
+    def stats(self):
+        return {
+            "nodes": self.nodes(),
+            "rebuilds": self.rebuilds,
+            "skips": self.skips,
+            "bytes": {n: len(b) for n, b in self.body.items()}
+        }
@@ -0,0 +1,181 @@
+import sys
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+import numpy as np
+
+
+def ship_type_label(code):
+    """AIS 'Type of ship and cargo' code (ITU-R M.1371) -> coarse label."""
+    if not code:
+        return "Unknown"
+    if code == 30:
+        return "Fishing"
+    if code in (31, 32, 52):
+        return "Tug"
+    if code == 33:
+        return "Dredger"
+    if 60 <= code <= 69:
+        return "Passenger"
+    if 70 <= code <= 79:
+        return "Cargo"
+    if 80 <= code <= 89:
+        return "Tanker"
+    return "Other"
+
+
+def eta_to_unix(eta, now=None):
+    """AIS ETA has no year: resolve {Month, Day, Hour, Minute} to the next occurrence."""
+    if not eta or not eta.get("Month") or not eta.get("Day"):
+        return None
+    now = datetime.now(timezone.utc) if now is None else now
+    try:
+        hour = eta.get("Hour", 24)
+        minute = eta.get("Minute", 60)
+        when = datetime(now.year, eta["Month"], eta["Day"],
+                        hour if hour < 24 else 0, minute if minute < 60 else 0, tzinfo=timezone.utc)
+    except ValueError:
+        return None
+    if (now - when).days > 180:  # ETA early next year
+        when = when.replace(year=now.year + 1)
+    return when.timestamp()
+
+
+class StaticDataCache:
+    """
+    Per-MMSI Static/Voyage Attributes (AIS ShipStaticData + Class B StaticDataReport).
+    Numeric attributes live in fixed NumPy columns, strings in slot lists
+    (destinations interned). Bounded: when full, the least recently
+    reported vessel's slot is recycled.
+    """
+    def __init__(self, capacity=20000):
+        self.capacity = capacity
+        self.draft_m = np.full(capacity, np.nan, dtype=np.float32)
+        self.length_m = np.zeros(capacity, dtype=np.uint16)
+        self.beam_m = np.zeros(capacity, dtype=np.uint16)
+        self.ship_type = np.zeros(capacity, dtype=np.uint8)
+        self.imo = np.zeros(capacity, dtype=np.int64)
+        self.eta = np.full(capacity, np.nan, dtype=np.float64)
+        self.updated = np.zeros(capacity, dtype=np.float64)
+        self.names = [None] * capacity
+        self.callsigns = [None] * capacity
+        self.destinations = [None] * capacity
+
+        self._slots = OrderedDict()  # mmsi -> slot (LRU order: oldest first)
+        self._next = 0
+        self.version = 0
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, mmsi):
+        return int(mmsi) in self._slots
+
+    def _slot_for(self, mmsi):
+        slot = self._slots.get(mmsi)
+        if slot is not None:
+            self._slots.move_to_end(mmsi)
+            return slot
+        if self._next < self.capacity:
+            slot = self._next
+            self._next += 1
+        else:
+            _, slot = self._slots.popitem(last=False)  # Recycle least recently reported
+        self.draft_m[slot] = np.nan
+        self.length_m[slot] = 0
+        self.beam_m[slot] = 0
+        self.ship_type[slot] = 0
+        self.imo[slot] = 0
+        self.eta[slot] = np.nan
+        self.names[slot] = self.callsigns[slot] = self.destinations[slot] = None
+        self._slots[mmsi] = slot
+        return slot
+
+    def update(self, mmsi, fields, ts=None):
+        """
+        Merges a partial record (Class B sends name and dimensions in separate parts).
+        fields: any of name, callsign, imo, ship_type, length_m, beam_m, draft_m, destination, eta
+        """
+        slot = self._slot_for(int(mmsi))
+        if fields.get("name"):
+            self.names[slot] = fields["name"]
+        if fields.get("callsign"):
+            self.callsigns[slot] = fields["callsign"]
+        if fields.get("destination"):
+            self.destinations[slot] = sys.intern(fields["destination"])
+        if fields.get("imo"):
+            self.imo[slot] = fields["imo"]
+        if fields.get("ship_type"):
+            self.ship_type[slot] = fields["ship_type"]
+        if fields.get("length_m"):
+            self.length_m[slot] = min(int(fields["length_m"]), 65535)
+        if fields.get("beam_m"):
+            self.beam_m[slot] = min(int(fields["beam_m"]), 65535)
+        if fields.get("draft_m"):
+            self.draft_m[slot] = fields["draft_m"]
+        if fields.get("eta"):
+            self.eta[slot] = fields["eta"]
+        self.updated[slot] = time.time() if ts is None else ts
+        self.version += 1
+
+    def get(self, mmsi):
+        """Static attributes as a dict (only known fields), or None."""
+        slot = self._slots.get(int(mmsi))
+        if slot is None:
+            return None
+        out = {}
+        if self.names[slot]:
+            out["name"] = self.names[slot]
+        if self.callsigns[slot]:
+            out["callsign"] = self.callsigns[slot]
+        if self.imo[slot]:
+            out["imo"] = str(int(self.imo[slot]))
+        if self.ship_type[slot]:
+            out["ship_type"] = ship_type_label(int(self.ship_type[slot]))
+        if self.length_m[slot]:
+            out["length_m"] = int(self.length_m[slot])
+        if self.beam_m[slot]:
+            out["beam_m"] = int(self.beam_m[slot])
+        if not np.isnan(self.draft_m[slot]):
+            out["draft_m"] = round(float(self.draft_m[slot]), 1)
+        if self.destinations[slot]:
+            out["destination"] = self.destinations[slot]
+        if not np.isnan(self.eta[slot]):
+            out["eta"] = float(self.eta[slot])
+        return out
+
+
+def parse_static_message(message_type, body):
+    """AisStream static message body -> (mmsi, fields) for StaticDataCache.update()."""
+    if message_type == "ShipStaticData":
+        dim = body.get("Dimension") or {}
+        return body.get("UserID"), {
+            "name": (body.get("Name") or "").strip(),
+            "callsign": (body.get("CallSign") or "").strip(),
+            "imo": body.get("ImoNumber"),
+            "ship_type": body.get("Type"),
+            "length_m": (dim.get("A") or 0) + (dim.get("B") or 0),
+            "beam_m": (dim.get("C") or 0) + (dim.get("D") or 0),
+            "draft_m": body.get("MaximumStaticDraught"),
+            "destination": (body.get("Destination") or "").strip(),
+            "eta": eta_to_unix(body.get("Eta"))
+        }
+
+    if message_type == "StaticDataReport":
+        fields = {}
+        part_a = body.get("ReportA") or {}
+        part_b = body.get("ReportB") or {}
+        if part_a.get("Valid"):
+            fields["name"] = (part_a.get("Name") or "").strip()
+        if part_b.get("Valid"):
+            dim = part_b.get("Dimension") or {}
+            fields.update({
+                "callsign": (part_b.get("CallSign") or "").strip(),
+                "ship_type": part_b.get("ShipType"),
+                "length_m": (dim.get("A") or 0) + (dim.get("B") or 0),
+                "beam_m": (dim.get("C") or 0) + (dim.get("D") or 0)
+            })
+        return body.get("UserID"), fields
+
+    return None, None
@@ -0,0 +1,130 @@
+import asyncio
+import json
+import logging
+
+logger = logging.getLogger("EYE.STREAM")
+
+
+def ship_key(ship):
+    """
+    Stable identity for a ship across snapshots, namespaced by source: live AIS
+    contacts by MMSI, scheduled/scouted entries by id. (Those may carry a registry
+    MMSI too, which must not collide with the live contact of the same vessel.)
+    """
+    if ship.get("type") == "real_vessel_ais":
+        return f"ais:{ship['mmsi']}"
+    if ship.get("type") == "scheduled_vessel":
+        return f"sched:{ship.get('id')}"
+    return f"id:{ship.get('id')}"
+
+
+class DeltaEncoder:
+    """
+    Eye -> Brain Delta Encoding.
+    Remembers the last published view and turns each new set of node snapshots into
+        {"ships": {"upsert": {key: ship}, "remove": [key]}, "nodes": {node: {changed fields}}}
+    Ships are global (identical in every node snapshot), so they are diffed once.
+    """
+    def __init__(self):
+        self.seq = 0
+        self.ships = {}   # key -> ship dict (last published)
+        self.nodes = {}   # node -> fields without "ships"
+
+    @staticmethod
+    def _split(node_states):
+        ships = {}
+        nodes = {}
+        for node_id, state in node_states.items():
+            for ship in state.get("ships", []):
+                ships[ship_key(ship)] = ship
+            nodes[node_id] = {k: v for k, v in state.items() if k != "ships"}
+        return ships, nodes
+
+    def snapshot(self):
+        return {"type": "snapshot", "seq": self.seq, "ships": self.ships, "nodes": self.nodes}
+
+    def diff(self, node_states):
+        """Returns a delta message, or None if nothing changed."""
+        ships, nodes = self._split(node_states)
+
+        upsert = {k: s for k, s in ships.items() if self.ships.get(k) != s}
+        remove = [k for k in self.ships if k not in ships]
+
+        node_changes = {}
+        for node_id, fields in nodes.items():
+            old = self.nodes.get(node_id, {})
+            changed = {k: v for k, v in fields.items() if old.get(k) != v}
+            if changed:
+                node_changes[node_id] = changed
+
+        self.ships = ships
+        self.nodes = nodes
+        if not upsert and not remove and not node_changes:
+            return None
+
+        self.seq += 1
+        return {
+            "type": "delta",
+            "seq": self.seq,
+            "ships": {"upsert": upsert, "remove": remove},
+            "nodes": node_changes
+        }
+
+
+class _Subscriber:
+    def __init__(self, maxsize):
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.resync = False
+
+
+class StreamHub:
+    """
+    Fan-out of encoded deltas to connected Brains.
+    A subscriber that falls behind (queue full) is not blocked on: its queue is
+    cleared and it gets a fresh full snapshot instead of the missed deltas.
+    """
+    def __init__(self, maxsize=256):
+        self.encoder = DeltaEncoder()
+        self.maxsize = maxsize
+        self.subscribers = set()
+        self.published = 0
+        self.resyncs = 0
+
+    def publish(self, node_states):
+        delta = self.encoder.diff(node_states)
+        if delta is None:
+            return
+        message = json.dumps(delta, separators=(",", ":"))
+        self.published += 1
+        for sub in self.subscribers:
+            try:
+                sub.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                while not sub.queue.empty():
+                    sub.queue.get_nowait()
+                sub.resync = True
+                self.resyncs += 1
+
+    async def serve(self, websocket):
+        """Drives one websocket: full snapshot on connect, then deltas."""
+        sub = _Subscriber(self.maxsize)
+        self.subscribers.add(sub)
+        try:
+            await websocket.send_text(json.dumps(self.encoder.snapshot(), separators=(",", ":")))
+            while True:
+                message = await sub.queue.get()
+                if sub.resync:
+                    sub.resync = False
+                    message = json.dumps(self.encoder.snapshot(), separators=(",", ":"))
+                await websocket.send_text(message)
+        finally:
+            self.subscribers.discard(sub)
+
+    def stats(self):
+        return {
+            "seq": self.encoder.seq,
+            "subscribers": len(self.subscribers),
+            "published": self.published,
+            "resyncs": self.resyncs,
+            "tracked_ships": len(self.encoder.ships)
+        }
@@ -0,0 +1,85 @@
+import hashlib
+import json
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import shapely
+
+
+def tile_bounds(z, x, y):
+    """Slippy-map tile -> (min_lng, min_lat, max_lng, max_lat) in WGS84."""
+    n = 2 ** z
+
+    def lat(row):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    return x / n * 360.0 - 180.0, lat(y + 1), (x + 1) / n * 360.0 - 180.0, lat(y)
+
+
+class WaterTiles:
+    """
+    GeoJSON Water Tiles (/tiles/water/{z}/{x}/{y}).
+    A tile is the LOD-simplified water polygons (WaterGeometry.simplified) that
+    touch it, clipped to the tile plus a small buffer, with coordinates rounded to
+    the tile's pixel size. Tiles are encoded once on first request and kept in an
+    LRU of bytes + ETag shared by every client.
+    """
+    BUFFER = 1 / 64  # Fraction of the tile added on each side (hides clip seams)
+
+    def __init__(self, geometry, capacity=512):
+        self.geometry = geometry
+        self.capacity = capacity
+        self._tiles = OrderedDict()  # (z, x, y) -> (body, etag)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, z, x, y):
+        """Returns (body bytes, etag) for a tile (empty FeatureCollection outside the data)."""
+        key = (z, x, y)
+        with self._lock:
+            cached = self._tiles.get(key)
+            if cached is not None:
+                self._tiles.move_to_end(key)
+                self.hits += 1
+                return cached
+
+        cached = self._encode(z, x, y)  # Outside the lock: concurrent misses just race
+        with self._lock:
+            self.misses += 1
+            self._tiles[key] = cached
+            self._tiles.move_to_end(key)
+            while len(self._tiles) > self.capacity:
+                self._tiles.popitem(last=False)
+        return cached
+
+    def _encode(self, z, x, y):
+        min_lng, min_lat, max_lng, max_lat = tile_bounds(z, x, y)
+        pad_lng = (max_lng - min_lng) * self.BUFFER
+        pad_lat = (max_lat - min_lat) * self.BUFFER
+        rect = (min_lng - pad_lng, min_lat - pad_lat, max_lng + pad_lng, max_lat + pad_lat)
+
+        features = []
+        hits = self.geometry.tree.query(shapely.box(*rect))
+        if len(hits):
+            polys = self.geometry.simplified(z)[np.sort(hits)]
+            # Clip, then snap to ~1/8 pixel: shorter JSON, no visible change
+            decimals = max(0, int(math.ceil(-math.log10((max_lng - min_lng) / 2048))))
+            clipped = shapely.set_precision(shapely.clip_by_rect(polys, *rect), 10 ** -decimals)
+            for geojson in shapely.to_geojson(clipped[~shapely.is_empty(clipped)]):
+                features.append({"type": "Feature", "properties": {}, "geometry": json.loads(geojson)})
+
+        body = json.dumps({"type": "FeatureCollection", "features": features}, separators=(",", ":")).encode("utf-8")
+        etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+        return body, etag
+
+    def stats(self):
+        return {
+            "tiles": len(self._tiles),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes": sum(len(b) for b, _ in self._tiles.values())
+        }
@@ -0,0 +1,236 @@
+import heapq
+import time
+
+import numpy as np
+
+from eye.reckoning import MAX_DT_S, extrapolate
+
+
+class VesselStore:
+    """
+    Live AIS Vessel State (Columnar).
+    One slot per MMSI. Position/kinematics live in preallocated NumPy columns,
+    so an AIS update is an O(1) write instead of a fresh dict per message.
+
+    EVICTION:
+    - Every slot owns exactly one entry in a TTL heap (deadline, slot, generation)
+    - evict() only pops entries whose deadline has passed; a vessel that reported
+      again in the meantime is simply re-scheduled with its real deadline
+    - No full scan of the fleet per perception tick
+
+    DEAD RECKONING: snapshot()/project() serve positions extrapolated from the
+    last report to the perception timestamp (see eye.reckoning). Contacts below
+    MOVING_KN are held at their report. Per-tick fields are kept stable for
+    change-driven consumers (snapshot cache, delta stream): position_ts only
+    advances while a contact is actually being projected, and position_confidence
+    is bucketed (CONFIDENCE_STEP).
+
+    STATIC DATA: if a StaticDataCache is attached, draft/dimensions/type/voyage
+    are joined onto each record at read time.
+    """
+    DEEP_DRAFT_M = 15.0
+    MOVING_KN = 0.5  # Below this, a contact is treated as stationary
+    CONFIDENCE_STEP = 0.05
+
+    def __init__(self, capacity=4096, ttl=600.0, statics=None):
+        self.ttl = ttl
+        self.statics = statics
+        self.capacity = 0
+
+        # Columns (grown by doubling when the fleet outgrows them)
+        self.mmsi = np.zeros(0, dtype=np.int64)
+        self.lat = np.zeros(0, dtype=np.float64)
+        self.lng = np.zeros(0, dtype=np.float64)
+        self.sog = np.zeros(0, dtype=np.float32)
+        self.cog = np.zeros(0, dtype=np.float32)
+        self.last_seen = np.zeros(0, dtype=np.float64)
+        self.active = np.zeros(0, dtype=bool)
+        self.names = []
+        self._gen = np.zeros(0, dtype=np.int64)
+
+        self._slots = {}    # mmsi -> slot
+        self._free = []     # recycled slots
+        self._next = 0      # high-water mark
+        self._expiry = []   # heap of (deadline, slot, generation)
+        self.version = 0    # Bumped on every mutation (for derived caches)
+
+        self._grow(capacity)
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, mmsi):
+        return int(mmsi) in self._slots
+
+    def _grow(self, capacity):
+        """Reallocates all columns to the new capacity (keeps existing rows)."""
+        def resize(col):
+            out = np.zeros(capacity, dtype=col.dtype)
+            out[:len(col)] = col
+            return out
+
+        self.mmsi = resize(self.mmsi)
+        self.lat = resize(self.lat)
+        self.lng = resize(self.lng)
+        self.sog = resize(self.sog)
+        self.cog = resize(self.cog)
+        self.last_seen = resize(self.last_seen)
+        self.active = resize(self.active)
+        self._gen = resize(self._gen)
+        self.names.extend([None] * (capacity - self.capacity))
+        self.capacity = capacity
+
+    def _allocate(self, mmsi):
+        if self._free:
+            slot = self._free.pop()
+        else:
+            if self._next >= self.capacity:
+                self._grow(max(16, self.capacity * 2))
+            slot = self._next
+            self._next += 1
+        self._slots[mmsi] = slot
+        self.mmsi[slot] = mmsi
+        self.active[slot] = True
+        return slot
+
+    def _release(self, slot):
+        del self._slots[int(self.mmsi[slot])]
+        self.active[slot] = False
+        self.names[slot] = None
+        self._gen[slot] += 1  # Invalidates any heap entry still pointing here
+        self._free.append(slot)
+        self.version += 1
+
+    def upsert(self, mmsi, lat, lng, sog=0.0, cog=0.0, name=None, ts=None):
+        """Insert or update one vessel. Returns its slot."""
+        mmsi = int(mmsi)
+        ts = time.time() if ts is None else ts
+
+        slot = self._slots.get(mmsi)
+        if slot is None:
+            slot = self._allocate(mmsi)
+            heapq.heappush(self._expiry, (ts + self.ttl, slot, int(self._gen[slot])))
+
+        self.lat[slot] = lat
+        self.lng[slot] = lng
+        self.sog[slot] = sog or 0.0
+        self.cog[slot] = cog or 0.0
+        self.last_seen[slot] = ts
+        if name:
+            self.names[slot] = name
+        self.version += 1
+        return slot
+
+    def upsert_many(self, rows, ts=None):
+        """
+        Batch upsert. rows: {mmsi: (lat, lng, sog, cog, name)}.
+        Resolves slots first, then writes every column with one fancy-index assignment.
+        """
+        if not rows:
+            return
+        ts = time.time() if ts is None else ts
+
+        slots = np.empty(len(rows), dtype=np.int64)
+        for i, (mmsi, row) in enumerate(rows.items()):
+            slot = self._slots.get(mmsi)
+            if slot is None:
+                slot = self._allocate(mmsi)
+                heapq.heappush(self._expiry, (ts + self.ttl, slot, int(self._gen[slot])))
+            slots[i] = slot
+            if row[4]:
+                self.names[slot] = row[4]
+
+        lat, lng, sog, cog, _ = zip(*rows.values())
+        self.lat[slots] = lat
+        self.lng[slots] = lng
+        self.sog[slots] = [v or 0.0 for v in sog]
+        self.cog[slots] = [v or 0.0 for v in cog]
+        self.last_seen[slots] = ts
+        self.version += 1
+
+    def remove(self, mmsi):
+        slot = self._slots.get(int(mmsi))
+        if slot is not None:
+            self._release(slot)
+
+    def evict(self, now=None):
+        """Drops vessels not seen within the TTL. Returns the number evicted."""
+        now = time.time() if now is None else now
+        evicted = 0
+        while self._expiry and self._expiry[0][0] <= now:
+            _, slot, gen = heapq.heappop(self._expiry)
+            if gen != self._gen[slot]:
+                continue  # Slot was released/recycled since this entry was pushed
+            deadline = self.last_seen[slot] + self.ttl
+            if deadline > now:
+                # Reported again since scheduling: push back with its real deadline
+                heapq.heappush(self._expiry, (deadline, slot, gen))
+            else:
+                self._release(slot)
+                evicted += 1
+        return evicted
+
+    def active_slots(self):
+        """Indices of all occupied slots (for vectorized consumers)."""
+        return np.flatnonzero(self.active[:self._next])
+
+    def project(self, now=None, slots=None):
+        """Dead-reckoned (lat, lng, confidence) for slots at `now`, in one NumPy pass."""
+        now = time.time() if now is None else now
+        slots = self.active_slots() if slots is None else slots
+        sog = self.sog[slots]
+        lat, lng, confidence = extrapolate(
+            self.lat[slots], self.lng[slots], np.where(sog >= self.MOVING_KN, sog, 0.0), self.cog[slots],
+            now - self.last_seen[slots]
+        )
+        return slots, lat, lng, confidence
+
+    def position_times(self, now, slots):
+        """Time each projected position refers to: the report for held contacts, else now (up to the cap)."""
+        seen = self.last_seen[slots]
+        return np.where(self.sog[slots] >= self.MOVING_KN, np.minimum(now, seen + MAX_DT_S), seen)
+
+    def motion_epoch(self, now, step=1.0):
+        """
+        Time bucket while any contact is moving (projected positions change), else -1.
+        Lets change-driven consumers re-run only when extrapolation moves something.
+        """
+        slots = self.active_slots()
+        if not len(slots) or not np.any(self.sog[slots] >= self.MOVING_KN):
+            return -1
+        return int(now // step)
+
+    def record(self, slot, lat=None, lng=None, confidence=None, position_ts=None):
+        """Materializes one slot into the ship dict served by /status."""
+        mmsi = int(self.mmsi[slot])
+        static = self.statics.get(mmsi) if self.statics is not None else None
+        record = {
+            "id": self.names[slot] or (static or {}).get("name") or str(mmsi),
+            "mmsi": str(mmsi),
+            "lat": float(self.lat[slot] if lat is None else lat),
+            "lng": float(self.lng[slot] if lng is None else lng),
+            "type": "real_vessel_ais",
+            "sog": round(float(self.sog[slot]), 1),
+            "cog": round(float(self.cog[slot]), 1),
+            "last_seen": float(self.last_seen[slot]),
+            "draft_status": "OK"  # Default
+        }
+        if confidence is not None:
+            step = self.CONFIDENCE_STEP
+            record["position_confidence"] = round(round(float(confidence) / step) * step, 2)
+        if position_ts is not None:
+            record["position_ts"] = float(position_ts)  # Time the (dead-reckoned) lat/lng refer to
+        if static:
+            static.pop("name", None)
+            record.update(static)
+            if static.get("draft_m", 0) >= self.DEEP_DRAFT_M:
+                record["draft_status"] = "DEEP_DRAFT"
+        return record
+
+    def snapshot(self, now=None):
+        """Evicts stale contacts, then returns all live vessels (dead-reckoned to `now`) as dicts."""
+        now = time.time() if now is None else now
+        self.evict(now)
+        slots, lat, lng, confidence = self.project(now)
+        position_ts = self.position_times(now, slots)
+        return [self.record(slot, lat[i], lng[i], confidence[i], position_ts[i]) for i, slot in enumerate(slots)]
@@ -0,0 +1,89 @@
+"""
+Import-time budget for the Eye and Brain.
+Imports each module in a fresh interpreter with -X importtime (best of N runs),
+reports its cumulative cost and the most expensive modules it pulls in, and
+fails (exit 1) if a module exceeds its budget or builds a service singleton
+at import.
+
+Usage: python scripts/import_budget.py [--runs 3] [--budget eye.main=600 ...]
+"""
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Cumulative import time per module, milliseconds (fastapi alone is ~300ms)
+BUDGETS_MS = {
+    "eye.geography": 200,
+    "eye.scout": 150,
+    "eye.main": 700,
+    "brain.history": 60,
+    "brain.cognition": 60,
+    "brain.main": 800,
+}
+
+# Each package checks its own service registry (eye.services / brain.services)
+PROBE = "import json, {module}; from {package}.services import services; print(json.dumps(services.stats()))"
+
+
+def measure(module):
+    """One cold import -> (cumulative ms, {imported module: self ms}, service stats)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(module=module, package=module.split(".")[0])],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{module}: import failed\n{proc.stderr[-2000:]}")
+
+    total_ms = None
+    self_ms = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        self_ms[name] = int(self_us) / 1000
+        if name == module:
+            total_ms = int(cumulative_us) / 1000
+    services = json.loads(proc.stdout.strip().splitlines()[-1])
+    return total_ms, self_ms, services
+
+
+def main(argv):
+    runs = 3
+    budgets = dict(BUDGETS_MS)
+    args = list(argv)
+    while args:
+        arg = args.pop(0)
+        if arg == "--runs":
+            runs = int(args.pop(0))
+        elif arg == "--budget":
+            module, ms = args.pop(0).split("=")
+            budgets[module] = float(ms)
+
+    failures = []
+    for module, budget in budgets.items():
+        samples = [measure(module) for _ in range(runs)]
+        total_ms, self_ms, services = min(samples, key=lambda s: s[0])
+        status = "OK  " if total_ms <= budget else "OVER"
+        print(f"{status} {module:<18} {total_ms:8.1f}ms / {budget:.0f}ms")
+        for name, ms in sorted(self_ms.items(), key=lambda kv: -kv[1])[:5]:
+            print(f"       {name:<40} {ms:7.1f}ms")
+        eager = [name for name, s in services.items() if s["ready"]]
+        if eager:
+            print(f"       built at import: {', '.join(eager)}")
+            failures.append(f"{module} builds {eager} at import")
+        if total_ms > budget:
+            failures.append(f"{module} {total_ms:.1f}ms > {budget:.0f}ms")
+
+    if failures:
+        print("IMPORT BUDGET EXCEEDED: " + "; ".join(failures))
+        return 1
+    print("IMPORT BUDGET OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,65 @@
+import importlib
+import logging
+import threading
+import time
+
+logger = logging.getLogger("SERVICES")
+
+
+class ServiceRegistry:
+    """
+    Lazy Service Singletons.
+    Modules register a factory at import (cheap); the instance is built on first
+    get() and shared afterwards. Construction is guarded by a per-service lock, so
+    concurrent first calls (threads, executor jobs) build exactly once, and a
+    factory may itself get() other services.
+    A factory can also be a "package.module:attr" path: the module is imported on
+    first get(), so callers need not import it (see PROVIDERS).
+    """
+    def __init__(self):
+        self._factories = {}   # name -> zero-arg callable
+        self._instances = {}   # name -> built instance
+        self._locks = {}       # name -> RLock
+        self._lock = threading.Lock()
+        self.build_ms = {}     # name -> construction time
+
+    def register(self, name, factory):
+        """factory: zero-arg callable, or "package.module:attr" (imported on first get())."""
+        with self._lock:
+            self._factories[name] = factory
+            self._locks.setdefault(name, threading.RLock())
+
+    def get(self, name):
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        if name not in self._factories:
+            raise KeyError(f"Unknown service '{name}'")
+        with self._locks[name]:
+            instance = self._instances.get(name)
+            if instance is None:
+                t0 = time.perf_counter()
+                factory = self._factories[name]
+                if isinstance(factory, str):
+                    module, attr = factory.split(":")
+                    factory = getattr(importlib.import_module(module), attr)
+                instance = factory()
+                self.build_ms[name] = round((time.perf_counter() - t0) * 1000, 2)
+                self._instances[name] = instance
+                logger.info(f"SERVICES: {name} ONLINE ({self.build_ms[name]}ms)")
+        return instance
+
+    def is_ready(self, name):
+        return name in self._instances
+
+    def reset(self, name):
+        """Drops the instance; the next get() rebuilds it."""
+        with self._locks[name]:
+            self._instances.pop(name, None)
+
+    def stats(self):
+        return {
+            name: {"ready": name in self._instances, "build_ms": self.build_ms.get(name)}
+            for name in self._factories
+        }
+
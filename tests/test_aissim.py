@@ -0,0 +1,49 @@
+import json
+
+import numpy as np
+
+from eye.aissim import AisStandIn, SyntheticFleet, in_boxes
+
+EYE_BOX = [[[53.40, 9.60], [53.70, 10.20]]]  # The Eye's subscription (eye.main)
+
+
+def _inside(frame):
+    report = json.loads(frame)["Message"]["PositionReport"]
+    return 53.40 <= report["Latitude"] <= 53.70 and 9.60 <= report["Longitude"] <= 10.20
+
+
+def test_every_tick_delivers_the_full_rate_from_inside_the_box():
+    fleet = SyntheticFleet(size=300, seed=7)
+    stand_in = AisStandIn(fleet, rate=1000, tick_hz=10)
+    pool = np.arange(fleet.size)
+    lat, lng, _ = fleet.positions(pool, 0.0)
+    assert in_boxes(lat, lng, EYE_BOX).mean() < 0.75  # Much of the fleet starts out of the box
+
+    cursor = 0
+    for t in (0.0, 600.0, 3600.0):
+        frames, cursor, inside = stand_in.tick(pool, EYE_BOX, t, cursor, per_tick=100)
+        assert len(frames) == 100
+        assert all(_inside(frame) for frame in frames)
+        assert 0 < inside < fleet.size
+
+
+def test_round_robin_covers_every_vessel_inside():
+    fleet = SyntheticFleet(size=300, seed=7)
+    stand_in = AisStandIn(fleet)
+    pool = np.arange(fleet.size)
+    frames, cursor, inside = stand_in.tick(pool, EYE_BOX, 0.0, 0, per_tick=10)
+    seen = {json.loads(f)["MetaData"]["MMSI"] for f in frames}
+    while cursor:
+        frames, cursor, _ = stand_in.tick(pool, EYE_BOX, 0.0, cursor, per_tick=10)
+        seen.update(json.loads(f)["MetaData"]["MMSI"] for f in frames)
+    assert len(seen) == inside
+
+
+def test_frames_skip_vessels_outside_the_box():
+    fleet = SyntheticFleet(size=120, seed=7)
+    idx = np.arange(fleet.size)
+    frames = fleet.frames(idx, 0.0, EYE_BOX)
+    lat, lng, _ = fleet.positions(idx, 0.0)
+    assert len(frames) == int(in_boxes(lat, lng, EYE_BOX).sum())
+    assert all(_inside(frame) for frame in frames)
+    assert len(fleet.frames(idx, 0.0)) == fleet.size
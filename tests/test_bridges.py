@@ -0,0 +1,67 @@
+import pytest
+
+from brain.bridges import BridgeIntervals
+
+
+def _index():
+    # Samples every 60 s: OPEN at [0, 120) and [300, 360), CLOSED otherwise; the last sample holds 60 s
+    ts = [0, 60, 120, 180, 240, 300, 360, 420]
+    flags = [True, True, False, False, False, True, False, False]
+    return BridgeIntervals.from_states(ts, {"RETHE": flags, "KATTWYK": [False] * len(ts)})
+
+
+def test_samples_merge_into_disjoint_intervals():
+    index = _index()
+    assert index.window == (0.0, 480.0)
+    assert index.intervals("RETHE") == [(0.0, 120.0), (300.0, 360.0)]
+    assert index.intervals("RETHE", 60, 330) == [(60.0, 120.0), (300.0, 330.0)]
+    assert index.intervals("KATTWYK") == []
+
+
+@pytest.mark.parametrize("start, end, seconds", [
+    (0, 480, 180.0),     # Whole window
+    (30, 90, 60.0),      # Inside one interval
+    (120, 300, 0.0),     # Touches both intervals at their open ends only
+    (119, 301, 2.0),     # One second of each
+    (-100, 1000, 180.0), # Past both ends of the window
+    (200, 200, 0.0),     # Empty window
+    (330, 330, 0.0),
+])
+def test_open_seconds_edges(start, end, seconds):
+    assert _index().open_seconds("RETHE", start, end) == seconds
+
+
+def test_open_seconds_without_intervals():
+    assert _index().open_seconds("KATTWYK", 0, 480) == 0.0
+
+
+def test_is_open_is_half_open():
+    index = _index()
+    assert [index.is_open("RETHE", t) for t in (-1, 0, 119.9, 120, 300, 359.9, 360)] == \
+           [False, True, True, False, True, True, False]
+    assert index.states_at([-1, 0, 120, 300]) == [index.state_at(t) for t in (-1, 0, 120, 300)]
+    assert index.states_at([]) == []
+
+
+def test_next_opening():
+    index = _index()
+    assert index.next_opening("RETHE", -10) == (0.0, 120.0)
+    assert index.next_opening("RETHE", 0) == (0.0, 120.0)    # Starting at t counts
+    assert index.next_opening("RETHE", 1) == (300.0, 360.0)  # Already open: the next one
+    assert index.next_opening("RETHE", 301) is None
+    assert index.next_opening("KATTWYK", 0) is None
+
+
+def test_gaps_in_the_samples_end_the_hold():
+    # 60 s spacing, then a 1 h gap: the OPEN sample before it holds 3 spacings, not the whole gap
+    index = BridgeIntervals.from_states([0, 60, 120, 3720], {"RETHE": [False, False, True, True]})
+    assert index.intervals("RETHE") == [(120.0, 300.0), (3720.0, 3780.0)]
+    assert index.open_seconds("RETHE", 0, 3780) == 240.0
+
+
+def test_empty_and_shifted():
+    empty = BridgeIntervals.from_states([], {"RETHE": []})
+    assert empty.intervals("RETHE") == [] and empty.next_opening("RETHE", 0) is None
+    later = _index().shifted(86400)
+    assert later.intervals("RETHE") == [(86400.0, 86520.0), (86700.0, 86760.0)]
+    assert later.open_seconds("RETHE", 86400, 86880) == 180.0
@@ -0,0 +1,88 @@
+import asyncio
+import gzip
+import os
+
+from eye.capture import CaptureReplayer, CaptureWriter, read_capture
+
+FRAMES = ['{"MetaData": {"MMSI": %d}, "Message": {}}' % (211000000 + i) for i in range(20)]
+
+
+def _record(path, frames, t0=1000.0, step=30.0):
+    writer = CaptureWriter(path)
+    for i, frame in enumerate(frames):
+        writer.write(frame, ts=t0 + i * step)
+    writer.close()
+
+
+def test_round_trip_keeps_order_timestamps_and_stray_carriage_returns(tmp_path):
+    path = str(tmp_path / "day.ais.gz")
+    frames = FRAMES[:3] + ['{"MetaData": {"ShipName": "CR\rLF"},\r\n "Message": {}}']
+    _record(path, frames)
+
+    records = list(read_capture(path))
+    assert [ts for ts, _ in records] == [1000.0, 1030.0, 1060.0, 1090.0]
+    assert [frame for _, frame in records] == frames[:3] + ['{"MetaData": {"ShipName": "CR\rLF"},\r  "Message": {}}']
+
+
+def test_reopened_capture_appends_a_member(tmp_path):
+    path = str(tmp_path / "day.ais.gz")
+    _record(path, FRAMES[:5])
+    _record(path, FRAMES[5:], t0=2000.0)
+    assert [frame for _, frame in read_capture(path)] == FRAMES
+
+
+def test_truncated_capture_stops_at_the_last_complete_frame(tmp_path):
+    path = str(tmp_path / "day.ais.gz")
+    _record(path, FRAMES[:5])
+    _record(path, FRAMES[5:], t0=2000.0)
+    size = os.path.getsize(path)
+    for cut in (size - 4, size - 40, size // 2):
+        truncated = str(tmp_path / f"cut-{cut}.ais.gz")
+        with open(path, "rb") as src, open(truncated, "wb") as dst:
+            dst.write(src.read(cut))
+        frames = [frame for _, frame in read_capture(truncated)]
+        assert frames == FRAMES[:len(frames)]  # A clean prefix, no partial record
+
+
+def test_killed_writer_leaves_a_readable_prefix(tmp_path):
+    path = str(tmp_path / "killed.ais.gz")
+    with gzip.open(path, "at", encoding="utf-8", newline="\n") as f:
+        for i, frame in enumerate(FRAMES):
+            f.write(f"{1000.0 + i:.6f}\t{frame}\n")
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data[:-8])  # No gzip trailer, as after a kill
+    assert [frame for _, frame in read_capture(path)] == FRAMES
+
+
+def test_replay_clock_follows_capture_time(tmp_path):
+    path = str(tmp_path / "day.ais.gz")
+    _record(path, FRAMES[:4], t0=1000.0, step=30.0)
+
+    for speed in (0, 200.0):
+        replayer = CaptureReplayer(path, speed=speed)
+        seen = []
+        asyncio.run(replayer.replay(lambda frame: seen.append(replayer.now())))
+        assert len(seen) == 4
+        for clock, ts in zip(seen, (1000.0, 1030.0, 1060.0, 1090.0)):
+            assert abs(clock - ts) < (1e-9 if not speed else 0.1 * speed)
+
+
+def test_looped_replay_clock_never_runs_backwards(tmp_path):
+    path = str(tmp_path / "day.ais.gz")
+    _record(path, FRAMES[:3], t0=1000.0, step=30.0)
+
+    replayer = CaptureReplayer(path, speed=0, loop=True)
+    seen = []
+
+    def submit(frame):
+        seen.append(replayer.now())
+        if len(seen) == 7:
+            raise StopAsyncIteration
+
+    try:
+        asyncio.run(replayer.replay(submit))
+    except StopAsyncIteration:
+        pass
+    assert seen == [1000.0, 1030.0, 1060.0, 1060.0, 1090.0, 1120.0, 1120.0]
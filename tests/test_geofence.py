@@ -0,0 +1,48 @@
+import numpy as np
+
+from eye.geofence import GeofenceIndex, haversine_m
+from eye.vessels import VesselStore
+
+ZONES = {
+    "RETHE": {"lat": 53.5008, "lng": 9.9710, "radius_m": 300},
+    "KATTWYK": {"lat": 53.4940, "lng": 9.9520, "radius_m": 300},
+}
+
+
+def test_locate_matches_a_brute_force_distance_check():
+    index = GeofenceIndex()
+    index.register_many(ZONES)
+    rng = np.random.default_rng(3)
+    lat = rng.uniform(53.485, 53.510, 5000)
+    lng = rng.uniform(9.940, 9.985, 5000)
+
+    found = index.locate(lat, lng)
+    for name, z in ZONES.items():
+        expected = np.flatnonzero(haversine_m(lat, lng, z["lat"], z["lng"]) <= z["radius_m"])
+        assert np.array_equal(found[name], expected)
+        assert len(expected)  # The sample straddles both zones
+
+
+def test_empty_index_and_empty_input_miss():
+    index = GeofenceIndex()
+    assert index.locate([53.5], [9.97]) == {}
+    index.register_many(ZONES)
+    assert all(not len(v) for v in index.locate([], []).values())
+
+
+def test_occupancy_uses_dead_reckoned_positions_and_caches_by_version():
+    index = GeofenceIndex()
+    index.register_many(ZONES)
+    store = VesselStore(capacity=4)
+    # ~500 m south of RETHE, heading north at 10 kn: inside the zone after ~60 s
+    store.upsert(211000001, 53.4963, 9.9710, sog=10.0, cog=0.0, ts=0.0)
+    store.upsert(211000002, 53.4940, 9.9520, sog=0.0, cog=0.0, ts=0.0)  # Moored in KATTWYK
+
+    now = index.occupancy(store, 0.0)
+    assert list(now["RETHE"]) == [] and list(now["KATTWYK"]) == [store._slots[211000002]]
+    later = index.occupancy(store, 90.0)
+    assert list(later["RETHE"]) == [store._slots[211000001]]
+    assert index.occupancy(store, 90.0) is later  # Same store version and timestamp: cached
+
+    store.remove(211000002)
+    assert list(index.occupancy(store, 90.0)["KATTWYK"]) == []
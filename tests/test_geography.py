@@ -0,0 +1,35 @@
+import numpy as np
+import shapely
+
+from eye.geography import WaterGeometry
+
+
+def test_is_water_many_matches_a_scan_of_all_polygons():
+    geometry = WaterGeometry()
+    lat0, lat1, lng0, lng1 = geometry.bounds
+    rng = np.random.default_rng(5)
+    lats, lngs = rng.uniform(lat0, lat1, 3000), rng.uniform(lng0, lng1, 3000)
+
+    polygons = np.asarray(geometry.polygons, dtype=object)
+    expected = np.array([shapely.contains_xy(polygons, x, y).any() for x, y in zip(lngs, lats)])
+    assert expected.any() and not expected.all()
+    assert np.array_equal(geometry.is_water_many(lats, lngs), expected)
+    assert geometry.is_water_many([], []).shape == (0,)
+
+
+def test_placements_are_stable_across_worker_threads():
+    from concurrent.futures import ThreadPoolExecutor
+
+    geometry = WaterGeometry()
+    geometry.placement_cache_size = 16
+    names = [f"VESSEL {i}" for i in range(64)]
+    expected = [geometry.get_safe_water_points([name])[0] for name in names]
+
+    def place(offset):
+        batch = names[offset:] + names[:offset]
+        return dict(zip(batch, geometry.get_safe_water_points(batch)))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(place, range(0, 64, 4)))
+    assert all(result == dict(zip(names, expected)) for result in results)
+    assert len(geometry._placements) <= geometry.placement_cache_size
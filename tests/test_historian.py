@@ -0,0 +1,69 @@
+import gzip
+import json
+
+import pytest
+
+from brain.history import Historian
+from brain.historystore import write_store
+
+T0 = 1_700_000_000.0
+
+
+def _snapshots(n=12, ships=3, lat0=53.50):
+    return [{
+        "timestamp_unix": T0 + 600 * j, "weather": "CLEAR", "traffic_density": 10, "active_obstacles": [],
+        "bridges": {"RETHE": "OPEN" if j % 4 == 0 else "CLOSED"},
+        "ships": [{"id": f"SHIP {i}", "imo": str(9000000 + i), "mmsi": str(211000000 + i), "type": "Cargo",
+                   "length_m": 200, "lat": lat0 + 0.001 * j + 0.01 * i, "lng": 9.90, "status": "UNDERWAY"}
+                  for i in range(ships)]
+    } for j in range(n)]
+
+
+@pytest.fixture
+def historian(tmp_path, monkeypatch):
+    monkeypatch.setenv("HISTORY_SOURCE", "synthetic")
+    write_store(_snapshots(), str(tmp_path / "ship_history"))
+    return Historian(data_dir=str(tmp_path))
+
+
+def test_history_is_encoded_once_per_version(historian):
+    body, gz_body, etag = historian.get_24h_history_encoded()
+    assert gzip.decompress(gz_body) == body
+    assert json.loads(body) == historian.get_24h_history()
+    assert len(json.loads(body)["ships"]) == 3
+
+    again = historian.get_24h_history_encoded()
+    assert again[0] is body and again[1] is gz_body and again[2] == etag
+    assert historian.get_24h_history() is historian.get_24h_history()
+
+
+def test_rewriting_the_store_changes_the_etag(historian):
+    _, _, etag = historian.get_24h_history_encoded()
+    version = historian.version
+    write_store(_snapshots(ships=4), historian.store_dir)
+
+    body, _, new_etag = historian.get_24h_history_encoded()
+    assert new_etag != etag and historian.version == version + 1
+    assert len(json.loads(body)["ships"]) == 4
+
+
+def test_missing_store_is_generated_in_the_data_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("HISTORY_SOURCE", "synthetic")
+    historian = Historian(data_dir=str(tmp_path))
+    assert historian.store_dir == str(tmp_path / "ship_history")
+    assert len(historian.get_24h_history()["ships"]) > 0
+
+
+def test_history_endpoint_serves_gzip_and_304(historian, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    import brain.main
+    from brain.services import services
+    monkeypatch.setitem(services._instances, "historian", historian)
+    client = TestClient(brain.main.app)
+    body, _, etag = historian.get_24h_history_encoded()
+
+    response = client.get("/history", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200 and response.headers["content-encoding"] == "gzip"
+    assert response.content == body and response.headers["etag"] == etag
+    assert client.get("/history", headers={"If-None-Match": etag}).status_code == 304
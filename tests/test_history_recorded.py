@@ -0,0 +1,145 @@
+import time
+
+import numpy as np
+import pytest
+
+from brain.historystore import SegmentedHistory
+from eye.recorder import HistoryRecorder
+
+T0 = 1_700_000_000.0  # Days in the past: served from compacted (cold) segments
+
+
+def _lat(t):
+    return 53.50 + (t - T0) * 1e-6  # Straight track: interpolation is exact
+
+
+@pytest.fixture
+def recording(tmp_path):
+    recorder = HistoryRecorder(str(tmp_path), interval_s=60, resolution_s=300, retention_s=10 ** 10)
+    for k in range(3 * 60):  # 3 hours, one sample per minute, off the 300 s grid
+        t = T0 + 17.0 + 60 * k
+        recorder.submit({
+            "timestamp": "", "timestamp_unix": t, "weather": "CLEAR", "active_obstacles": [],
+            "traffic_density": 0, "bridges": {"RETHE": "OPEN" if k % 30 < 10 else "CLOSED"},
+            "ships": [{"id": "211000001", "imo": "", "mmsi": "211000001", "type": "AIS", "length_m": 0,
+                       "lat": _lat(t), "lng": 9.90, "status": "UNDERWAY"}]
+        })
+    recorder.close()
+    HistoryRecorder(str(tmp_path), retention_s=10 ** 10).close()  # Startup maintenance compacts the rest
+    return SegmentedHistory(str(tmp_path))
+
+
+def test_recording_is_compacted(recording):
+    assert {kind for _, _, kind, _ in recording.segments()} == {"cold"}
+
+
+def test_at_between_compacted_samples(recording):
+    ts = T0 + 4000.0  # Not a sample time
+    frame = recording.window_store(ts, ts, bracket=True).at(ts)
+    assert len(frame["ships"]) == 1
+    assert frame["ships"][0]["lat"] == pytest.approx(_lat(ts), abs=1e-6)
+
+
+def test_frames_keep_every_ship(recording):
+    start, end = T0 + 1000.0, T0 + 1000.0 + 9 * 123.0
+    frames = recording.window_store(start, end, bracket=True).frames(start, end, 123.0)
+    assert [len(f["ships"]) for f in frames] == [1] * 10
+
+
+def test_frames_at_reads_segments_in_place(recording):
+    start, end = recording.segments()[0][0] - 100.0, recording.latest() + 100.0  # Past both ends
+    times = start + 97.0 * np.arange(int((end - start) // 97.0) + 1)
+    expected = recording.window_store(start, end, bracket=True).frames_at(times)
+    assert len(recording.segments()) > 1
+    assert recording.frames_at(times) == expected
+
+
+def test_edges_come_from_the_neighbouring_segments(recording):
+    (s0, _, _, _), (s1, _, _, _) = recording.segments()[:2]
+    snaps = recording.snapshots()
+    before = max(s["timestamp_unix"] for s in snaps if s["timestamp_unix"] < s1)
+    after = min(s["timestamp_unix"] for s in snaps if s["timestamp_unix"] > s1)
+    assert recording._edge(s1, True)["timestamp_unix"] == before
+    assert recording._edge(s1, False)["timestamp_unix"] == after
+    assert recording._edge(s0, True) is None
+
+
+def test_historian_reads_recorded_windows(recording, tmp_path, monkeypatch):
+    monkeypatch.setenv("HISTORY_DIR", recording.directory)
+    from brain.history import Historian
+    historian = Historian(data_dir=str(tmp_path / "data"))
+    ts = T0 + 2 * 3600 + 31.0
+    assert ts < time.time() - 86400
+    ships = historian.at(ts)["ships"]
+    assert len(ships) == 1 and ships[0]["lat"] == pytest.approx(_lat(ts), abs=1e-6)
+    assert [len(f["ships"]) for f in historian.frames(ts, ts + 1800, 300)] == [1] * 7
+
+
+def _record_day(directory, now):
+    """A full recorded day up to `now` (one sample per 10 min), compacted except the current hour."""
+    recorder = HistoryRecorder(directory, interval_s=60, resolution_s=300, retention_s=10 ** 10)
+    for k in range(144, -1, -1):
+        t = now - 600 * k
+        recorder.submit({
+            "timestamp": "", "timestamp_unix": t, "weather": "CLEAR", "active_obstacles": [],
+            "traffic_density": 0, "bridges": {"RETHE": "CLOSED"},
+            "ships": [{"id": "211000001", "imo": "", "mmsi": "211000001", "type": "AIS", "length_m": 0,
+                       "lat": _lat(t), "lng": 9.90, "status": "UNDERWAY"}]
+        })
+    return recorder
+
+
+def test_live_samples_do_not_invalidate_the_encoded_day(tmp_path, monkeypatch):
+    import os
+    from brain.history import Historian
+
+    recordings = tmp_path / "recordings"
+    now = time.time()
+    hour = (now // 3600) * 3600  # The day ends in the current (hot) segment
+    _record_day(str(recordings), hour).close()
+    monkeypatch.setenv("HISTORY_DIR", str(recordings))
+    historian = Historian(data_dir=str(tmp_path))
+    refresh = Historian.RECORDING_REFRESH_S
+    bucket = (now // refresh) * refresh
+
+    def hot_segment():
+        return [seg for seg in SegmentedHistory(str(recordings)).segments() if seg[2] == "hot"][-1][3]
+
+    os.utime(hot_segment(), (bucket + 1, bucket + 1))
+    _, _, etag = historian.get_24h_history_encoded()
+    assert historian._pivot[0][0] == "recorded"
+    window = historian._window[1]
+
+    # Another live sample lands in the hot segment within the same bucket: nothing is rebuilt
+    recorder = HistoryRecorder(str(recordings), retention_s=10 ** 10)
+    recorder.submit({"timestamp": "", "timestamp_unix": (hour + now) / 2, "weather": "CLEAR", "active_obstacles": [],
+                     "traffic_density": 0, "bridges": {}, "ships": [{"id": "211000001", "lat": 53.6, "lng": 9.9}]})
+    recorder.close()
+    os.utime(hot_segment(), (bucket + 2, bucket + 2))
+    assert historian.get_24h_history_encoded()[2] == etag
+    assert historian._window[1] is window
+
+    # The next bucket picks the new sample up
+    os.utime(hot_segment(), (bucket + refresh, bucket + refresh))
+    body, _, new_etag = historian.get_24h_history_encoded()
+    assert new_etag != etag and b"53.6," in body
+
+
+def test_frames_at_reads_hot_segments_too(tmp_path):
+    end = T0 + 86400.0
+    _record_day(str(tmp_path), end).close()
+    recording = SegmentedHistory(str(tmp_path))
+    assert {kind for _, _, kind, _ in recording.segments()} == {"cold", "hot"}
+    times = end - 7200.0 + 250.0 * np.arange(29)
+    assert recording.frames_at(times) == recording.window_store(times[0], times[-1], bracket=True).frames_at(times)
+
+
+def test_bridge_index_is_reused_for_the_same_recorded_window(recording, tmp_path, monkeypatch):
+    monkeypatch.setenv("HISTORY_DIR", recording.directory)
+    from brain.history import Historian
+    historian = Historian(data_dir=str(tmp_path / "data"))
+    start, end = T0 + 600.0, T0 + 7200.0
+    index = historian.bridge_index(start, end)
+    assert historian.bridge_index(start, end) is index
+    assert historian.bridge_index(start, end + 600.0) is not index
+    assert index.open_seconds("RETHE", start, end) > 0
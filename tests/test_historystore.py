@@ -0,0 +1,113 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from brain.historystore import HistoryStore, convert_json, lttb, time_key, write_store
+
+T0 = 1_700_000_000.0
+
+
+def _snapshots(n=24, ships=4):
+    """Ship i joins at snapshot i and moves north 0.001 deg per 600 s; every third snapshot has an obstacle."""
+    out = []
+    for j in range(n):
+        out.append({
+            "timestamp": "", "timestamp_unix": T0 + 600 * j, "weather": "FOG" if j % 2 else "CLEAR",
+            "traffic_density": j, "active_obstacles": ["ICE"] if j % 3 == 0 else [],
+            "bridges": {"RETHE": "OPEN" if j % 4 == 0 else "CLOSED", "KATTWYK": "CLOSED"},
+            "ships": [{"id": f"SHIP {i}", "imo": str(9000000 + i), "mmsi": str(211000000 + i),
+                       "type": "Tanker" if i % 2 else "Cargo", "length_m": 100 + i,
+                       "lat": 53.50 + 0.001 * j, "lng": 9.80 + 0.05 * i,
+                       "status": "MOORED" if j > 20 else "UNDERWAY"} for i in range(min(j + 1, ships))]
+        })
+    return out
+
+
+@pytest.fixture
+def store(tmp_path):
+    return HistoryStore(write_store(_snapshots(), str(tmp_path / "store")))
+
+
+def test_store_is_memory_mapped_and_round_trips(store):
+    assert isinstance(store.pt_lat, np.memmap) and isinstance(store.pt_key, np.memmap)
+    assert len(store) == 24 and store.meta["points"] == sum(min(j + 1, 4) for j in range(24))
+    for j, snap in enumerate(_snapshots()):
+        got = store.snapshot(j)
+        assert got["timestamp_unix"] == snap["timestamp_unix"]
+        assert (got["bridges"], got["weather"], got["active_obstacles"], got["traffic_density"]) == \
+               (snap["bridges"], snap["weather"], snap["active_obstacles"], snap["traffic_density"])
+        assert [(s["id"], s["lat"], s["lng"], s["status"]) for s in got["ships"]] == \
+               [(s["id"], s["lat"], s["lng"], s["status"]) for s in snap["ships"]]
+
+
+def test_pivot_groups_paths_by_ship(store):
+    pivot = store.pivot()
+    assert (pivot["window_start"], pivot["window_end"]) == (T0, T0 + 600 * 23)
+    assert [len(s["path"]) for s in pivot["ships"]] == [24, 23, 22, 21]
+    path = pivot["ships"][3]["path"]
+    assert [p["ts"] for p in path] == sorted(p["ts"] for p in path)
+    assert pivot["timeline"][3]["obstacles"] == ["ICE"]
+
+
+def test_persisted_key_matches_the_derived_key(store):
+    span, key = time_key(store.pt_ship, store.pt_ts, store.snap_ts)
+    assert np.array_equal(np.asarray(store.pt_key), key)
+    assert np.all(np.diff(key) > 0)  # Globally sorted: one searchsorted per query
+
+
+def test_store_without_pt_key_gives_the_same_frames(store, tmp_path):
+    os.remove(os.path.join(store.directory, "pt_key.npy"))
+    legacy = HistoryStore(store.directory)
+    assert legacy.pt_key is None
+    times = T0 + np.array([-60.0, 0.0, 1234.5, 600 * 23.0, 600 * 23 + 1])
+    fresh = HistoryStore(write_store(_snapshots(), str(tmp_path / "fresh")))
+    for a, b in zip(legacy.positions_at(times), fresh.positions_at(times)):
+        assert np.array_equal(a, b, equal_nan=True)
+
+
+def test_convert_json_records_the_source_stamp(tmp_path):
+    path = tmp_path / "ship_history_24h.json"
+    path.write_text(json.dumps(_snapshots(n=3)))
+    store = HistoryStore(convert_json(str(path), str(tmp_path / "converted")))
+    st = os.stat(path)
+    assert store.meta["source_stamp"] == [st.st_mtime_ns, st.st_size]
+    assert len(store) == 3
+
+
+def test_query_window_ids_and_types(store):
+    out = store.query(start=T0 + 600 * 5, end=T0 + 600 * 10)
+    assert [len(s["path"]) for s in out["ships"]] == [6, 6, 6, 6]
+    assert [e["ts"] for e in out["timeline"]] == [T0 + 600 * j for j in range(5, 11)]
+
+    assert [s["id"] for s in store.query(ids=["211000002", "9000003"])["ships"]] == ["SHIP 2", "SHIP 3"]
+    assert [s["id"] for s in store.query(ids=["ship 0"])["ships"]] == ["SHIP 0"]
+    assert [s["id"] for s in store.query(types=["tanker"])["ships"]] == ["SHIP 1", "SHIP 3"]
+    assert store.query(start=T0 - 1000, end=T0 - 1)["ships"] == []
+
+
+def test_query_bbox_keeps_one_neighbour_each_side(store):
+    # SHIP 0 runs north along lng 9.80: the box holds snapshots 10..12 of its track
+    bbox = (9.79, 53.5095, 9.81, 53.5125)
+    paths = store.query(bbox=bbox)["ships"]
+    assert [s["id"] for s in paths] == ["SHIP 0"]
+    assert [round((p["ts"] - T0) / 600) for p in paths[0]["path"]] == [9, 10, 11, 12, 13]
+
+
+def test_query_points_downsamples_with_lttb(store):
+    out = store.query(points=5)
+    for ship, full in zip(out["ships"], store.pivot()["ships"]):
+        assert len(ship["path"]) == 5
+        assert ship["path"][0] == full["path"][0] and ship["path"][-1] == full["path"][-1]
+
+
+def test_lttb_keeps_the_corner_of_a_track():
+    x = np.concatenate([np.arange(50.0), np.full(50, 49.0)])
+    y = np.concatenate([np.zeros(50), np.arange(1.0, 51.0)])
+    keep = lttb(x, y, 6)
+    assert len(keep) == 6 and keep[0] == 0 and keep[-1] == 99
+    assert np.all(np.diff(keep) > 0)
+    assert 49 in keep or 50 in keep  # The turn survives
+    assert np.array_equal(lttb(x, y, 200), np.arange(100))
+    assert list(lttb(x, y, 2)) == [0, 99]
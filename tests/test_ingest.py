@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from eye.capture import CaptureWriter, read_capture
+from eye.ingest import IngestPipeline
+from eye.statics import StaticDataCache
+from eye.vessels import VesselStore
+
+
+def _position(mmsi, lat, lng, sog=10.0, cog=90.0, name="TEST"):
+    return json.dumps({
+        "MessageType": "PositionReport",
+        "MetaData": {"MMSI": mmsi, "ShipName": name},
+        "Message": {"PositionReport": {"UserID": mmsi, "Latitude": lat, "Longitude": lng, "Sog": sog, "Cog": cog}}
+    })
+
+
+def _static(mmsi, draft):
+    return json.dumps({
+        "MessageType": "ShipStaticData",
+        "MetaData": {"MMSI": mmsi},
+        "Message": {"ShipStaticData": {"UserID": mmsi, "Name": "DEEP ONE", "MaximumStaticDraught": draft,
+                                       "Dimension": {"A": 300, "B": 66, "C": 25, "D": 26}}}
+    })
+
+
+def _drain(pipeline):
+    frames = []
+    while not pipeline.queue.empty():
+        frames.append(pipeline.queue.get_nowait())
+    return frames
+
+
+def test_batch_is_coalesced_to_the_newest_report_per_mmsi():
+    statics = StaticDataCache(capacity=4)
+    store = VesselStore(capacity=4, statics=statics)
+    pipeline = IngestPipeline(store, statics=statics)
+    for frame in (_position(211000001, 53.50, 9.90), _position(211000002, 53.60, 9.80),
+                  _position(211000001, 53.51, 9.91), "not json", _static(211000001, 15.5),
+                  _position(211000001, 53.52, 9.92)):
+        pipeline.submit(frame)
+
+    latest, static_rows = pipeline.decode_batch(_drain(pipeline))
+    pipeline.apply(latest, static_rows, ts=100.0)
+
+    assert pipeline.coalesced == 2 and pipeline.decode_errors == 1
+    assert latest[211000001][:2] == (53.52, 9.92)
+    assert len(store) == 2 and pipeline.applied == 2
+    assert statics.get(211000001)["draft_m"] == 15.5
+    assert store.record(store._slots[211000001])["draft_status"] == "DEEP_DRAFT"
+
+
+@pytest.mark.parametrize("policy, kept", [("drop_oldest", [2, 3]), ("drop_newest", [1, 2])])
+def test_full_queue_applies_the_drop_policy(policy, kept):
+    pipeline = IngestPipeline(VesselStore(capacity=4), maxsize=2, policy=policy)
+    accepted = [pipeline.submit(_position(211000000 + i, 53.5, 9.9)) for i in (1, 2, 3)]
+
+    assert accepted == [True, True, False]
+    assert pipeline.dropped == 1 and pipeline.received == 3
+    assert [json.loads(f)["MetaData"]["MMSI"] - 211000000 for f in _drain(pipeline)] == kept
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        IngestPipeline(VesselStore(), policy="block")
+
+
+def test_capture_tee_is_written_by_the_writer_thread(tmp_path):
+    path = str(tmp_path / "tee.ais.gz")
+    pipeline = IngestPipeline(VesselStore(capacity=4))
+    pipeline.recorder = CaptureWriter(path)
+    frames = [_position(211000000 + i, 53.5, 9.9) for i in range(50)]
+    for frame in frames:
+        pipeline.submit(frame)
+    pipeline.recorder.close()
+
+    assert [frame for _, frame in read_capture(path)] == frames
+    assert pipeline.recorder.frames == 50 and pipeline.stats()["capture_dropped"] == 0
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from brain.prediction import PredictiveEngine
+
+T0 = 1_700_000_000.0
+
+
+def _history(seed=5, ships=12):
+    rng = np.random.default_rng(seed)
+    out = []
+    for i in range(ships):
+        n = int(rng.integers(1, 30))  # Some ships have a single point: no track
+        ts = np.sort(T0 + rng.uniform(0, 86400, n))
+        if n > 3:
+            ts[1] = ts[2]  # A repeated sample time inside the path
+        out.append({"id": f"SHIP {i}", "name": f"SHIP {i}", "type": "Cargo", "imo": str(9000000 + i),
+                    "path": [{"ts": float(t), "lat": 53.5 + rng.normal(0, 0.01), "lng": 9.9 + rng.normal(0, 0.01),
+                              "status": "UNDERWAY"} for t in ts]})
+    return {"ships": out, "timeline": []}
+
+
+def _old_loop(history, t):
+    """The per-ship path walk predict_24h_future used before mirror_positions: {track: (lat, lng)}."""
+    out = {}
+    tracks = [s for s in history["ships"] if len(s["path"]) >= 2]
+    for i, ship in enumerate(tracks):
+        path = ship["path"]
+        if t < path[0]["ts"] or t > path[-1]["ts"]:
+            continue
+        for k in range(len(path) - 1):
+            p1, p2 = path[k], path[k + 1]
+            if p1["ts"] <= t <= p2["ts"]:
+                duration = p2["ts"] - p1["ts"]
+                if duration <= 0:
+                    continue
+                ratio = (t - p1["ts"]) / duration
+                out[i] = (p1["lat"] + (p2["lat"] - p1["lat"]) * ratio, p1["lng"] + (p2["lng"] - p1["lng"]) * ratio)
+                break
+    return out
+
+
+@pytest.mark.parametrize("seed", [5, 11])
+def test_mirror_positions_match_the_per_segment_loop(seed):
+    history = _history(seed)
+    samples = [p["ts"] for s in history["ships"] for p in s["path"]]
+    times = np.concatenate((T0 - 60 + np.arange(0, 86400 + 120, 600.0), samples))  # Grid + every sample time
+    lat, lng = PredictiveEngine().mirror_positions(history, times)
+    assert lat.shape == (len(times), sum(len(s["path"]) >= 2 for s in history["ships"]))
+
+    for k, t in enumerate(times.tolist()):
+        expected = _old_loop(history, t)
+        assert set(np.flatnonzero(~np.isnan(lat[k])).tolist()) == set(expected)
+        for i, (a, b) in expected.items():
+            assert lat[k, i] == pytest.approx(a, abs=1e-9) and lng[k, i] == pytest.approx(b, abs=1e-9)
+
+
+def test_mirror_index_is_rebuilt_only_for_new_ships():
+    engine = PredictiveEngine()
+    history = _history()
+    index = engine.mirror_index(history)
+    assert engine.mirror_index(history) is index
+    assert engine.mirror_index(_history(seed=6)) is not index
+
+
+def test_mirror_positions_without_tracks():
+    lat, lng = PredictiveEngine().mirror_positions({"ships": []}, [T0, T0 + 60])
+    assert lat.shape == lng.shape == (2, 0)
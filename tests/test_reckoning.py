@@ -0,0 +1,53 @@
+import math
+
+import numpy as np
+import pytest
+
+from eye.geofence import haversine_m
+from eye.reckoning import KNOT_MS, MAX_DT_S, extrapolate
+from eye.vessels import VesselStore
+
+
+def test_projection_follows_course_and_speed():
+    lat, lng, _ = extrapolate([53.5, 53.5], [9.9, 9.9], [10.0, 10.0], [0.0, 90.0], [60.0, 60.0])
+    assert lat[0] > 53.5 and lng[0] == pytest.approx(9.9)
+    assert lng[1] > 9.9 and lat[1] == pytest.approx(53.5)
+    distance = haversine_m(53.5, 9.9, lat, lng)
+    assert distance == pytest.approx([10 * KNOT_MS * 60] * 2, rel=1e-3)
+
+
+def test_projection_is_capped_at_max_dt():
+    capped = extrapolate([53.5], [9.9], [12.0], [45.0], [10 * MAX_DT_S])
+    at_cap = extrapolate([53.5], [9.9], [12.0], [45.0], [MAX_DT_S])
+    assert capped[0] == at_cap[0] and capped[1] == at_cap[1]
+    short = extrapolate([53.5], [9.9], [12.0], [45.0], [900.0], max_dt_s=120.0)
+    assert haversine_m(53.5, 9.9, short[0], short[1])[0] == pytest.approx(12 * KNOT_MS * 120, rel=1e-3)
+
+
+def test_invalid_kinematics_and_negative_dt_hold_position():
+    lat, lng, confidence = extrapolate(
+        [53.5] * 4, [9.9] * 4, [102.3, 10.0, 0.0, 10.0], [90.0, 360.0, 90.0, 90.0], [60.0, 60.0, 60.0, -30.0]
+    )
+    assert np.all(lat == 53.5) and np.all(lng == 9.9)
+    assert confidence[3] == 1.0  # Future-stamped report counts as fresh
+
+
+def test_confidence_decays_with_age():
+    _, _, confidence = extrapolate([53.5] * 3, [9.9] * 3, [10.0] * 3, [0.0] * 3, [0.0, 180.0, 900.0])
+    assert confidence[0] == 1.0
+    assert confidence[1] == pytest.approx(math.exp(-1))
+    assert confidence[2] < confidence[1]
+    # age_s overrides dt for already-projected positions
+    _, _, confidence = extrapolate([53.5], [9.9], [10.0], [0.0], [0.0], age_s=[180.0])
+    assert confidence[0] == pytest.approx(math.exp(-1))
+
+
+def test_store_holds_slow_contacts_at_their_report():
+    store = VesselStore(capacity=4)
+    store.upsert(211000001, 53.5, 9.9, sog=0.3, cog=90.0, ts=0.0)   # Drifting at anchor
+    store.upsert(211000002, 53.5, 9.9, sog=10.0, cog=90.0, ts=0.0)
+    moored, moving = store.snapshot(60.0)
+    assert (moored["lat"], moored["lng"], moored["position_ts"]) == (53.5, 9.9, 0.0)
+    assert moving["lng"] > 9.9 and moving["position_ts"] == 60.0
+    assert store.snapshot(61.0)[0] == moored  # Stable across ticks
+    assert moving["position_confidence"] == round(round(math.exp(-60 / 180) / 0.05) * 0.05, 2)
@@ -0,0 +1,40 @@
+import json
+
+import pytest
+
+from brain.registry import VesselRegistry
+
+
+@pytest.fixture(scope="module")
+def registry():
+    return VesselRegistry(path="")
+
+
+@pytest.mark.parametrize("query", ["A", "MSC", "CMA", "MAERSK", "", "###"])
+def test_word_prefixes_do_not_resolve(registry, query):
+    assert registry.resolve(query) is None
+
+
+@pytest.mark.parametrize("query", ["ONE TRIUMPH", "one triumph", "9769271", "636019825", "D5OT3",
+                                   "IJSSELDELTA (DREDGER)"])
+def test_exact_keys_and_names_resolve(registry, query):
+    name = "IJSSELDELTA" if "IJSSEL" in query else "ONE TRIUMPH"
+    assert registry.resolve(query)["name"] == name
+
+
+def test_misspelled_full_names_resolve(registry):
+    assert registry.resolve("ONE TRIUMF")["name"] == "ONE TRIUMPH"
+    assert registry.resolve("CMA CGM MARCO POLLO")["name"] == "CMA CGM MARCO POLO"
+    assert registry.resolve("MSC ANA")["name"] == "MSC ANNA"
+
+
+def test_near_ties_stay_unresolved(tmp_path):
+    path = tmp_path / "fleet.jsonl"
+    rows = [{"name": "NORDIC STAR", "imo": "9000001"}, {"name": "NORDIC STAN", "imo": "9000002"}]
+    path.write_text("\n".join(json.dumps(row) for row in rows))
+    registry = VesselRegistry(path=str(path))
+
+    assert registry.resolve("NORDIC STAR")["imo"] == "9000001"  # Exact name still wins
+    assert registry.resolve("NORDIC STAX") is None  # Equally close to both
+    assert registry.resolve("NORDIC ST") is None     # Prefix of both
+    assert registry.search("NORDIC")  # Autocomplete still lists both
@@ -0,0 +1,56 @@
+from fastapi.testclient import TestClient
+
+import eye.main
+from eye.snapshot import SnapshotCache
+
+
+def test_refresh_rebuilds_only_when_inputs_change():
+    cache = SnapshotCache()
+    builds = []
+
+    def build():
+        builds.append(1)
+        return {"ships": [], "n": len(builds)}
+
+    assert cache.refresh("rethe", (1, 0), build) is True
+    etag = cache.etag["rethe"]
+    assert cache.refresh("rethe", (1, 0), build) is False
+    assert cache.etag["rethe"] == etag and cache.skips == 1
+
+    assert cache.refresh("rethe", (2, 0), build) is True
+    assert cache.etag["rethe"] != etag and cache.rebuilds == 2
+
+
+def test_equal_bodies_get_equal_etags():
+    cache = SnapshotCache()
+    cache.put("rethe", (1,), {"ships": [], "tide_level_m": 3.2})
+    cache.put("kattwyk", (1,), {"ships": [], "tide_level_m": 3.2})
+    assert cache.etag["rethe"] == cache.etag["kattwyk"]
+    assert cache.body["rethe"] == b'{"ships":[],"tide_level_m":3.2}'
+
+
+def test_perceive_is_a_function_of_its_inputs_and_t():
+    t = 1_760_000_017.0
+    first = eye.main.eye_service.perceive("rethe", t)
+    second = eye.main.eye_service.perceive("rethe", t)
+    assert first == second
+    assert first["timestamp"] == t
+
+
+def test_status_serves_cached_bytes_and_304(monkeypatch):
+    cache = SnapshotCache()
+    cache.put("rethe", (1,), {"node_id": "rethe", "ships": []})
+    monkeypatch.setattr(eye.main, "snapshots", cache)
+    client = TestClient(eye.main.app)
+
+    response = client.get("/status", params={"node_id": "rethe"})
+    assert response.status_code == 200
+    assert response.content == cache.body["rethe"]
+    etag = response.headers["etag"]
+
+    response = client.get("/status", params={"node_id": "rethe"}, headers={"If-None-Match": etag})
+    assert response.status_code == 304 and response.headers["etag"] == etag
+
+    cache.put("rethe", (2,), {"node_id": "rethe", "ships": [{"id": "NEW"}]})
+    response = client.get("/status", params={"node_id": "rethe"}, headers={"If-None-Match": etag})
+    assert response.status_code == 200 and response.headers["etag"] != etag
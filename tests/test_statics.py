@@ -0,0 +1,48 @@
+from datetime import datetime, timezone
+
+from eye.statics import StaticDataCache, eta_to_unix, parse_static_message, ship_type_label
+
+
+def test_cache_recycles_the_least_recently_reported_slot():
+    cache = StaticDataCache(capacity=2)
+    cache.update(211000001, {"name": "ONE", "draft_m": 12.5}, ts=1.0)
+    cache.update(211000002, {"name": "TWO"}, ts=2.0)
+    cache.update(211000001, {"callsign": "DABC"}, ts=3.0)  # Refreshes ONE
+    cache.update(211000003, {"name": "THREE"}, ts=4.0)     # Evicts TWO, not ONE
+
+    assert 211000002 not in cache and len(cache) == 2
+    assert cache.get(211000001) == {"name": "ONE", "callsign": "DABC", "draft_m": 12.5}
+    # The recycled slot starts clean
+    assert cache.get(211000003) == {"name": "THREE"}
+    assert cache.get(211000002) is None
+
+
+def test_partial_class_b_reports_merge():
+    cache = StaticDataCache(capacity=4)
+    body_a = {"UserID": 211000009, "ReportA": {"Valid": True, "Name": "LITTLE ONE  "}}
+    body_b = {"UserID": 211000009, "ReportB": {"Valid": True, "CallSign": "DX12", "ShipType": 37,
+                                              "Dimension": {"A": 8, "B": 4, "C": 2, "D": 2}}}
+    for body in (body_a, body_b):
+        cache.update(*parse_static_message("StaticDataReport", body))
+
+    assert cache.get(211000009) == {"name": "LITTLE ONE", "callsign": "DX12", "ship_type": "Other",
+                                    "length_m": 12, "beam_m": 4}
+
+
+def test_ship_static_data_is_parsed():
+    mmsi, fields = parse_static_message("ShipStaticData", {
+        "UserID": 636019825, "Name": "ONE TRIUMPH ", "CallSign": "D5AB1", "ImoNumber": 9769271, "Type": 71,
+        "Dimension": {"A": 300, "B": 100, "C": 30, "D": 28}, "MaximumStaticDraught": 14.5,
+        "Destination": "DEHAM ", "Eta": {"Month": 0, "Day": 0, "Hour": 24, "Minute": 60}
+    })
+    assert mmsi == 636019825
+    assert fields == {"name": "ONE TRIUMPH", "callsign": "D5AB1", "imo": 9769271, "ship_type": 71,
+                      "length_m": 400, "beam_m": 58, "draft_m": 14.5, "destination": "DEHAM", "eta": None}
+    assert ship_type_label(fields["ship_type"]) == "Cargo"
+    assert parse_static_message("PositionReport", {}) == (None, None)
+
+
+def test_eta_without_a_year_resolves_to_the_next_occurrence():
+    now = datetime(2026, 12, 30, tzinfo=timezone.utc)
+    eta = eta_to_unix({"Month": 1, "Day": 2, "Hour": 6, "Minute": 30}, now=now)
+    assert eta == datetime(2027, 1, 2, 6, 30, tzinfo=timezone.utc).timestamp()
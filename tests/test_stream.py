@@ -0,0 +1,31 @@
+from eye.stream import DeltaEncoder, ship_key
+from eye.vessels import VesselStore
+
+
+def _fleet():
+    store = VesselStore(capacity=8)
+    store.upsert(636019825, 53.54, 9.93, 0.0, 0.0, "ONE TRIUMPH", ts=1000.0)
+    live = store.snapshot(1000.0)
+    scheduled = {"id": "SCHEDULED-ONE TRIUMPH", "name": "ONE TRIUMPH", "type": "scheduled_vessel",
+                 "mmsi": "636019825", "lat": 53.50, "lng": 9.80}
+    scouted = {"id": "ONE-TRIUMPH", "name": "ONE TRIUMPH", "type": "Container Ship",
+               "mmsi": "636019825", "lat": 53.52, "lng": 9.85}
+    return live + [scheduled, scouted]
+
+
+def test_ship_keys_are_namespaced_by_source():
+    keys = [ship_key(ship) for ship in _fleet()]
+    assert keys == ["ais:636019825", "sched:SCHEDULED-ONE TRIUMPH", "id:ONE-TRIUMPH"]
+
+
+def test_entries_sharing_an_mmsi_do_not_overwrite_each_other():
+    encoder = DeltaEncoder()
+    fleet = _fleet()
+    delta = encoder.diff({"rethe": {"ships": fleet}})
+    assert len(delta["ships"]["upsert"]) == 3
+    assert encoder.ships["ais:636019825"]["lat"] == 53.54
+
+    # The scheduled entry leaves: only it is removed, the live contact stays
+    delta = encoder.diff({"rethe": {"ships": [fleet[0], fleet[2]]}})
+    assert delta["ships"]["remove"] == ["sched:SCHEDULED-ONE TRIUMPH"]
+    assert delta["ships"]["upsert"] == {}
@@ -0,0 +1,37 @@
+import os
+
+import numpy as np
+
+import brain.synthetic as synthetic
+from brain.synthetic import generate_snapshots, write_fixture
+
+
+def _columns(directory):
+    return {name[:-4]: np.load(os.path.join(directory, name))
+            for name in sorted(os.listdir(directory)) if name.endswith(".npy")}
+
+
+def test_same_seed_generates_identical_snapshots():
+    first = generate_snapshots(size=40, hours=3.0, interval_s=600, seed=7)
+    assert first == generate_snapshots(size=40, hours=3.0, interval_s=600, seed=7)
+    assert len(first[0]["ships"]) == 40
+
+    other = generate_snapshots(size=40, hours=3.0, interval_s=600, seed=8)
+    assert [s["ships"] for s in other] != [s["ships"] for s in first]
+
+
+def test_fixture_columns_do_not_depend_on_the_worker_count(tmp_path, monkeypatch):
+    monkeypatch.setattr(synthetic, "SHARD_POINTS", 200)  # ~10 vessels per shard: several jobs
+    serial = write_fixture(str(tmp_path / "serial"), size=40, hours=2.0, interval_s=300, seed=3, workers=1)
+    pooled = write_fixture(str(tmp_path / "pooled"), size=40, hours=2.0, interval_s=300, seed=3, workers=3)
+    assert serial["workers"] == 1 and pooled["workers"] == 3
+    assert serial["points"] == pooled["points"] == 40 * serial["snapshots"]
+
+    a, b = _columns(serial["directory"]), _columns(pooled["directory"])
+    assert a.keys() == b.keys()
+    for name in a:
+        assert np.array_equal(a[name], b[name]), name
+
+    reseeded = _columns(write_fixture(str(tmp_path / "reseeded"), size=40, hours=2.0, interval_s=300,
+                                      seed=4, workers=1)["directory"])
+    assert not np.array_equal(a["pt_lat"], reseeded["pt_lat"])
@@ -0,0 +1,56 @@
+import numpy as np
+
+from eye.vessels import VesselStore
+
+
+def test_upsert_many_writes_every_column():
+    store = VesselStore(capacity=2)
+    store.upsert_many({
+        211000001: (53.50, 9.90, 12.0, 90.0, "ALPHA"),
+        211000002: (53.51, 9.91, None, None, None),
+        211000003: (53.52, 9.92, 3.5, 270.0, "GAMMA"),
+    }, ts=100.0)
+
+    assert len(store) == 3
+    assert store.capacity >= 3  # Grew past the initial capacity
+    slot = store._slots[211000003]
+    assert (store.lat[slot], store.lng[slot]) == (53.52, 9.92)
+    assert store.sog[slot] == np.float32(3.5) and store.cog[slot] == np.float32(270.0)
+    assert store.names[slot] == "GAMMA"
+    quiet = store._slots[211000002]
+    assert store.sog[quiet] == 0.0 and store.cog[quiet] == 0.0 and store.names[quiet] is None
+    assert np.all(store.last_seen[store.active_slots()] == 100.0)
+
+    # Updating keeps the slot and the name when the new row has none
+    version = store.version
+    store.upsert_many({211000001: (53.60, 9.95, 11.0, 95.0, None)}, ts=110.0)
+    slot = store._slots[211000001]
+    assert store.lat[slot] == 53.60 and store.names[slot] == "ALPHA"
+    assert len(store) == 3 and store.version > version
+
+
+def test_evict_drops_only_contacts_past_the_ttl():
+    store = VesselStore(capacity=4, ttl=60.0)
+    store.upsert(211000001, 53.5, 9.9, ts=0.0)
+    store.upsert(211000002, 53.5, 9.9, ts=0.0)
+    store.upsert(211000002, 53.5, 9.9, ts=50.0)  # Reported again: deadline moves to 110
+
+    assert store.evict(59.0) == 0
+    assert store.evict(60.0) == 1
+    assert 211000001 not in store and 211000002 in store
+    assert store.evict(109.0) == 0  # Re-scheduled with its real deadline
+    assert store.evict(110.0) == 1
+    assert len(store) == 0 and not store.active_slots().size
+
+
+def test_released_slots_are_recycled_without_stale_expiry():
+    store = VesselStore(capacity=4, ttl=60.0)
+    store.upsert(211000001, 53.5, 9.9, ts=0.0)
+    slot = store._slots[211000001]
+    store.remove(211000001)
+
+    # The recycled slot must not inherit the old contact's deadline
+    store.upsert(211000009, 53.6, 9.8, ts=30.0)
+    assert store._slots[211000009] == slot
+    assert store.evict(60.0) == 0
+    assert store.evict(90.0) == 1
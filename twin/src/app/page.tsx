@@ -242,23 +242,25 @@ export default function Home() {
       if (!path || path.length < 2) return;
       if (sourceTimestamp < path[0].ts || sourceTimestamp > path[path.length - 1].ts) return;
 
-      for (let i = 0; i < path.length - 1; i++) {
-        const p1 = path[i];
-        const p2 = path[i + 1];
-        if (sourceTimestamp >= p1.ts && sourceTimestamp <= p2.ts) {
-          const r = (sourceTimestamp - p1.ts) / (p2.ts - p1.ts);
-          const shipId = isFuture ? `PRED-${hShip.id}` : hShip.id;
-          currentFrameShips.push({
-            id: shipId,
-            type: hShip.type,
-            lat: p1.lat + (p2.lat - p1.lat) * r,
-            lng: p1.lng + (p2.lng - p1.lng) * r,
-            status: isFuture ? "PREDICTED_UNDERWAY" : hShip.status,
-            imo: hShip.imo
-          });
-          break;
-        }
+      // Binary search for the bracketing samples (paths are ts-sorted; same rule as /history/at)
+      let lo = 0;
+      let hi = path.length - 1;
+      while (hi - lo > 1) {
+        const mid = (lo + hi) >> 1;
+        if (path[mid].ts <= sourceTimestamp) lo = mid; else hi = mid;
       }
+      const p1 = path[lo];
+      const p2 = path[hi];
+      const r = p2.ts > p1.ts ? (sourceTimestamp - p1.ts) / (p2.ts - p1.ts) : 0;
+      const shipId = isFuture ? `PRED-${hShip.id}` : hShip.id;
+      currentFrameShips.push({
+        id: shipId,
+        type: hShip.type,
+        lat: p1.lat + (p2.lat - p1.lat) * r,
+        lng: p1.lng + (p2.lng - p1.lng) * r,
+        status: isFuture ? "PREDICTED_UNDERWAY" : (p1.status ?? hShip.status),
+        imo: hShip.imo
+      });
     });
 
     // --- GUARANTEED VISUALS (FUTURE) ---